@@ -5,6 +5,8 @@ if 'dados' not in st.session_state:
     # print('removendo dados')
     st.session_state['dados'] = None
     st.session_state['colunas'] = None
+    st.session_state['analise'] = None
+    st.session_state['fonte_blocos'] = None
 
 st.set_page_config(
     page_title='Data Insight',
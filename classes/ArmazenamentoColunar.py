@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+
+class ArmazenamentoColunar:
+    """
+    Classe ArmazenamentoColunar
+
+    Esta classe persiste os datasets importados em arquivos colunares (Feather v2 / Arrow IPC, sem compressão) em um
+    diretório local, junto com a configuração das colunas. Novas cargas do mesmo arquivo não precisam interpretar o
+    CSV novamente e é possível ler apenas as colunas necessárias.
+
+    Os arquivos são gravados em um único bloco e lidos com memory-map: as colunas numéricas sem nulos (e as decimais,
+    com os nulos gravados como NaN) apontam diretamente para o arquivo mapeado, sem cópia. As colunas de texto,
+    categorias, datas com nulos e inteiros com nulos são convertidas para a memória na leitura.
+
+    Cada sessão do Streamlit usa um subdiretório próprio, para que os dados e os tipos confirmados por um usuário
+    nunca sejam servidos a outro. Os subdiretórios de sessões sem uso há mais de `validade_sessao` segundos são
+    removidos.
+
+    Requer o pyarrow. Quando ele não está instalado, `Disponivel` é falso e os métodos não fazem nada.
+
+    Exemplo de uso:
+        >>> armazenamento = ArmazenamentoColunar()
+        >>> armazenamento.Salvar(chave, dados, configColunas)
+        >>> dados, configColunas = armazenamento.Carregar(chave)
+        >>> apenas_valor = armazenamento.Carregar(chave, colunas=['Valor'])[0]
+    """
+    def __init__(self, diretorio: str=None, limite_bytes: int=10 * 1024 * 1024 * 1024, validade_sessao: int=24 * 60 * 60):
+        """
+        Inicializa o armazenamento.
+
+        Parâmetros:
+            diretorio (str, opcional): Diretório base dos arquivos. Se não for fornecido, usa a variável de ambiente
+                DATAINSIGHT_CACHE_DIR ou um subdiretório do diretório temporário do sistema. Dentro do Streamlit, os
+                arquivos ficam em um subdiretório da sessão atual.
+            limite_bytes (int, opcional): Espaço máximo ocupado pelos arquivos da sessão. Os arquivos usados há mais
+                tempo são removidos quando o limite é ultrapassado.
+            validade_sessao (int, opcional): Tempo, em segundos, após o qual os subdiretórios de outras sessões sem
+                uso são removidos.
+        """
+        if diretorio is None:
+            diretorio = os.environ.get('DATAINSIGHT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'datainsight'))
+        self._diretorioBase = diretorio
+        contexto = get_script_run_ctx(suppress_warning=True)
+        # fora do Streamlit (ex.: scripts), o diretório base é usado diretamente
+        self._diretorio = diretorio if contexto is None else os.path.join(diretorio, f'sessao_{contexto.session_id}')
+        self._limiteBytes = limite_bytes
+        self._validadeSessao = validade_sessao
+
+    @property
+    def Disponivel(self) -> bool:
+        return feather is not None
+
+    def Caminho(self, chave: tuple) -> str:
+        """
+        Retorna o caminho do arquivo colunar correspondente à chave (ex.: hash do conteúdo e separadores).
+        """
+        nome = hashlib.blake2b(repr(chave).encode(), digest_size=16).hexdigest()
+        return os.path.join(self._diretorio, f'{nome}.arrow')
+
+    def Existe(self, chave: tuple) -> bool:
+        return self.Disponivel and os.path.exists(self.Caminho(chave))
+
+    def Salvar(self, chave: tuple, dados: pd.DataFrame, configColunas: pd.DataFrame) -> bool:
+        """
+        Salva os dados e a configuração das colunas no arquivo colunar da chave, substituindo o conteúdo anterior.
+
+        Parâmetros:
+            chave (tuple): Chave do dataset.
+            dados (pd.DataFrame): Dados a persistir.
+            configColunas (pd.DataFrame): Configuração das colunas (tipos confirmados pelo usuário).
+
+        Retorna:
+            bool: Verdadeiro se o arquivo foi salvo; falso se o pyarrow não estiver disponível, se os dados
+            possuírem colunas que não podem ser representadas no formato Arrow (ex.: objetos de tipos mistos) ou se
+            o arquivo não puder ser gravado (ex.: disco cheio ou sem permissão).
+        """
+        if not self.Disponivel:
+            return False
+
+        try:
+            tabela = pa.Table.from_pandas(dados, preserve_index=False)
+            for posicao, coluna in enumerate(dados.columns):
+                if dados[coluna].dtype.kind == 'f' and isinstance(dados[coluna].dtype, np.dtype):
+                    # os NaN são mantidos como valores (e não como nulos) para que a coluna seja lida sem cópia
+                    tabela = tabela.set_column(posicao, tabela.schema.field(posicao), pa.array(dados[coluna].to_numpy(), from_pandas=False))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return False
+
+        metadados = dict(tabela.schema.metadata or {})
+        metadados[b'datainsight.colunas'] = configColunas[['NomeColuna', 'TipoColuna', 'ClassifColuna']].to_json(orient='records').encode()
+        tabela = tabela.replace_schema_metadata(metadados)
+
+        caminho = self.Caminho(chave)
+        caminhoTemporario = None
+        try:
+            os.makedirs(self._diretorio, exist_ok=True)
+            self._removerSessoesAntigas()
+            # nome temporário exclusivo, no mesmo diretório, para que a troca pelo arquivo final seja atômica
+            descritor, caminhoTemporario = tempfile.mkstemp(dir=self._diretorio, suffix='.tmp')
+            os.close(descritor)
+            # um único bloco permite ler as colunas numéricas diretamente do arquivo mapeado
+            feather.write_feather(tabela, caminhoTemporario, compression='uncompressed', chunksize=max(tabela.num_rows, 1))
+            os.replace(caminhoTemporario, caminho)
+            caminhoTemporario = None
+            self._liberarEspaco(manter=caminho)
+        except OSError:
+            return False
+        finally:
+            if caminhoTemporario is not None and os.path.exists(caminhoTemporario):
+                os.remove(caminhoTemporario)
+        return True
+
+    def Carregar(self, chave: tuple, colunas: list=None) -> tuple:
+        """
+        Carrega os dados (com memory-map) e a configuração das colunas do arquivo colunar da chave. Apenas as
+        colunas numéricas são lidas sem cópia (veja a descrição da classe); as demais são convertidas para a memória.
+
+        Parâmetros:
+            chave (tuple): Chave do dataset.
+            colunas (list, opcional): Colunas a ler. Se não for fornecido, todas as colunas são lidas.
+
+        Retorna:
+            tuple: (dados, configColunas), ou None se não houver arquivo para a chave. A configuração retornada
+            contém apenas as colunas lidas.
+        """
+        if not self.Existe(chave):
+            return None
+
+        caminho = self.Caminho(chave)
+        os.utime(caminho)
+        # mantém o diretório da sessão fora da limpeza de sessões antigas
+        os.utime(self._diretorio)
+        tabela = feather.read_table(caminho, columns=colunas, memory_map=True)
+        dados = tabela.to_pandas(split_blocks=True)
+
+        configColunas = pd.DataFrame(json.loads(tabela.schema.metadata[b'datainsight.colunas']))
+        configColunas.index = configColunas['NomeColuna'].to_list()
+        if colunas is not None:
+            configColunas = configColunas.loc[colunas]
+        return dados, configColunas
+
+    def Remover(self, chave: tuple):
+        """
+        Remove o arquivo colunar da chave, se existir.
+        """
+        if self.Existe(chave):
+            os.remove(self.Caminho(chave))
+
+    def _removerSessoesAntigas(self):
+        """
+        Remove os subdiretórios de sessões sem uso há mais de `validade_sessao` segundos.
+        """
+        limite = time.time() - self._validadeSessao
+        for nome in os.listdir(self._diretorioBase):
+            caminho = os.path.join(self._diretorioBase, nome)
+            if nome.startswith('sessao_') and caminho != self._diretorio and os.path.isdir(caminho) and os.path.getmtime(caminho) < limite:
+                shutil.rmtree(caminho, ignore_errors=True)
+
+    def _liberarEspaco(self, manter: str):
+        arquivos = []
+        for nome in os.listdir(self._diretorio):
+            caminho = os.path.join(self._diretorio, nome)
+            if nome.endswith('.arrow') and caminho != manter:
+                informacao = os.stat(caminho)
+                arquivos.append((informacao.st_mtime, informacao.st_size, caminho))
+
+        total = os.path.getsize(manter) + sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= self._limiteBytes:
+                break
+            os.remove(caminho)
+            total -= tamanho
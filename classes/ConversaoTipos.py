@@ -0,0 +1,155 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from classes.Dataset import AnaliseDataset, _posicoesDaAmostra
+
+
+def _converterSerie(serie: pd.Series, tipoColuna: str) -> tuple:
+    """
+    Converte uma série para o tipo de coluna informado, transformando os valores inválidos em nulos.
+
+    Parâmetros:
+        serie (pd.Series): Série a converter.
+        tipoColuna (str): Tipo de coluna de destino (Texto, Inteiro, Decimal, Data ou Data/Hora).
+
+    Retorna:
+        tuple: (série convertida, quantidade de valores não nulos que não puderam ser convertidos).
+    """
+    if tipoColuna == 'Texto':
+        return serie.astype('object'), 0
+
+    if tipoColuna in ('Inteiro', 'Decimal'):
+        convertida = pd.to_numeric(serie, errors='coerce')
+        if pd.api.types.is_bool_dtype(convertida):
+            convertida = convertida.astype('int64')
+        if tipoColuna == 'Inteiro':
+            # valores com parte fracionária, infinitos ou fora da faixa do int64 não podem ser representados como inteiros
+            if pd.api.types.is_integer_dtype(convertida):
+                # apenas inteiros sem sinal podem exceder o int64 (a comparação é feita sem passar por float)
+                invalidos = (convertida > np.iinfo('int64').max).to_numpy(dtype=bool, na_value=False)
+                if invalidos.any():
+                    # os valores válidos passam para o Int64 antes da máscara, que converteria a série para float64
+                    convertida = convertida.where(~invalidos, 0).astype('int64').astype('Int64')
+            else:
+                valores = convertida.to_numpy(dtype='float64', na_value=np.nan)
+                with np.errstate(invalid='ignore'):
+                    invalidos = ~np.isnan(valores) & (~np.isfinite(valores) | (valores != np.round(valores)) | 
+                                                      (valores < -2.0 ** 63) | (valores >= 2.0 ** 63))
+            if invalidos.any():
+                convertida = convertida.mask(invalidos)
+            # colunas com nulos usam o tipo inteiro do pandas que aceita nulos
+            convertida = convertida.astype('Int64' if convertida.isnull().any() else 'int64')
+        else:
+            convertida = convertida.astype('float64')
+    elif tipoColuna in ('Data', 'Data/Hora'):
+        convertida = pd.to_datetime(serie, errors='coerce')
+    else:
+        raise Exception(f'O tipo {tipoColuna} não é suportado na conversão de colunas.')
+
+    qtdFalhas = int((convertida.isnull() & serie.notnull()).sum())
+    return convertida, qtdFalhas
+
+
+class ConversorDeTipos:
+    """
+    Classe ConversorDeTipos
+
+    Esta classe converte as colunas de um dataset para os tipos definidos na configuração das colunas. Apenas as
+    colunas cujo tipo atual difere do configurado são convertidas, em paralelo, e o dataset original não é alterado:
+    o resultado é uma cópia rasa em que somente as colunas convertidas são substituídas, de modo que as demais colunas
+    continuam compartilhando a mesma memória.
+
+    Os valores que não podem ser convertidos se tornam nulos e são contabilizados por coluna. Antes da conversão
+    completa, `ValidarAmostra` estima essas falhas em uma amostra de linhas.
+
+    Exemplo de uso:
+        >>> conversor = ConversorDeTipos(AnaliseDataset(dados, configColunas))
+        >>> conversor.ValidarAmostra()
+           NomeColuna TipoAntes TipoDepois  QtdAmostra  FalhasAmostra  PctFalhasAmostra
+        Valor   Valor     Texto    Inteiro        1000              3               0.3
+        >>> conversao = conversor.Converter()
+        >>> conversao['dados'], conversao['relatorio']
+    """
+    def __init__(self, analise: AnaliseDataset, tamanho_amostra: int=1000, max_workers: int=None):
+        """
+        Inicializa o conversor.
+
+        Parâmetros:
+            analise (AnaliseDataset): Análise com os dados atuais e a configuração de colunas desejada.
+            tamanho_amostra (int, opcional): Quantidade de linhas usadas em `ValidarAmostra`.
+            max_workers (int, opcional): Quantidade máxima de threads usadas na conversão.
+        """
+        self._analise = analise
+        self._tamanhoAmostra = tamanho_amostra
+        self._maxWorkers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._plano = None
+
+    @property
+    def Plano(self) -> dict:
+        """
+        Colunas a converter, no formato {nome da coluna: tipo de destino}. Colunas que já estão no tipo configurado
+        (inclusive as compactadas, como categorias e int32) e colunas Data/Hora configuradas como Data são mantidas.
+        """
+        if self._plano is None:
+            self._plano = {}
+            for coluna, tipoColuna in self._analise.ConfigColunas['TipoColuna'].items():
+                tipoAtual = self._analise.TipoDeDadosAtual(coluna)
+                if tipoColuna is None or tipoAtual == tipoColuna or (tipoAtual == 'Data/Hora' and tipoColuna == 'Data'):
+                    continue
+                self._plano[coluna] = tipoColuna
+        return self._plano
+
+    def ValidarAmostra(self) -> pd.DataFrame:
+        """
+        Converte uma amostra de linhas igualmente espaçadas das colunas do plano, estimando as falhas de conversão.
+
+        Retorna:
+            pd.DataFrame: DataFrame com uma linha por coluna do plano e as colunas 'NomeColuna', 'TipoAntes',
+                'TipoDepois', 'QtdAmostra', 'FalhasAmostra' e 'PctFalhasAmostra'.
+        """
+        dados = self._analise.Dados
+        posicoes = _posicoesDaAmostra(dados.shape[0], self._tamanhoAmostra) if dados.shape[0] > 0 else []
+
+        linhas = []
+        for coluna, tipoColuna in self.Plano.items():
+            amostra = dados[coluna].iloc[posicoes]
+            _, qtdFalhas = _converterSerie(amostra, tipoColuna)
+            qtdValores = int(amostra.notnull().sum())
+            linhas.append([coluna, self._analise.TipoDeDadosAtual(coluna), tipoColuna, qtdValores, qtdFalhas,
+                           qtdFalhas / qtdValores * 100.0 if qtdValores > 0 else 0.0])
+
+        return pd.DataFrame(data=linhas, columns=['NomeColuna', 'TipoAntes', 'TipoDepois', 'QtdAmostra', 'FalhasAmostra', 'PctFalhasAmostra'],
+                            index=pd.Index(self.Plano.keys(), dtype='object'))
+
+    def Converter(self) -> dict:
+        """
+        Converte as colunas do plano, em paralelo.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'dados': Cópia rasa dos dados com as colunas convertidas (os dados originais não são alterados).
+                'relatorio': DataFrame com uma linha por coluna convertida e as colunas 'NomeColuna', 'TipoAntes',
+                    'TipoDepois', 'TipoDeDados' (dtype resultante) e 'QtdFalhas' (valores que se tornaram nulos).
+                'qtd_falhas': Total de valores que se tornaram nulos.
+        """
+        dados = self._analise.Dados
+        plano = self.Plano
+
+        with ThreadPoolExecutor(max_workers=self._maxWorkers) as pool:
+            tarefas = {coluna: pool.submit(_converterSerie, dados[coluna], tipoColuna) for coluna, tipoColuna in plano.items()}
+            convertidas = {coluna: tarefa.result() for coluna, tarefa in tarefas.items()}
+
+        dadosConvertidos = dados.copy(deep=False)
+        linhas = []
+        for coluna, (serie, qtdFalhas) in convertidas.items():
+            dadosConvertidos[coluna] = serie
+            linhas.append([coluna, self._analise.TipoDeDadosAtual(coluna), plano[coluna], str(serie.dtype), qtdFalhas])
+
+        relatorio = pd.DataFrame(data=linhas, columns=['NomeColuna', 'TipoAntes', 'TipoDepois', 'TipoDeDados', 'QtdFalhas'],
+                                 index=pd.Index(plano.keys(), dtype='object'))
+        return {
+            'dados': dadosConvertidos,
+            'relatorio': relatorio,
+            'qtd_falhas': int(relatorio['QtdFalhas'].sum()),
+        }
@@ -1,5 +1,482 @@
+import functools
+import hashlib
+import inspect
+import warnings
+from collections.abc import Mapping
+import numpy as np
 import pandas as pd
 import streamlit as st
+from classes.Quantis import EsbocoDeQuantis
+
+
+def _congelar(valor):
+    """
+    Converte listas, tuplas, conjuntos e dicionários (recursivamente) em tuplas, para que possam compor a chave do cache.
+    """
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(_congelar(v) for v in valor))
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _congelar(v)) for k, v in valor.items()))
+    return valor
+
+
+def _memorizar(metodo):
+    """
+    Decorador que armazena o resultado de um método de AnaliseDataset no cache da instância.
+
+    A chave do cache é formada pelo nome do método e pelos parâmetros efetivos da chamada (incluindo os valores padrão),
+    de modo que `Outliers('A')` e `Outliers(coluna='A', qtd_desvios=1.5)` compartilham o mesmo resultado.
+    Os resultados armazenados são compartilhados entre as chamadas e não devem ser alterados por quem os recebe.
+    """
+    assinatura = inspect.signature(metodo)
+
+    @functools.wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        parametros = assinatura.bind(self, *args, **kwargs)
+        parametros.apply_defaults()
+        chave = (metodo.__name__, _congelar(list(parametros.arguments.items())[1:]))
+        if chave not in self._cache:
+            self._cache[chave] = metodo(self, *args, **kwargs)
+        return self._cache[chave]
+
+    return envoltorio
+
+
+def _impressaoDigital(dados: pd.DataFrame, configColunas: pd.DataFrame=None, tamanho_amostra: int=1000) -> str:
+    """
+    Calcula uma impressão digital barata do conteúdo de um DataFrame e da configuração das colunas.
+
+    São considerados o formato, os nomes e os tipos das colunas e o hash de uma amostra de até `tamanho_amostra` 
+    linhas igualmente espaçadas, de modo que o custo independe da quantidade de linhas do dataset.
+
+    Parâmetros:
+        dados (pd.DataFrame): DataFrame com os dados.
+        configColunas (pd.DataFrame, opcional): DataFrame com a configuração das colunas.
+        tamanho_amostra (int, opcional): Quantidade máxima de linhas usadas no hash do conteúdo.
+
+    Retorna:
+        str: Impressão digital em hexadecimal.
+    """
+    impressao = hashlib.blake2b(digest_size=16)
+    impressao.update(repr((dados.shape, list(dados.columns), [str(t) for t in dados.dtypes])).encode())
+
+    if dados.shape[0] > 0:
+        amostra = dados.iloc[_posicoesDaAmostra(dados.shape[0], tamanho_amostra)]
+        impressao.update(pd.util.hash_pandas_object(amostra, index=False).to_numpy().tobytes())
+
+    if configColunas is not None:
+        impressao.update(pd.util.hash_pandas_object(configColunas[['NomeColuna', 'TipoColuna']].astype('str'), index=False).to_numpy().tobytes())
+
+    return impressao.hexdigest()
+
+
+def _posicoesDaAmostra(qtdLinhas: int, tamanho_amostra: int) -> np.ndarray:
+    """
+    Retorna as posições de até `tamanho_amostra` linhas igualmente espaçadas entre as `qtdLinhas` linhas do dataset.
+    """
+    return np.unique(np.linspace(0, qtdLinhas - 1, num=min(qtdLinhas, tamanho_amostra)).astype('int64'))
+
+
+def _mesmaMemoria(serieA: pd.Series, serieB: pd.Series) -> bool:
+    """
+    Indica se duas séries usam os mesmos valores em memória (ex.: uma coluna não substituída de uma cópia rasa).
+    """
+    if isinstance(serieA.dtype, np.dtype) and isinstance(serieB.dtype, np.dtype):
+        return np.may_share_memory(serieA.to_numpy(), serieB.to_numpy())
+    return serieA.array is serieB.array
+
+
+def _valoresDaChave(valor) -> list:
+    """
+    Lista os valores (strings e números) contidos em um valor congelado por `_congelar`.
+    """
+    if isinstance(valor, tuple):
+        return [item for parte in valor for item in _valoresDaChave(parte)]
+    return [valor]
+
+
+# granularidades das séries temporais: (unidade do datetime64 usada no agrupamento, duração aproximada em segundos)
+GRANULARIDADES_TEMPORAIS = {
+    'Minuto': ('m', 60),
+    'Hora': ('h', 3600),
+    'Dia': ('D', 86400),
+    'Semana': ('W', 7 * 86400),
+    'Mês': ('M', 30.44 * 86400),
+    'Ano': ('Y', 365.25 * 86400),
+}
+
+
+# variância relativa (à soma dos quadrados dos desvios) abaixo da qual uma coluna é considerada constante na correlação
+TOLERANCIA_VARIANCIA = 1e-12
+
+# memória máxima, em bytes, de cada matriz float64 montada com as colunas quantitativas (veja `_colunasPorMatriz`)
+LIMITE_BYTES_MATRIZ = 256 * 1024 * 1024
+
+# regras de identificação de outliers e os respectivos multiplicadores padrão
+METODOS_OUTLIERS = {'DIQ': 1.5, 'Escore-Z': 3.0, 'MAD': 3.5}
+
+# nomes dos dias da semana, a partir da segunda-feira (dia 0 em numpy e pandas)
+DIAS_DA_SEMANA = ['Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira', 'Sexta-feira', 'Sábado', 'Domingo']
+
+
+def _reduzirPorChave(chaves: np.ndarray, soma: np.ndarray, contagem: np.ndarray, menor: np.ndarray, maior: np.ndarray) -> tuple:
+    """
+    Combina somas, contagens, mínimos e máximos parciais que possuem a mesma chave, de forma vetorizada (ordenação 
+    das chaves seguida de `reduceat`).
+
+    Retorna:
+        tuple: (chaves únicas em ordem crescente, soma, contagem, menor, maior).
+    """
+    if len(chaves) == 0:
+        return chaves, soma, contagem, menor, maior
+    ordem = np.argsort(chaves, kind='stable')
+    chaves = chaves[ordem]
+    inicios = np.flatnonzero(np.concatenate([[True], chaves[1:] != chaves[:-1]]))
+    return (chaves[inicios], np.add.reduceat(soma[ordem], inicios), np.add.reduceat(contagem[ordem], inicios),
+            np.minimum.reduceat(menor[ordem], inicios), np.maximum.reduceat(maior[ordem], inicios))
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, qtd_pontos: int) -> np.ndarray:
+    """
+    Reduz uma série ordenada por x a `qtd_pontos` pontos com o algoritmo Largest-Triangle-Three-Buckets (Steinarsson), 
+    que preserva a forma da série (picos e vales).
+
+    Retorna:
+        np.ndarray: Posições dos pontos mantidos, em ordem crescente (sempre incluindo o primeiro e o último).
+    """
+    qtdValores = len(x)
+    if qtd_pontos >= qtdValores or qtd_pontos < 3:
+        return np.arange(qtdValores)
+
+    # o primeiro e o último ponto são mantidos; os demais são divididos em qtd_pontos - 2 grupos
+    limites = np.linspace(1, qtdValores - 1, qtd_pontos - 1).astype('int64')
+    posicoes = np.empty(qtd_pontos, dtype='int64')
+    posicoes[0], posicoes[-1] = 0, qtdValores - 1
+    anterior = 0
+    for grupo in range(qtd_pontos - 2):
+        inicio, fim = limites[grupo], limites[grupo + 1]
+        proximoFim = limites[grupo + 2] if grupo + 2 < len(limites) else qtdValores
+        mediaX, mediaY = x[fim:proximoFim].mean(), y[fim:proximoFim].mean()
+        # área do triângulo formado pelo ponto escolhido no grupo anterior, cada ponto do grupo e a média do próximo
+        areas = np.abs((x[anterior] - mediaX) * (y[inicio:fim] - y[anterior]) - (x[anterior] - x[inicio:fim]) * (mediaY - y[anterior]))
+        anterior = inicio + int(np.argmax(areas))
+        posicoes[grupo + 1] = anterior
+    return posicoes
+
+
+def _correlacaoEntre(matrizA: np.ndarray, validosA: np.ndarray, matrizB: np.ndarray, validosB: np.ndarray) -> np.ndarray:
+    """
+    Calcula a correlação de Pearson entre cada coluna de `matrizA` e cada coluna de `matrizB`, considerando, para 
+    cada par, apenas as linhas em que as duas colunas são preenchidas (como em `pd.DataFrame.corr`).
+
+    Parâmetros:
+        matrizA, matrizB (np.ndarray): Valores centralizados (subtraída a média de cada coluna), com os nulos 
+            substituídos por zero.
+        validosA, validosB (np.ndarray): Matrizes booleanas que indicam os valores preenchidos, ou None quando a 
+            matriz correspondente não possui nulos.
+
+    Retorna:
+        np.ndarray: Matriz de correlações (colunas de A x colunas de B), com NaN quando o par possui menos de duas 
+            linhas válidas ou quando uma das colunas é constante nessas linhas (veja `TOLERANCIA_VARIANCIA`).
+    """
+    quadradosA, quadradosB = matrizA ** 2, matrizB ** 2
+    if validosA is None and validosB is None:
+        n = np.full((matrizA.shape[1], matrizB.shape[1]), float(matrizA.shape[0]))
+        somaA, somaB = matrizA.sum(axis=0)[:, None], matrizB.sum(axis=0)[None, :]
+        somaAA, somaBB = quadradosA.sum(axis=0)[:, None], quadradosB.sum(axis=0)[None, :]
+    else:
+        validosA = np.ones(matrizA.shape) if validosA is None else validosA.astype('float64')
+        validosB = np.ones(matrizB.shape) if validosB is None else validosB.astype('float64')
+        n = validosA.T @ validosB
+        somaA, somaB = matrizA.T @ validosB, validosA.T @ matrizB
+        somaAA, somaBB = quadradosA.T @ validosB, validosA.T @ quadradosB
+    somaAB = matrizA.T @ matrizB
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariancia = somaAB - somaA * somaB / n
+        varianciaA = somaAA - somaA ** 2 / n
+        varianciaB = somaBB - somaB ** 2 / n
+        correlacao = covariancia / np.sqrt(varianciaA * varianciaB)
+    # colunas constantes no par deixam apenas resíduos de arredondamento na variância, que não podem virar ±1
+    correlacao[(n < 2) | (varianciaA <= TOLERANCIA_VARIANCIA * somaAA) | (varianciaB <= TOLERANCIA_VARIANCIA * somaBB)] = np.nan
+    return np.clip(correlacao, -1.0, 1.0)
+
+
+def _paginar(tabela, pagina: int, tamanho_pagina: int) -> dict:
+    """
+    Seleciona uma página de uma tabela (ou de qualquer sequência que aceite `len` e fatiamento por posição).
+
+    Retorna:
+        dict: Dicionário com 'tabela' (itens da página), 'total' (quantidade de itens), 'paginas' (quantidade de 
+            páginas) e 'pagina' (página efetivamente retornada, limitada entre 1 e 'paginas').
+    """
+    total = len(tabela)
+    if tamanho_pagina is None or tamanho_pagina <= 0:
+        return {'tabela': tabela, 'total': total, 'paginas': 1, 'pagina': 1}
+
+    paginas = max(1, -(-total // tamanho_pagina))
+    pagina = min(max(1, pagina), paginas)
+    inicio = (pagina - 1) * tamanho_pagina
+    fatia = tabela.iloc[inicio:inicio + tamanho_pagina] if hasattr(tabela, 'iloc') else tabela[inicio:inicio + tamanho_pagina]
+    return {
+        'tabela': fatia,
+        'total': total,
+        'paginas': paginas,
+        'pagina': pagina,
+    }
+
+
+class ResultadoOutliers(Mapping):
+    """
+    Classe ResultadoOutliers
+
+    Esta classe guarda os outliers de uma coluna de forma compacta: os limites, as quantidades e apenas os valores 
+    fora dos limites em uma série indexada pela posição da linha no dataset. Os valores são acessados por página 
+    (`Pagina`) ou pelos N mais extremos (`Maiores` e `Menores`), sem criar uma lista Python com todos eles.
+
+    Para compatibilidade, a instância também pode ser lida como o dicionário retornado antes por 
+    `AnaliseDataset.Outliers` ('valor', 'texto', 'lista', 'valor_acima', 'lista_acima', 'valor_abaixo' e 
+    'lista_abaixo'). As listas são montadas, em ordem crescente, apenas quando a chave correspondente é lida.
+
+    Exemplo de uso:
+        >>> outliers = analise.Outliers('Valores')
+        >>> outliers.Quantidade, outliers.LimiteSuperior
+        (1, 33.5)
+        >>> outliers.Pagina(pagina=1, tamanho_pagina=100)['tabela']
+           Posicao  Valor   Lado
+        0        7    100  Acima
+        >>> outliers['lista']
+        [100]
+    """
+    CHAVES = ('valor', 'texto', 'lista', 'valor_acima', 'lista_acima', 'valor_abaixo', 'lista_abaixo')
+
+    def __init__(self, valores: pd.Series, limite_inferior: float, limite_superior: float):
+        """
+        Inicializa o resultado.
+
+        Parâmetros:
+            valores (pd.Series): Valores fora dos limites, indexados pela posição da linha no dataset.
+            limite_inferior (float): Limite inferior usado na identificação.
+            limite_superior (float): Limite superior usado na identificação.
+        """
+        self._valores = valores
+        self._limiteInferior = limite_inferior
+        self._limiteSuperior = limite_superior
+        self._acima = (valores > limite_superior).to_numpy(dtype=bool, na_value=False)
+        self._ordem = None
+
+    @property
+    def LimiteInferior(self) -> float:
+        return self._limiteInferior
+
+    @property
+    def LimiteSuperior(self) -> float:
+        return self._limiteSuperior
+
+    @property
+    def Quantidade(self) -> int:
+        return len(self._valores)
+
+    @property
+    def QuantidadeAcima(self) -> int:
+        return int(np.count_nonzero(self._acima))
+
+    @property
+    def QuantidadeAbaixo(self) -> int:
+        return self.Quantidade - self.QuantidadeAcima
+
+    @property
+    def Texto(self) -> str:
+        return f'〽️ Outliers: {self.Quantidade}'
+
+    @property
+    def Posicoes(self) -> np.ndarray:
+        """Posições (iniciando em 0) das linhas com outliers, na ordem do dataset."""
+        return self._valores.index.to_numpy()
+
+    def Valores(self, lado: str=None) -> pd.Series:
+        """
+        Retorna os outliers na ordem do dataset, indexados pela posição da linha.
+
+        Parâmetros:
+            lado (str, opcional): 'Acima' ou 'Abaixo' para apenas um dos lados. Se não for fornecido, retorna todos.
+        """
+        return self._valores[self._selecao(lado)]
+
+    def Maiores(self, n: int=10) -> pd.Series:
+        """
+        Retorna os `n` maiores outliers, em ordem decrescente, sem ordenar todos os valores.
+        """
+        return self._extremos(n, maiores=True)
+
+    def Menores(self, n: int=10) -> pd.Series:
+        """
+        Retorna os `n` menores outliers, em ordem crescente, sem ordenar todos os valores.
+        """
+        return self._extremos(n, maiores=False)
+
+    def Pagina(self, pagina: int=1, tamanho_pagina: int=100, lado: str=None) -> dict:
+        """
+        Retorna uma página dos outliers em ordem crescente de valor.
+
+        Parâmetros:
+            pagina (int, opcional): Número da página (iniciando em 1).
+            tamanho_pagina (int, opcional): Quantidade de outliers por página.
+            lado (str, opcional): 'Acima' ou 'Abaixo' para apenas um dos lados. Se não for fornecido, usa todos.
+
+        Retorna:
+            dict: Dicionário no formato de `AnaliseDataset.CatalogoDeColunas`, em que 'tabela' possui as colunas 
+                'Posicao', 'Valor' e 'Lado'.
+        """
+        ordem = self._ordenados()
+        ordem = ordem[self._selecao(lado)[ordem]]
+        resultado = _paginar(ordem, pagina, tamanho_pagina)
+        posicoes = resultado['tabela']
+        resultado['tabela'] = pd.DataFrame({
+            'Posicao': self._valores.index.to_numpy()[posicoes],
+            'Valor': self._valores.iloc[posicoes].reset_index(drop=True),
+            'Lado': np.where(self._acima[posicoes], 'Acima', 'Abaixo'),
+        })
+        return resultado
+
+    def _selecao(self, lado: str) -> np.ndarray:
+        if lado is None:
+            return np.ones(len(self._acima), dtype=bool)
+        if lado == 'Acima':
+            return self._acima
+        if lado == 'Abaixo':
+            return ~self._acima
+        raise Exception(f'O lado {lado} não é suportado. Use Acima ou Abaixo.')
+
+    def _ordenados(self) -> np.ndarray:
+        # a ordenação é calculada uma única vez e guardada como posições (int64)
+        if self._ordem is None:
+            self._ordem = np.argsort(self._valores.to_numpy(dtype='float64', na_value=np.nan), kind='stable')
+        return self._ordem
+
+    def _extremos(self, n: int, maiores: bool) -> pd.Series:
+        valores = self._valores.to_numpy(dtype='float64', na_value=np.nan)
+        n = min(max(n, 0), len(valores))
+        if n == 0:
+            return self._valores.iloc[:0]
+        chaves = -valores if maiores else valores
+        posicoes = np.argpartition(chaves, n - 1)[:n] if n < len(valores) else np.arange(len(valores))
+        posicoes = posicoes[np.argsort(chaves[posicoes], kind='stable')]
+        return self._valores.iloc[posicoes]
+
+    def __getitem__(self, chave: str):
+        if chave == 'valor':
+            return self.Quantidade
+        if chave == 'texto':
+            return self.Texto
+        if chave == 'valor_acima':
+            return self.QuantidadeAcima
+        if chave == 'valor_abaixo':
+            return self.QuantidadeAbaixo
+        if chave in ('lista', 'lista_acima', 'lista_abaixo'):
+            lado = {'lista': None, 'lista_acima': 'Acima', 'lista_abaixo': 'Abaixo'}[chave]
+            ordem = self._ordenados()
+            return self._valores.iloc[ordem[self._selecao(lado)[ordem]]].to_list()
+        raise KeyError(chave)
+
+    def __iter__(self):
+        return iter(self.CHAVES)
+
+    def __len__(self) -> int:
+        return len(self.CHAVES)
+
+    def __repr__(self) -> str:
+        return (f'ResultadoOutliers(valor={self.Quantidade}, valor_acima={self.QuantidadeAcima}, '
+                f'valor_abaixo={self.QuantidadeAbaixo}, limites=({self._limiteInferior}, {self._limiteSuperior}))')
+
+
+def AnaliseDaSessao() -> 'AnaliseDataset':
+    """
+    Obtém a instância de AnaliseDataset da sessão do Streamlit para os dados e a configuração de colunas atuais.
+
+    A instância (e os resultados já calculados por ela) é reaproveitada entre as execuções da página enquanto 
+    `st.session_state['dados']` for o mesmo objeto usado por ela e a impressão digital da configuração não mudar. A 
+    impressão digital usa apenas uma amostra das linhas, por isso não basta para reconhecer os mesmos dados: toda 
+    página que altera os dados substitui o objeto da sessão. Uma nova instância é criada quando outro arquivo é 
+    importado ou quando a configuração das colunas é confirmada com alterações; nesse caso, os resultados das colunas 
+    que não mudaram são transferidos para a nova instância (veja `ReaproveitarResultados`). Isso inclui a conversão de 
+    tipos registrada com `RegistrarConversaoDaSessao`: os dados convertidos são outro objeto, mas as colunas não 
+    convertidas continuam sendo as mesmas.
+
+    Quando o arquivo foi importado no modo out-of-core (`st.session_state['fonte_blocos']`), é criada uma instância 
+    de AnaliseDatasetEmBlocos, que percorre o arquivo em blocos.
+
+    Retorna:
+        AnaliseDataset: Instância para `st.session_state['dados']` e `st.session_state['colunas']`.
+    """
+    dados = st.session_state['dados']
+    colunas = st.session_state['colunas']
+    fonte = st.session_state.get('fonte_blocos')
+    analise = st.session_state.get('analise')
+
+    # no modo out-of-core, a instância usa o primeiro bloco da fonte, e não o objeto convertido da sessão
+    base = fonte.Amostra if fonte is not None else dados
+    if analise is None or analise.Dados is not base or analise.ImpressaoDigital != _impressaoDigital(base, colunas):
+        anterior = analise
+        if fonte is not None:
+            # modo out-of-core: `dados` contém apenas o primeiro bloco do arquivo
+            from classes.DatasetEmBlocos import AnaliseDatasetEmBlocos
+            analise = AnaliseDatasetEmBlocos(fonte, colunas)
+        else:
+            analise = AnaliseDataset(dados, colunas)
+        if anterior is not None:
+            analise.ReaproveitarResultados(anterior, ColunasConvertidasNaSessao(anterior.Dados, analise.Dados))
+        st.session_state['analise'] = analise
+    return analise
+
+
+def RegistrarConversaoDaSessao(dados: pd.DataFrame, colunas_convertidas: list):
+    """
+    Registra que `dados` é uma cópia rasa de `st.session_state['dados']` em que apenas as colunas informadas foram 
+    substituídas (ex.: o resultado de `ConversorDeTipos.Converter`). Deve ser chamada antes de `dados` substituir os 
+    dados da sessão. Conversões seguidas são acumuladas a partir dos dados anteriores à primeira delas.
+
+    Parâmetros:
+        dados (pd.DataFrame): Dados convertidos.
+        colunas_convertidas (list): Colunas substituídas na conversão.
+    """
+    origem = st.session_state['dados']
+    colunas = list(colunas_convertidas)
+    conversao = st.session_state.get('conversao_dados')
+    if conversao is not None and conversao['dados'] is origem:
+        origem = conversao['origem']
+        colunas = list(dict.fromkeys(conversao['colunas'] + colunas))
+    st.session_state['conversao_dados'] = {'origem': origem, 'dados': dados, 'colunas': colunas}
+
+
+def ColunasConvertidasNaSessao(origem: pd.DataFrame, dados: pd.DataFrame) -> list:
+    """
+    Obtém as colunas substituídas entre dois objetos de dados da sessão (veja `RegistrarConversaoDaSessao`).
+
+    Parâmetros:
+        origem (pd.DataFrame): Dados anteriores.
+        dados (pd.DataFrame): Dados atuais.
+
+    Retorna:
+        list: Lista vazia se os objetos forem o mesmo, as colunas convertidas se `dados` tiver sido obtido de `origem` 
+            por conversão de tipos, ou None se não houver relação registrada entre eles.
+    """
+    if origem is dados:
+        return []
+    conversao = st.session_state.get('conversao_dados')
+    if conversao is not None and conversao['origem'] is origem and conversao['dados'] is dados:
+        return conversao['colunas']
+    return None
+
+
+def InvalidarAnaliseDaSessao():
+    """
+    Descarta a instância de AnaliseDataset da sessão, junto com todos os resultados armazenados por ela.
+    """
+    st.session_state['analise'] = None
+
 
 class AnaliseDataset:
     """
@@ -18,6 +495,11 @@ class AnaliseDataset:
         Atributos:
             _dados (pd.DataFrame): DataFrame contendo os dados a serem analisados.
             _configColunas (pd.DataFrame): DataFrame contendo a configuração das colunas, incluindo tipo e classificação.
+            _papelPorColuna (dict): Papel de cada coluna (Qualitativa, Quantitativa, Data ou Data/Hora), indexado pelo nome.
+            _colunasPorPapel (dict): Lista de colunas de cada papel, na ordem da configuração.
+            _cache (dict): Resultados já calculados pelos métodos de análise, indexados pelo método e pelos parâmetros.
+            _impressaoDigital (str): Impressão digital dos dados e da configuração (calculada sob demanda).
+            _assinaturas (dict): Assinatura de cada coluna (calculada sob demanda).
         """
         self._dados = dados
         if configColunas is not None:
@@ -25,6 +507,10 @@ class AnaliseDataset:
         else:
             self._configColunas = self._prepararConfigColunas()
         self._configColunas = self._classificarColunas()
+        self._indexarColunas()
+        self._cache = {}
+        self._impressaoDigital = None
+        self._assinaturas = None
 
     def _prepararConfigColunas(self) -> pd.DataFrame:
         """
@@ -42,16 +528,7 @@ class AnaliseDataset:
 
         tipos = []
         for t in dados.dtypes:
-            if t == 'object':
-                tipos.append('Texto')
-            elif t == 'int64':
-                tipos.append('Inteiro')
-            elif t == 'float64':
-                tipos.append('Decimal')
-            elif t == 'datetime64[ns]':
-                tipos.append('Data/Hora')
-            else:
-                tipos.append(None)
+            tipos.append(self._obterTipoDeDados(t))
             
         # prepara dataframe
         auxColunas = pd.DataFrame(
@@ -63,6 +540,39 @@ class AnaliseDataset:
         
         return auxColunas
     
+    def _obterTipoDeDados(self, dtype) -> str:
+        """
+        Obtém o tipo de dados da coluna (Texto, Inteiro, Decimal, Data/Hora) a partir do dtype do pandas.
+
+        Todas as larguras são reconhecidas (ex.: int8/Int64 como Inteiro, float32 como Decimal) e colunas categóricas 
+        ou de strings (inclusive as do pyarrow) são tratadas como Texto, de modo que os dados compactados por 
+        `Compactar` mantêm a mesma configuração.
+
+        Parâmetros:
+            dtype: Tipo de dados (dtype) da coluna no DataFrame.
+
+        Retorna:
+            str: Tipo de dados da coluna ou None para tipos não reconhecidos.
+        """
+        if pd.api.types.is_bool_dtype(dtype):
+            return None
+        elif pd.api.types.is_object_dtype(dtype) or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            return 'Texto'
+        elif pd.api.types.is_integer_dtype(dtype):
+            return 'Inteiro'
+        elif pd.api.types.is_float_dtype(dtype):
+            return 'Decimal'
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            return 'Data/Hora'
+        else:
+            return None
+
+    def TipoDeDadosAtual(self, coluna: str) -> str:
+        """
+        Retorna o tipo de dados (Texto, Inteiro, Decimal, Data/Hora) correspondente ao dtype atual da coluna nos dados.
+        """
+        return self._obterTipoDeDados(self.Dados[coluna].dtype)
+
     def _obterClassificacaoColuna(self, tipoDeDados: str) -> str:
         """
         Obtém a classificação da coluna com base no tipo de dados.
@@ -101,6 +611,60 @@ class AnaliseDataset:
         colunas['ClassifColuna'] = colunas['TipoColuna'].apply(lambda x: self._obterClassificacaoColuna(x))
         return colunas 
 
+    def _indexarColunas(self):
+        """
+        Monta o índice de papéis das colunas a partir da configuração das colunas.
+
+        O índice é montado uma única vez por configuração, em uma passagem sobre `_configColunas`, e permite 
+        consultar o papel de uma coluna em O(1) e obter as listas de colunas de cada papel sem refiltrar a configuração.
+        """
+        nomes = self._configColunas['NomeColuna'].to_list()
+        papeis = [self._obterPapelColuna(classif) for classif in self._configColunas['ClassifColuna']]
+
+        self._colunas = nomes
+        self._papeis = np.array(papeis, dtype=object)
+        self._papelPorColuna = dict(zip(nomes, papeis))
+        self._colunasPorPapel = {'Qualitativa': [], 'Quantitativa': [], 'Data': [], 'Data/Hora': []}
+        for nome, papel in zip(nomes, papeis):
+            if papel is not None:
+                self._colunasPorPapel[papel].append(nome)
+
+    def _obterPapelColuna(self, classifColuna: str) -> str:
+        """
+        Obtém o papel da coluna (Qualitativa, Quantitativa, Data ou Data/Hora) a partir da sua classificação.
+
+        Parâmetros:
+            classifColuna (str): Classificação da coluna (ex.: 'Qualitativa Nominal', 'Quantitativa Discreta').
+
+        Retorna:
+            str: Papel da coluna ou None para classificações não reconhecidas.
+        """
+        if not isinstance(classifColuna, str):
+            return None
+        if 'Qualitativa' in classifColuna:
+            return 'Qualitativa'
+        if 'Quantitativa' in classifColuna:
+            return 'Quantitativa'
+        if classifColuna in ('Data', 'Data/Hora'):
+            return classifColuna
+        return None
+
+    def PapelDaColuna(self, coluna: str) -> str:
+        """
+        Retorna o papel da coluna (Qualitativa, Quantitativa, Data ou Data/Hora), ou None se ela não for reconhecida.
+        """
+        return self._papelPorColuna.get(coluna)
+
+    def _validarPapel(self, coluna: str, papel: str):
+        """
+        Garante que a coluna possui o papel informado.
+
+        Lança:
+            Exception: Se a coluna fornecida não for identificada com o papel informado.
+        """
+        if self._papelPorColuna.get(coluna) != papel:
+            raise Exception(f'A coluna {coluna} não é identificada como {papel}.')
+
     @property
     def Dados(self):
         return self._dados
@@ -108,10 +672,125 @@ class AnaliseDataset:
     @property
     def ConfigColunas(self):
         return self._configColunas
+
+    @property
+    def ImpressaoDigital(self) -> str:
+        if self._impressaoDigital is None:
+            self._impressaoDigital = _impressaoDigital(self.Dados, self.ConfigColunas)
+        return self._impressaoDigital
     
     @property
-    def MemoriaEmBytes(self) -> pd.DataFrame:
-        return self.Dados.memory_usage().sum()
+    def AssinaturasDasColunas(self) -> dict:
+        """
+        Assinatura de cada coluna, formada pelo tipo de dados, pela configuração (tipo e classificação), pela 
+        quantidade de linhas e pelo hash dos valores de uma amostra de linhas igualmente espaçadas. A amostra não 
+        garante que os dados sejam iguais: a assinatura só identifica colunas inalteradas entre instâncias sobre o 
+        mesmo objeto de dados (ex.: quando apenas a configuração das colunas é confirmada novamente).
+
+        Retorna:
+            dict: Dicionário {nome da coluna: assinatura em hexadecimal}.
+        """
+        if self._assinaturas is None:
+            posicoes = _posicoesDaAmostra(self.Dados.shape[0], 1000) if self.Dados.shape[0] > 0 else []
+            amostra = self.Dados.iloc[posicoes]
+            self._assinaturas = {}
+            for coluna in self.Colunas:
+                assinatura = hashlib.blake2b(digest_size=16)
+                configuracao = self._configColunas.loc[coluna]
+                assinatura.update(repr((coluna, str(self.Dados[coluna].dtype), configuracao['TipoColuna'], 
+                                        configuracao['ClassifColuna'], self.Dados.shape[0])).encode())
+                assinatura.update(pd.util.hash_pandas_object(amostra[coluna], index=False).to_numpy().tobytes())
+                self._assinaturas[coluna] = assinatura.hexdigest()
+        return self._assinaturas
+
+    def ColunasAlteradas(self, anterior: 'AnaliseDataset', colunas_convertidas: list=None) -> list:
+        """
+        Lista as colunas desta instância que são novas ou cuja assinatura mudou em relação a outra instância.
+
+        Parâmetros:
+            anterior (AnaliseDataset): Instância anterior (ex.: antes da confirmação de uma configuração de colunas).
+            colunas_convertidas (list, opcional): Colunas substituídas quando os dados desta instância são uma cópia 
+                rasa dos dados da anterior (veja `_mesmaOrigem`). Elas são sempre consideradas alteradas.
+
+        Retorna:
+            list: Nomes das colunas alteradas, na ordem da configuração.
+        """
+        if not self._mesmaOrigem(anterior, colunas_convertidas):
+            return self.Colunas
+        convertidas = set(colunas_convertidas or [])
+        anteriores = anterior.AssinaturasDasColunas
+        return [coluna for coluna, assinatura in self.AssinaturasDasColunas.items() 
+                if coluna in convertidas or anteriores.get(coluna) != assinatura]
+
+    def ReaproveitarResultados(self, anterior: 'AnaliseDataset', colunas_convertidas: list=None) -> int:
+        """
+        Copia do cache de outra instância os resultados que dependem apenas de colunas não alteradas. Só há 
+        reaproveitamento entre instâncias sobre o mesmo objeto de dados, ou sobre uma cópia rasa dele em que apenas 
+        `colunas_convertidas` foram substituídas (veja `_mesmaOrigem`); os resultados de outra importação nunca são 
+        reaproveitados.
+
+        As dependências de cada resultado são as colunas informadas nos parâmetros do método (ex.: `Outliers('A')` 
+        depende de 'A'; `TotalPorCategoria('A', 'B')`, de 'A' e 'B'). Resultados sem colunas nos parâmetros (ex.: 
+        `MatrizDeCorrelacao()`) dependem do dataset inteiro e são recalculados. Por isso, os métodos memorizados com 
+        `_memorizar` devem depender apenas das colunas recebidas como parâmetro.
+
+        Parâmetros:
+            anterior (AnaliseDataset): Instância anterior.
+            colunas_convertidas (list, opcional): Colunas substituídas nos dados desta instância em relação aos dados 
+                da anterior (ex.: as colunas do relatório de `ConversorDeTipos.Converter`).
+
+        Retorna:
+            int: Quantidade de resultados reaproveitados.
+
+        Exemplo de uso:
+            >>> conversao = ConversorDeTipos(AnaliseDataset(dados, configAjustada)).Converter()
+            >>> nova = AnaliseDataset(conversao['dados'], configAjustada)
+            >>> nova.ReaproveitarResultados(analise, conversao['relatorio']['NomeColuna'].to_list())
+        """
+        if not self._mesmaOrigem(anterior, colunas_convertidas):
+            return 0
+
+        inalteradas = set(self.Colunas) - set(self.ColunasAlteradas(anterior, colunas_convertidas))
+        colunasAnteriores = set(anterior.Colunas)
+        qtdReaproveitados = 0
+        for chave, resultado in anterior._cache.items():
+            if chave in self._cache:
+                continue
+            if chave[0] in ('EsbocosDeQuantis', 'NulosPorColuna', 'PerfilQuantitativo'):
+                # resultados mantidos por coluna
+                self._cache[chave] = {coluna: valor for coluna, valor in resultado.items() if coluna in inalteradas}
+                qtdReaproveitados += len(self._cache[chave])
+                continue
+
+            # apenas os valores dos parâmetros são considerados (os nomes dos parâmetros podem coincidir com colunas)
+            dependencias = {valor for _, valorParametro in chave[1] for valor in _valoresDaChave(valorParametro) 
+                            if isinstance(valor, str) and valor in colunasAnteriores}
+            if len(dependencias) > 0 and dependencias <= inalteradas:
+                self._cache[chave] = resultado
+                qtdReaproveitados += 1
+        return qtdReaproveitados
+
+    def _mesmaOrigem(self, anterior: 'AnaliseDataset', colunas_convertidas: list=None) -> bool:
+        """
+        Indica se os resultados de outra instância podem ser reaproveitados por esta: mesma classe de análise e o 
+        mesmo objeto de dados (a assinatura amostrada das colunas não basta para reconhecer dados iguais). Com 
+        `colunas_convertidas`, os dados desta instância também podem ser uma cópia rasa dos dados da anterior em que 
+        apenas essas colunas foram substituídas, com as mesmas colunas e o mesmo índice.
+        """
+        if type(anterior) is not type(self):
+            return False
+        if anterior.Dados is self.Dados:
+            return True
+        if colunas_convertidas is None:
+            return False
+        # as colunas não convertidas de uma cópia rasa compartilham a memória dos dados anteriores
+        return (list(anterior.Dados.columns) == list(self.Dados.columns) and anterior.Dados.index.equals(self.Dados.index)
+                and all(_mesmaMemoria(anterior.Dados[coluna], self.Dados[coluna]) 
+                        for coluna in self.Dados.columns if coluna not in set(colunas_convertidas)))
+
+    @property
+    def MemoriaEmBytes(self) -> int:
+        return int(self.MemoriaPorColuna().sum() + self.Dados.index.memory_usage(deep=True))
     
     @property
     def QuantidadeDeLinhas(self) -> int:
@@ -123,28 +802,57 @@ class AnaliseDataset:
     
     @property 
     def Colunas(self) -> list:
-        df = self._configColunas
-        return df.loc[:, 'NomeColuna'].to_list()
+        return list(self._colunas)
 
     @property
     def ColunasQualitativas(self) -> list:
-        df = self._configColunas[self._configColunas['ClassifColuna'].str.contains('Qualitativa')]
-        return df['NomeColuna'].to_list()
+        return list(self._colunasPorPapel['Qualitativa'])
     
     @property
     def ColunasQuantitativas(self) -> list:
-        df = self._configColunas[self._configColunas['ClassifColuna'].str.contains('Quantitativa')]
-        return df['NomeColuna'].to_list()
+        return list(self._colunasPorPapel['Quantitativa'])
     
     @property
     def ColunasData(self) -> list:
-        df = self._configColunas[self._configColunas['ClassifColuna'] == 'Data']
-        return df['NomeColuna'].to_list()
+        return list(self._colunasPorPapel['Data'])
     
     @property
     def ColunasDataHora(self) -> list:
-        df = self._configColunas[self._configColunas['ClassifColuna'] == 'Data/Hora']
-        return df['NomeColuna'].to_list()
+        return list(self._colunasPorPapel['Data/Hora'])
+
+    def CatalogoDeColunas(self, filtro: str=None, papel: str=None, pagina: int=1, tamanho_pagina: int=None) -> dict:
+        """
+        Consulta a configuração das colunas de forma paginada, filtrando pelo nome e/ou pelo papel da coluna.
+
+        Parâmetros:
+            filtro (str, opcional): Trecho do nome da coluna (sem diferenciar maiúsculas e minúsculas).
+            papel (str, opcional): Papel da coluna (Qualitativa, Quantitativa, Data ou Data/Hora).
+            pagina (int, opcional): Número da página (iniciando em 1).
+            tamanho_pagina (int, opcional): Quantidade de colunas por página. Se não for fornecido, todas as colunas filtradas são retornadas.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'tabela': DataFrame com as linhas da configuração das colunas na página solicitada.
+                'total': Quantidade de colunas que atendem aos filtros.
+                'paginas': Quantidade de páginas.
+                'pagina': Página efetivamente retornada.
+
+        Exemplo de uso:
+            >>> import pandas as pd
+            >>> dados = pd.DataFrame({'Vendas 2023': [1], 'Vendas 2024': [2], 'Loja': ['A']})
+            >>> analise = AnaliseDataset(dados)
+            >>> catalogo = analise.CatalogoDeColunas(filtro='vendas', tamanho_pagina=1)
+            >>> print(catalogo['tabela']['NomeColuna'].to_list(), catalogo['total'], catalogo['paginas'])
+            ['Vendas 2023'] 2 2
+        """
+        config = self._configColunas
+        selecao = np.ones(config.shape[0], dtype=bool)
+        if filtro:
+            selecao &= config['NomeColuna'].astype('str').str.contains(filtro, case=False, regex=False).to_numpy()
+        if papel:
+            selecao &= self._papeis == papel
+
+        return _paginar(config[selecao], pagina, tamanho_pagina)
 
     @property
     def ListaDeColunas(self) -> str: 
@@ -206,6 +914,90 @@ class AnaliseDataset:
     def Amostra(self, linhas: int) -> pd.DataFrame:
         return self.Dados.head(linhas)
 
+    @_memorizar
+    def MemoriaPorColuna(self) -> pd.Series:
+        """
+        Calcula a memória ocupada por cada coluna, incluindo o conteúdo dos objetos (strings) referenciados pelas colunas.
+
+        Retorna:
+            pd.Series: Memória em bytes de cada coluna, indexada pelo nome da coluna.
+        """
+        return self.Dados.memory_usage(index=False, deep=True)
+
+    def Compactar(self, usar_float32: bool=False, limite_cardinalidade: float=0.5, usar_arrow: bool=False) -> dict:
+        """
+        Gera uma versão compacta dos dados, reduzindo a memória ocupada sem alterar a configuração das colunas.
+
+        - Colunas de Texto com poucos valores distintos (até `limite_cardinalidade` x quantidade de linhas) são 
+          convertidas para o tipo categórico. As demais podem ser convertidas para strings do pyarrow (`usar_arrow`).
+        - Colunas de números inteiros são convertidas para a menor largura que comporta seus valores.
+        - Colunas de números decimais são convertidas para float32 apenas quando `usar_float32` for verdadeiro, pois
+          há perda de precisão.
+
+        Parâmetros:
+            usar_float32 (bool, opcional): Converte as colunas decimais para float32.
+            limite_cardinalidade (float, opcional): Proporção máxima de valores distintos para converter Texto em categoria.
+            usar_arrow (bool, opcional): Converte as colunas de Texto de alta cardinalidade para strings do pyarrow.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'dados': DataFrame compactado (os dados originais não são alterados).
+                'relatorio': DataFrame com uma linha por coluna e as colunas 'NomeColuna', 'TipoAntes', 'TipoDepois',
+                    'BytesAntes' e 'BytesDepois'.
+                'bytes_antes': Memória total antes da compactação.
+                'bytes_depois': Memória total depois da compactação.
+
+        Exemplo de uso:
+            >>> import pandas as pd
+            >>> dados = pd.DataFrame({'UF': ['SP', 'RJ'] * 50000, 'Qtd': range(100000)})
+            >>> analise = AnaliseDataset(dados)
+            >>> compactacao = analise.Compactar()
+            >>> print(compactacao['relatorio'][['TipoAntes', 'TipoDepois']])
+                TipoAntes TipoDepois
+            UF     object   category
+            Qtd     int64      int32
+        """
+        dados = self.Dados
+        quantidadeDeLinhas = max(1, self.QuantidadeDeLinhas)
+
+        colunasCompactas = {}
+        for coluna in dados.columns:
+            serie = dados[coluna]
+            tipo = self._obterTipoDeDados(serie.dtype)
+            if tipo == 'Texto' and pd.api.types.is_object_dtype(serie.dtype):
+                if serie.nunique(dropna=True) <= limite_cardinalidade * quantidadeDeLinhas:
+                    colunasCompactas[coluna] = serie.astype('category')
+                elif usar_arrow:
+                    try:
+                        colunasCompactas[coluna] = serie.astype('string[pyarrow]')
+                    except (ImportError, TypeError):
+                        # pyarrow indisponível ou coluna com objetos que não são strings
+                        pass
+            elif tipo == 'Inteiro':
+                colunasCompactas[coluna] = pd.to_numeric(serie, downcast='integer')
+            elif tipo == 'Decimal' and usar_float32:
+                colunasCompactas[coluna] = pd.to_numeric(serie, downcast='float')
+
+        dadosCompactos = dados.assign(**colunasCompactas) if len(colunasCompactas) > 0 else dados.copy(deep=False)
+        compacta = AnaliseDataset(dadosCompactos, self.ConfigColunas.copy())
+
+        relatorio = pd.DataFrame(
+            data={
+                'NomeColuna': dados.columns,
+                'TipoAntes': dados.dtypes.astype('str'),
+                'TipoDepois': dadosCompactos.dtypes.astype('str'),
+                'BytesAntes': self.MemoriaPorColuna(),
+                'BytesDepois': compacta.MemoriaPorColuna(),
+            }, index=dados.columns)
+
+        return {
+            'dados': dadosCompactos,
+            'relatorio': relatorio,
+            'bytes_antes': self.MemoriaEmBytes,
+            'bytes_depois': compacta.MemoriaEmBytes,
+        }
+
+    @_memorizar
     def PercentualValoresNulos(self, coluna=None) -> dict:
         """
         Calcula o percentual de valores nulos no DataFrame ou em uma coluna específica.
@@ -238,17 +1030,52 @@ class AnaliseDataset:
             'texto': 'Percentual de nulos: 25.00%'
         }
         """
-        dados = self.Dados
         if coluna is None:
             qtdInformacoes = self.QuantidadeDeLinhas * self.QuantidadeDeColunas
-            camposNulos = dados.isnull().sum()
+            camposNulos = self.NulosPorColuna()
         else:
             qtdInformacoes = self.QuantidadeDeLinhas
-            camposNulos = dados[coluna].isnull().sum()
-        qtdNulos = camposNulos.sum()
+            camposNulos = self.NulosPorColuna([coluna])
+        return self._resultadoNulos(int(camposNulos.sum()), qtdInformacoes)
+
+    def NulosPorColuna(self, colunas: list=None) -> pd.Series:
+        """
+        Obtém a quantidade de valores nulos de cada coluna.
+
+        As quantidades são contadas uma única vez por coluna e mantidas enquanto a análise existir (e transferidas para 
+        uma nova análise quando a coluna não muda; veja `ReaproveitarResultados`), de modo que os percentuais de nulos 
+        e as quantidades de valores válidos são obtidos sem percorrer a coluna novamente.
+
+        Parâmetros:
+            colunas (list, opcional): Lista de colunas. Se não for fornecida, são usadas todas as colunas.
+
+        Retorna:
+            pd.Series: Quantidade de nulos (int64), indexada pelo nome da coluna.
+        """
+        if colunas is None:
+            colunas = self.Colunas
+
+        contagens = self._cache.setdefault(('NulosPorColuna',), {})
+        pendentes = [coluna for coluna in colunas if coluna not in contagens]
+        if len(pendentes) > 0:
+            contagens.update(self._contarNulos(pendentes))
+        return pd.Series([contagens[coluna] for coluna in colunas], index=pd.Index(colunas), dtype='int64')
+
+    def _contarNulos(self, colunas: list) -> dict:
+        """
+        Conta os valores nulos das colunas informadas, uma coluna de cada vez (sem criar a máscara do DataFrame inteiro).
+        """
+        return {coluna: int(self.Dados[coluna].isnull().sum()) for coluna in colunas}
+
+    def _resultadoNulos(self, qtdNulos: int, qtdInformacoes: int) -> dict:
+        """
+        Monta o dicionário retornado por `PercentualValoresNulos` a partir da quantidade de nulos e de informações.
+        """
+        # sem linhas (ex.: arquivo apenas com o cabeçalho) o percentual é indefinido
+        percentual = qtdNulos / qtdInformacoes * 100 if qtdInformacoes > 0 else np.nan
         ret = {
-            'valor': qtdNulos / qtdInformacoes * 100,
-            'texto': f'👎 Percentual de nulos: {qtdNulos / qtdInformacoes * 100:.2f}%'
+            'valor': percentual,
+            'texto': f'👎 Percentual de nulos: {percentual:.2f}%'
         }
         return ret
 
@@ -256,10 +1083,14 @@ class AnaliseDataset:
     # Análises Individuais
     # Colunas Qualitativas
     
+    @_memorizar
     def DistribuicaoDeFrequencia(self, coluna: str) -> pd.DataFrame:
         """
         Calcula a distribuição de frequência de uma coluna qualitativa.
 
+        Para colunas com muitos valores distintos, prefira `PrincipaisItens` (os itens mais frequentes e a soma dos 
+        demais) ou `PaginaDaFrequencia` (a distribuição por página).
+
         Parâmetros:
             coluna (str): Nome da coluna qualitativa para calcular a distribuição de frequência.
 
@@ -272,42 +1103,136 @@ class AnaliseDataset:
         Lança:
             Exception: Se a coluna fornecida não for identificada como qualitativa.
         """
-        if coluna not in self.ColunasQualitativas:
-            raise Exception(f'A coluna {coluna} não é identificada como Qualitativa.')
+        return self.PaginaDaFrequencia(coluna, tamanho_pagina=None)['tabela']
 
-        dfDados = self.Dados[coluna]
-        qtdItens = dfDados.shape[0]
-
-        dfItens = dfDados.value_counts(sort=True).reset_index()
-        dfItens.rename(columns={'count': 'Quantidade'}, inplace=True)
-        dfItens['Percentual'] = dfItens['Quantidade'] / qtdItens * 100.0
-        dfItens['PercentualAcum'] = dfItens['Percentual'].cumsum() 
+    @_memorizar
+    def _frequenciasOrdenadas(self, coluna: str) -> tuple:
+        """
+        Ordena as contagens dos valores distintos da coluna em ordem decrescente (empates na ordem da primeira 
+        ocorrência), a partir dos códigos fatorados.
 
-        return dfItens
-    
-    # def ConcentracaoDeItens(self, coluna: str, percentual_minimo_acum=0.7, percentual_maximo_registros=0.3) -> dict:
-    #     if coluna not in self.ColunasQualitativas:
-    #         raise Exception(f'A coluna {coluna} não é identificada como Qualitativa.')
-        
-    #     dfDados = self.Dados[coluna]
+        Retorna:
+            tuple: (categorias, contagens, ordem, contagens acumuladas na ordem, quantidade de linhas).
+        """
+        self._validarPapel(coluna, 'Qualitativa')
 
-    #     # Contar a frequência de cada valor em percentual
-    #     dfFrequencia = dfDados.value_counts(normalize=True)
+        categorias, contagens, qtdNulos = self._contagensPorCategoria(coluna)
+        ordem = np.argsort(-contagens, kind='stable')
+        return categorias, contagens, ordem, np.cumsum(contagens[ordem]), int(contagens.sum()) + qtdNulos
 
-    #     # Identificar os valores que somados correspondem a pelo menos N% do DataFrame
-    #     soma_frequencia = 0
-    #     valores_selecionados = []
+    def PaginaDaFrequencia(self, coluna: str, pagina: int=1, tamanho_pagina: int=100) -> dict:
+        """
+        Retorna uma página da distribuição de frequência de uma coluna qualitativa, montando apenas as linhas da página.
 
-    #     for valor, freq in dfFrequencia.items():
-    #         soma_frequencia += freq
-    #         valores_selecionados.append("'" + str(valor) + "'")
-    #         if soma_frequencia >= percentual_minimo_acum:
-    #             break
+        Parâmetros:
+            coluna (str): Nome da coluna qualitativa.
+            pagina (int, opcional): Número da página (iniciando em 1).
+            tamanho_pagina (int, opcional): Quantidade de itens por página. Se for None, retorna todos os itens.
 
-    #     if len(valores_selecionados) > (dfFrequencia.shape[0] * percentual_maximo_registros):
-    #         valores_selecionados = []
+        Retorna:
+            dict: Dicionário no formato de `CatalogoDeColunas`, em que 'tabela' possui as colunas de 
+                `DistribuicaoDeFrequencia`.
 
-    #     # prepara retorno
+        Lança:
+            Exception: Se a coluna fornecida não for identificada como qualitativa.
+        """
+        categorias, contagens, ordem, acumuladas, qtdItens = self._frequenciasOrdenadas(coluna)
+        resultado = _paginar(np.arange(len(ordem)), pagina, tamanho_pagina)
+        posicoes = resultado['tabela']
+        resultado['tabela'] = self._tabelaDeFrequencia(coluna, categorias[ordem[posicoes]], contagens[ordem[posicoes]], 
+                                                       acumuladas[posicoes], qtdItens)
+        return resultado
+
+    @_memorizar
+    def PrincipaisItens(self, coluna: str, max_itens: int=20) -> dict:
+        """
+        Seleciona os `max_itens` valores mais frequentes de uma coluna qualitativa por seleção parcial das contagens 
+        (sem ordenar todos os valores distintos) e soma os demais em uma linha 'Outros'.
+
+        Parâmetros:
+            coluna (str): Nome da coluna qualitativa.
+            max_itens (int, opcional): Quantidade máxima de itens exibidos individualmente.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'tabela': DataFrame no formato de `DistribuicaoDeFrequencia` com os itens mais frequentes, em ordem 
+                    decrescente, e a linha 'Outros' quando há mais itens.
+                'qtd_distintos': Quantidade exata de valores distintos (não nulos) da coluna.
+                'qtd_outros': Quantidade de valores distintos somados na linha 'Outros'.
+                'total': Quantidade de linhas da coluna (inclusive nulas), base dos percentuais.
+
+        Lança:
+            Exception: Se a coluna fornecida não for identificada como qualitativa.
+
+        Exemplo de uso:
+            >>> dados = pd.DataFrame({'Categoria': ['A', 'A', 'B', 'B', 'B', 'C', 'C', 'C', 'C']})
+            >>> principais = AnaliseDataset(dados).PrincipaisItens('Categoria', max_itens=2)
+            >>> principais['tabela']['Categoria'].to_list(), principais['qtd_distintos']
+            (['C', 'B', 'Outros'], 3)
+        """
+        self._validarPapel(coluna, 'Qualitativa')
+
+        categorias, contagens, qtdNulos = self._contagensPorCategoria(coluna)
+        qtdItens = int(contagens.sum()) + qtdNulos
+        max_itens = min(max(max_itens, 0), len(contagens))
+        if max_itens < len(contagens):
+            selecionados = np.argpartition(-contagens, max_itens - 1)[:max_itens] if max_itens > 0 else np.empty(0, dtype='int64')
+            # empates na ordem da primeira ocorrência, como em `DistribuicaoDeFrequencia`
+            selecionados = np.sort(selecionados)
+        else:
+            selecionados = np.arange(len(contagens))
+        selecionados = selecionados[np.argsort(-contagens[selecionados], kind='stable')]
+
+        valores = categorias[selecionados]
+        quantidades = contagens[selecionados]
+        qtdOutros = len(contagens) - len(selecionados)
+        if qtdOutros > 0:
+            valores = valores.astype('object').append(pd.Index(['Outros'], dtype='object'))
+            quantidades = np.append(quantidades, int(contagens.sum() - quantidades.sum()))
+        return {
+            'tabela': self._tabelaDeFrequencia(coluna, valores, quantidades, np.cumsum(quantidades), qtdItens),
+            'qtd_distintos': len(contagens),
+            'qtd_outros': qtdOutros,
+            'total': qtdItens,
+        }
+
+    def _tabelaDeFrequencia(self, coluna: str, valores: pd.Index, quantidades: np.ndarray, acumuladas: np.ndarray, 
+                            qtdItens: int) -> pd.DataFrame:
+        """
+        Monta a tabela retornada por `DistribuicaoDeFrequencia` a partir dos valores, das suas contagens e das 
+        contagens acumuladas.
+        """
+        base = max(qtdItens, 1)
+        return pd.DataFrame({
+            coluna: valores,
+            'Quantidade': np.asarray(quantidades, dtype='int64'),
+            'Percentual': np.asarray(quantidades, dtype='float64') / base * 100.0,
+            'PercentualAcum': np.asarray(acumuladas, dtype='float64') / base * 100.0,
+        })
+    
+    # def ConcentracaoDeItens(self, coluna: str, percentual_minimo_acum=0.7, percentual_maximo_registros=0.3) -> dict:
+    #     if coluna not in self.ColunasQualitativas:
+    #         raise Exception(f'A coluna {coluna} não é identificada como Qualitativa.')
+        
+    #     dfDados = self.Dados[coluna]
+
+    #     # Contar a frequência de cada valor em percentual
+    #     dfFrequencia = dfDados.value_counts(normalize=True)
+
+    #     # Identificar os valores que somados correspondem a pelo menos N% do DataFrame
+    #     soma_frequencia = 0
+    #     valores_selecionados = []
+
+    #     for valor, freq in dfFrequencia.items():
+    #         soma_frequencia += freq
+    #         valores_selecionados.append("'" + str(valor) + "'")
+    #         if soma_frequencia >= percentual_minimo_acum:
+    #             break
+
+    #     if len(valores_selecionados) > (dfFrequencia.shape[0] * percentual_maximo_registros):
+    #         valores_selecionados = []
+
+    #     # prepara retorno
     #     if len(valores_selecionados) == 0:
     #         return {
     #             'valor': 0,
@@ -324,6 +1249,7 @@ class AnaliseDataset:
     #             'texto': f"Os itens {', '.join(valores_selecionados)} são responsáveis por {soma_frequencia*100:.2f}% dos dados."
     #         }
         
+    @_memorizar
     def ConcentracaoDeItens(self, coluna: str) -> dict:
         """
         Calcula a concentração de itens em uma coluna qualitativa.
@@ -352,48 +1278,111 @@ class AnaliseDataset:
             'lista: ['C']
         }
         """
-        if coluna not in self.ColunasQualitativas:
-            raise Exception(f'A coluna {coluna} não é identificada como Qualitativa.')
+        self._validarPapel(coluna, 'Qualitativa')
 
-        dfDados = pd.DataFrame(self.Dados[coluna])
+        categorias, contagens, qtdNulos = self._contagensPorCategoria(coluna)
+        return self._concentracaoDeContagens(categorias, contagens, qtdNulos)
+
+    def ConcentracaoDeItensPorColuna(self, colunas: list=None) -> pd.DataFrame:
+        """
+        Calcula a concentração de itens de várias colunas qualitativas de uma só vez.
+
+        Parâmetros:
+            colunas (list, opcional): Lista de colunas qualitativas. Se não for fornecida, são usadas todas as colunas qualitativas.
+
+        Retorna:
+            pd.DataFrame: DataFrame com uma linha por coluna (índice = nome da coluna) e as colunas 'NomeColuna', 
+                'valor', 'texto' e 'lista', com os mesmos conteúdos retornados por `ConcentracaoDeItens`.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como qualitativa.
+        """
+        if colunas is None:
+            colunas = self.ColunasQualitativas
+
+        linhas = []
+        for coluna in colunas:
+            concentracao = self.ConcentracaoDeItens(coluna)
+            linhas.append([coluna, concentracao['valor'], concentracao['texto'], concentracao['lista']])
+        return pd.DataFrame(data=linhas, columns=['NomeColuna', 'valor', 'texto', 'lista'], index=pd.Index(colunas))
+
+    @_memorizar
+    def CodigosFatorados(self, coluna: str) -> tuple:
+        """
+        Fatora uma coluna, substituindo cada valor por um código inteiro (em uma única passagem de hash).
+
+        Parâmetros:
+            coluna (str): Nome da coluna.
+
+        Retorna:
+            tuple: (códigos, categorias), em que `códigos` é um np.ndarray com o código de cada linha (-1 para valores 
+            nulos) e `categorias` é um pd.Index com os valores distintos, na ordem da primeira ocorrência.
+        """
+        codigos, categorias = pd.factorize(self.Dados[coluna], use_na_sentinel=True)
+        return codigos, pd.Index(categorias)
+
+    def _contagensPorCategoria(self, coluna: str) -> tuple:
+        """
+        Conta as ocorrências de cada valor distinto da coluna a partir dos códigos fatorados.
+
+        Retorna:
+            tuple: (categorias, contagens, quantidade de nulos), com `contagens` alinhado a `categorias`.
+        """
+        codigos, categorias = self.CodigosFatorados(coluna)
+        contagens = np.bincount(codigos[codigos >= 0], minlength=len(categorias))
+        return categorias, contagens, int(len(codigos) - contagens.sum())
+
+    def _concentracaoDeContagens(self, categorias: pd.Index, contagens: np.ndarray, qtdNulos: int) -> dict:
+        """
+        Avalia a concentração de itens a partir das contagens de cada valor distinto (veja `ConcentracaoDeItens`).
+
+        Os itens concentrados são aqueles cuja proporção está fora dos limites de outliers (1,5 x DIQ) calculados 
+        sobre as proporções de todos os itens, ou o item principal quando há apenas dois itens e ele responde por 
+        pelo menos 70% dos valores não nulos.
+        """
+        # colunas sem valores preenchidos não possuem concentração
+        if contagens.sum() == 0:
+            return {
+                'valor': 0,
+                'texto': '📊 Não há concentração de itens nesta coluna.',
+                'lista': []
+            }
 
         # identifica se a coluna possui apenas um valor exclusivo
-        if dfDados[coluna].nunique() == 1:
+        if len(categorias) == 1:
             return {
                 'valor': 1,
-                'texto': f"💯 O item {dfDados[coluna][0]} é responsável por 100% dos dados.",
-                'lista': [dfDados[coluna][0]]
+                'texto': f"💯 O item {categorias[0]} é responsável por 100% dos dados.",
+                'lista': [categorias[0]]
             }
-        
-        # identifica se a coluna só possui valores exclusivos
-        if len(dfDados[coluna].unique()) == dfDados[coluna].shape[0]:
+
+        # identifica se a coluna só possui valores exclusivos (os nulos contam como um único valor)
+        if len(categorias) + min(qtdNulos, 1) == contagens.sum() + qtdNulos:
             return {
                 'valor': 1,
                 'texto': f"🔑 A coluna é composta apenas de valores exclusivos.",
                 'lista': []
             }
 
-        # Contar a frequência de cada valor em percentual
-        dfFrequencia = dfDados.value_counts(normalize=True).reset_index()
+        # frequência de cada valor em proporção dos valores não nulos, em ordem decrescente
+        ordem = np.argsort(-contagens, kind='stable')
+        proporcoes = contagens[ordem] / contagens.sum()
         valores_selecionados = []
         soma_frequencia = 0
 
-        if dfFrequencia.shape[0] == 2 and dfFrequencia['proportion'][0] >= 0.7:
+        if len(proporcoes) == 2 and proporcoes[0] >= 0.7:
             # quando há poucos itens, não é possível considerar a média para identificar outliers
-            valores_selecionados.append(str(dfFrequencia[coluna][0]))
-            soma_frequencia = dfFrequencia['proportion'][0]
+            selecionados = ordem[:1]
         else:
             # identificar outliers a partir da frequência
-            dsFreq = AnaliseDataset(dfFrequencia)
-            outliers = dsFreq.Outliers(coluna='proportion')
-            # print(outliers)
-
-            # busca os itens com concentração
-            dfDadosConcentracao = dfFrequencia[dfFrequencia['proportion'].isin(outliers['lista'])]
-            for idx, row in dfDadosConcentracao.iterrows():
-                soma_frequencia += row['proportion']
-                valores_selecionados.append(str(row[coluna]))
-        
+            q1, q3 = np.quantile(proporcoes, [0.25, 0.75])
+            diq = q3 - q1
+            selecionados = ordem[(proporcoes < q1 - 1.5 * diq) | (proporcoes > q3 + 1.5 * diq)]
+
+        if len(selecionados) > 0:
+            soma_frequencia = contagens[selecionados].sum() / contagens.sum()
+            valores_selecionados = [str(valor) for valor in categorias[selecionados]]
+
         #valores_selecionados = [valor.replace('.0', '') if valor.endswith('.0''') else valor for valor in valores_selecionados]
         valores_selecionados = [valor.replace('.0', '') for valor in valores_selecionados]
 
@@ -422,68 +1411,424 @@ class AnaliseDataset:
     # Análises Individuais
     # Colunas Quantitativas
 
-    def Outliers(self, coluna: str, qtd_desvios:float=1.5) -> dict:
+    def _matrizQuantitativa(self, colunas: list) -> np.ndarray:
         """
-        Identifica os outliers em uma coluna quantitativa.
+        Converte um bloco de colunas em uma matriz float64, com os valores nulos representados como NaN.
 
         Parâmetros:
-            coluna (str): Nome da coluna quantitativa para identificar os outliers.
-            qtd_desvios (float): Quantidade de desvios-padrão para identificar os outliers acima ou abaixo.
+            colunas (list): Lista com os nomes das colunas que compõem o bloco.
+
+        Retorna:
+            np.ndarray: Matriz com uma linha por registro e uma coluna para cada item de `colunas`.
+        """
+        return self.Dados[colunas].to_numpy(dtype='float64', na_value=np.nan)
+
+    def _colunasPorMatriz(self, tamanho_bloco: int=None) -> int:
+        """
+        Obtém a quantidade de colunas convertidas para a matriz numérica de cada vez: `tamanho_bloco`, se for 
+        fornecido, ou quantas colunas couberem em `LIMITE_BYTES_MATRIZ` (ao menos uma).
+        """
+        if tamanho_bloco is not None:
+            return tamanho_bloco
+        return max(1, LIMITE_BYTES_MATRIZ // max(1, self.QuantidadeDeLinhas * 8))
+
+    def _partesDasColunas(self, colunas: list):
+        """
+        Percorre os valores de colunas quantitativas em partes (matrizes float64 com uma coluna para cada item de 
+        `colunas`), com os valores nulos representados como NaN. Na análise em memória, há uma única parte.
+        """
+        yield self._matrizQuantitativa(colunas)
+
+    def _partesDaColuna(self, coluna: str):
+        """
+        Percorre os valores de uma coluna quantitativa em partes float64 (veja `_partesDasColunas`).
+        """
+        for matriz in self._partesDasColunas([coluna]):
+            yield matriz[:, 0]
+
+    def EsbocosDeQuantis(self, colunas: list=None, k: int=200) -> dict:
+        """
+        Obtém os esboços de quantis (KLL) das colunas quantitativas.
+
+        Os esboços são construídos uma única vez por coluna e mantidos enquanto a análise existir, de modo que 
+        quartis, mediana, limites e quantidades de outliers podem ser respondidos novamente sem percorrer a coluna.
+
+        Parâmetros:
+            colunas (list, opcional): Lista de colunas. Se não for fornecida, são usadas todas as colunas quantitativas.
+            k (int, opcional): Parâmetro de precisão dos esboços (veja `EsbocoDeQuantis`).
+
+        Retorna:
+            dict: Dicionário {nome da coluna: EsbocoDeQuantis}.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como quantitativa.
+        """
+        if colunas is None:
+            colunas = self.ColunasQuantitativas
+        for coluna in colunas:
+            self._validarPapel(coluna, 'Quantitativa')
+
+        esbocos = self._cache.setdefault(('EsbocosDeQuantis', k), {})
+        pendentes = [coluna for coluna in colunas if coluna not in esbocos]
+        if len(pendentes) > 0:
+            esbocos.update(self._construirEsbocos(pendentes, k))
+        return {coluna: esbocos[coluna] for coluna in colunas}
+
+    def _construirEsbocos(self, colunas: list, k: int, tamanho_bloco: int=None) -> dict:
+        """
+        Constrói os esboços de quantis das colunas informadas, convertendo `tamanho_bloco` colunas de cada vez (veja 
+        `_colunasPorMatriz`).
+        """
+        tamanho_bloco = self._colunasPorMatriz(tamanho_bloco)
+        esbocos = {}
+        for inicio in range(0, len(colunas), tamanho_bloco):
+            bloco = colunas[inicio:inicio + tamanho_bloco]
+            matriz = self._matrizQuantitativa(bloco)
+            for posicao, coluna in enumerate(bloco):
+                esbocos[coluna] = EsbocoDeQuantis(k)
+                esbocos[coluna].Atualizar(matriz[:, posicao])
+        return esbocos
+
+    def PerfilQuantitativo(self, colunas: list=None, tamanho_bloco: int=None, aproximado: bool=False, k: int=200) -> pd.DataFrame:
+        """
+        Calcula, em uma única passagem vetorizada, o perfil estatístico das colunas quantitativas.
+
+        As colunas são processadas em blocos de `tamanho_bloco` colunas; por padrão, o bloco tem quantas colunas 
+        couberem em `LIMITE_BYTES_MATRIZ` (o cálculo dos quartis usa uma cópia da matriz, então o pico é de cerca do 
+        dobro). Para cada bloco, os quartis e a mediana são obtidos em uma única seleção por coluna e os limites de 
+        outliers (1,5 x DIQ) são aplicados sobre a mesma matriz, evitando que a coluna seja percorrida novamente para 
+        cada métrica.
+
+        O perfil de cada coluna é calculado uma única vez e mantido enquanto a análise existir (como `NulosPorColuna`), 
+        de modo que o perfil de uma coluna já calculado junto com as demais (ex.: nos insights) é reaproveitado pelas 
+        estatísticas, pelo histograma e pelo boxplot dessa coluna.
+
+        No modo aproximado, os quartis, a mediana e as quantidades de outliers são estimados a partir dos esboços de 
+        quantis (`EsbocosDeQuantis`), sem ordenar as colunas. A quantidade, o menor e o maior valor, a média e o 
+        desvio-padrão continuam exatos, e a coluna 'ErroDePosto' informa o erro máximo do posto dos quartis (fração 
+        dos valores); as quantidades de outliers podem diferir das exatas em até ErroDePosto x Quantidade.
+
+        Parâmetros:
+            colunas (list, opcional): Lista de colunas a considerar. Se não for fornecida, são usadas todas as colunas quantitativas.
+            tamanho_bloco (int, opcional): Quantidade de colunas convertidas para a matriz numérica de cada vez. Se 
+                não for fornecida, é obtida de `LIMITE_BYTES_MATRIZ`.
+            aproximado (bool, opcional): Se verdadeiro, usa os esboços de quantis.
+            k (int, opcional): Parâmetro de precisão dos esboços, usado no modo aproximado.
+
+        Retorna:
+            pd.DataFrame: DataFrame com uma linha por coluna (índice = nome da coluna) e as colunas:
+                'NomeColuna', 'Quantidade' (valores não nulos), 'Menor', 'Maior', 'Média', 'Mediana', 'Desvio-Padrão', 
+                '25%', '75%', 'DIQ', 'LimiteInferior', 'LimiteSuperior', 'QtdOutliers', 'QtdOutliersAbaixo', 
+                'QtdOutliersAcima' e 'PctOutliers' (e 'ErroDePosto' no modo aproximado).
+
+        Exemplo de uso:
+            >>> import pandas as pd
+            >>> dados = pd.DataFrame({'Valores': [10, 12, 14, 15, 18, 20, 22, 100]})
+            >>> analise = AnaliseDataset(dados)
+            >>> perfil = analise.PerfilQuantitativo()
+            >>> print(perfil.loc['Valores', ['Mediana', 'DIQ', 'QtdOutliers']].to_dict())
+            {'Mediana': 16.5, 'DIQ': 7.0, 'QtdOutliers': 1}
+        """
+        if colunas is None:
+            colunas = self.ColunasQuantitativas
+
+        perfis = self._cache.setdefault(('PerfilQuantitativo', aproximado, k if aproximado else None), {})
+        pendentes = [coluna for coluna in colunas if coluna not in perfis]
+        if len(pendentes) > 0 or len(colunas) == 0:
+            perfil = self._perfilAproximado(pendentes, k) if aproximado else self._perfilExato(pendentes, tamanho_bloco)
+            if len(colunas) == 0:
+                return perfil
+            perfis.update(perfil.to_dict('index'))
+        return pd.DataFrame.from_dict({coluna: perfis[coluna] for coluna in colunas}, orient='index')
+
+    def _perfilExato(self, colunas: list, tamanho_bloco: int=None) -> pd.DataFrame:
+        """
+        Calcula o perfil estatístico exato das colunas, bloco a bloco (veja `PerfilQuantitativo`).
+        """
+        tamanho_bloco = self._colunasPorMatriz(tamanho_bloco)
+        metricas = {
+            'Quantidade': [], 'Menor': [], 'Maior': [], 'Média': [], 'Mediana': [], 'Desvio-Padrão': [], 
+            '25%': [], '75%': [], 'QtdOutliersAbaixo': [], 'QtdOutliersAcima': [],
+        }
+        for inicio in range(0, len(colunas), tamanho_bloco):
+            bloco = colunas[inicio:inicio + tamanho_bloco]
+            matriz = self._matrizQuantitativa(bloco)
+            quantidade = self._quantidadeDeValidos(bloco, matriz)
+
+            with warnings.catch_warnings():
+                # colunas vazias ou totalmente nulas resultam em NaN
+                warnings.simplefilter('ignore', category=RuntimeWarning)
+                if matriz.shape[0] > 0:
+                    q1, mediana, q3 = np.nanquantile(matriz, [0.25, 0.5, 0.75], axis=0)
+                else:
+                    q1 = mediana = q3 = np.full(matriz.shape[1], np.nan)
+                diq = q3 - q1
+                metricas['Menor'].append(np.nanmin(matriz, axis=0, initial=np.inf))
+                metricas['Maior'].append(np.nanmax(matriz, axis=0, initial=-np.inf))
+                metricas['Média'].append(np.nanmean(matriz, axis=0))
+                metricas['Desvio-Padrão'].append(np.nanstd(matriz, axis=0, ddof=1))
+
+            metricas['Quantidade'].append(quantidade)
+            metricas['Mediana'].append(mediana)
+            metricas['25%'].append(q1)
+            metricas['75%'].append(q3)
+            metricas['QtdOutliersAbaixo'].append(np.count_nonzero(matriz < q1 - 1.5 * diq, axis=0))
+            metricas['QtdOutliersAcima'].append(np.count_nonzero(matriz > q3 + 1.5 * diq, axis=0))
+
+        perfil = pd.DataFrame(
+            data={nome: np.concatenate(valores) if len(valores) > 0 else [] for nome, valores in metricas.items()},
+            index=pd.Index(colunas))
+        return self._completarPerfil(perfil)
+
+    def _quantidadeDeValidos(self, colunas: list, matriz: np.ndarray) -> np.ndarray:
+        """
+        Obtém a quantidade de valores não nulos das colunas a partir das quantidades de nulos já contadas; as colunas 
+        ainda não contadas são contadas na matriz numérica e registradas para `NulosPorColuna`.
+        """
+        contagens = self._cache.setdefault(('NulosPorColuna',), {})
+        for posicao, coluna in enumerate(colunas):
+            if coluna not in contagens:
+                contagens[coluna] = int(matriz.shape[0] - np.count_nonzero(~np.isnan(matriz[:, posicao])))
+        return np.array([matriz.shape[0] - contagens[coluna] for coluna in colunas], dtype='int64')
+
+    def _perfilAproximado(self, colunas: list, k: int) -> pd.DataFrame:
+        """
+        Monta o perfil estatístico das colunas a partir dos esboços de quantis (veja `PerfilQuantitativo`).
+        """
+        linhas = []
+        for esboco in self.EsbocosDeQuantis(colunas, k).values():
+            q1, mediana, q3 = esboco.Quantil([0.25, 0.5, 0.75])
+            diq = q3 - q1
+            abaixo, acima = esboco.ContarForaDosLimites(q1 - 1.5 * diq, q3 + 1.5 * diq)
+            linhas.append([esboco.Quantidade, esboco.Menor, esboco.Maior, esboco.Media, mediana, esboco.DesvioPadrao,
+                           q1, q3, abaixo, acima])
+
+        perfil = pd.DataFrame(
+            data=linhas,
+            columns=['Quantidade', 'Menor', 'Maior', 'Média', 'Mediana', 'Desvio-Padrão', '25%', '75%', 'QtdOutliersAbaixo', 'QtdOutliersAcima'],
+            index=pd.Index(colunas))
+        perfil = self._completarPerfil(perfil)
+        perfil['ErroDePosto'] = EsbocoDeQuantis(k).ErroDePosto
+        return perfil
+
+    def _completarPerfil(self, perfil: pd.DataFrame) -> pd.DataFrame:
+        """
+        Acrescenta ao perfil o nome da coluna, o DIQ, os limites de outliers e as quantidades totais de outliers.
+        """
+        perfil.insert(0, 'NomeColuna', perfil.index)
+
+        # colunas sem valores válidos não possuem menor/maior valor
+        semValores = perfil['Quantidade'] == 0
+        perfil.loc[semValores, ['Menor', 'Maior']] = np.nan
+
+        perfil['DIQ'] = perfil['75%'] - perfil['25%']
+        perfil['LimiteInferior'] = perfil['25%'] - 1.5 * perfil['DIQ']
+        perfil['LimiteSuperior'] = perfil['75%'] + 1.5 * perfil['DIQ']
+        perfil['QtdOutliers'] = perfil['QtdOutliersAbaixo'] + perfil['QtdOutliersAcima']
+        perfil['PctOutliers'] = perfil['QtdOutliers'] / perfil['Quantidade'].where(~semValores) * 100.0
+
+        return perfil
+
+    @_memorizar
+    def DeteccaoDeOutliers(self, colunas: list=None, metodo: str='DIQ', multiplicador: float=None, aproximado: bool=False, 
+                           incluir_mascaras: bool=False, tamanho_bloco: int=None) -> dict:
+        """
+        Identifica os outliers de várias colunas quantitativas de uma vez, aplicando a regra escolhida coluna a coluna 
+        sobre a matriz numérica de cada bloco de `tamanho_bloco` colunas (por padrão, quantas couberem em 
+        `LIMITE_BYTES_MATRIZ`).
+
+        Regras disponíveis (`METODOS_OUTLIERS`), com o multiplicador m:
+            - 'DIQ': valores fora de [Q1 - m x DIQ, Q3 + m x DIQ] (m padrão 1,5).
+            - 'Escore-Z': valores fora de [média - m x desvio-padrão, média + m x desvio-padrão] (m padrão 3).
+            - 'MAD': valores fora de [mediana - m x 1,4826 x MAD, mediana + m x 1,4826 x MAD], em que MAD é a mediana 
+              dos desvios absolutos em relação à mediana (m padrão 3,5, o escore-z modificado de Iglewicz e Hoaglin). 
+              Quando o MAD é zero, é usado 1,2533 x o desvio absoluto médio.
+
+        Os quartis, a média e o desvio-padrão vêm de `PerfilQuantitativo`; com a regra 'DIQ', o multiplicador padrão 
+        e sem máscaras, as quantidades do próprio perfil são reaproveitadas, sem percorrer as colunas novamente.
+
+        Parâmetros:
+            colunas (list, opcional): Lista de colunas. Se não for fornecida, são usadas todas as colunas quantitativas.
+            metodo (str, opcional): 'DIQ', 'Escore-Z' ou 'MAD'.
+            multiplicador (float, opcional): Multiplicador da regra. Se não for fornecido, usa o padrão da regra.
+            aproximado (bool, opcional): Se verdadeiro, os quartis da regra 'DIQ' vêm dos esboços de quantis.
+            incluir_mascaras (bool, opcional): Se verdadeiro, inclui as máscaras booleanas dos outliers de cada coluna.
+            tamanho_bloco (int, opcional): Quantidade de colunas convertidas para a matriz numérica de cada vez. Se 
+                não for fornecida, é obtida de `LIMITE_BYTES_MATRIZ`.
 
         Retorna:
             dict: Dicionário contendo:
+                'resumo': DataFrame com uma linha por coluna (índice = nome da coluna) e as colunas 'NomeColuna', 
+                    'Metodo', 'Multiplicador', 'LimiteInferior', 'LimiteSuperior', 'QtdOutliersAbaixo', 
+                    'QtdOutliersAcima', 'QtdOutliers' e 'PctOutliers' (percentual dos valores não nulos).
+                'mascaras_abaixo', 'mascaras_acima': Dicionários {nome da coluna: np.ndarray booleano com uma posição 
+                    por linha}, ou None se `incluir_mascaras` for falso.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como quantitativa ou se o método não for 
+                reconhecido.
+
+        Exemplo de uso:
+            >>> dados = pd.DataFrame({'Valores': [10, 12, 14, 15, 18, 20, 22, 100]})
+            >>> analise = AnaliseDataset(dados)
+            >>> analise.DeteccaoDeOutliers(metodo='MAD')['resumo'].loc['Valores', ['QtdOutliersAbaixo', 'QtdOutliersAcima']].to_list()
+            [0, 1]
+        """
+        if colunas is None:
+            colunas = self.ColunasQuantitativas
+        if metodo not in METODOS_OUTLIERS:
+            raise Exception(f'O método de outliers {metodo} não é suportado.')
+        for coluna in colunas:
+            self._validarPapel(coluna, 'Quantitativa')
+        if multiplicador is None:
+            multiplicador = METODOS_OUTLIERS[metodo]
+
+        perfil = self.PerfilQuantitativo(colunas, aproximado=aproximado)
+        if metodo == 'DIQ':
+            limiteInferior = (perfil['25%'] - multiplicador * perfil['DIQ']).to_numpy(dtype='float64')
+            limiteSuperior = (perfil['75%'] + multiplicador * perfil['DIQ']).to_numpy(dtype='float64')
+        elif metodo == 'Escore-Z':
+            limiteInferior = (perfil['Média'] - multiplicador * perfil['Desvio-Padrão']).to_numpy(dtype='float64')
+            limiteSuperior = (perfil['Média'] + multiplicador * perfil['Desvio-Padrão']).to_numpy(dtype='float64')
+        else:
+            # os limites da regra MAD são calculados junto com as quantidades, na matriz de cada bloco
+            limiteInferior = np.full(len(colunas), np.nan)
+            limiteSuperior = np.full(len(colunas), np.nan)
+
+        mascarasAbaixo = {} if incluir_mascaras else None
+        mascarasAcima = {} if incluir_mascaras else None
+        if metodo == 'DIQ' and multiplicador == 1.5 and not incluir_mascaras:
+            abaixo = perfil['QtdOutliersAbaixo'].to_numpy(dtype='int64')
+            acima = perfil['QtdOutliersAcima'].to_numpy(dtype='int64')
+        else:
+            abaixo = np.zeros(len(colunas), dtype='int64')
+            acima = np.zeros(len(colunas), dtype='int64')
+            tamanho_bloco = self._colunasPorMatriz(tamanho_bloco)
+            for inicio in range(0, len(colunas), tamanho_bloco):
+                fim = inicio + tamanho_bloco
+                matriz = self._matrizQuantitativa(colunas[inicio:fim])
+                if metodo == 'MAD':
+                    limiteInferior[inicio:fim], limiteSuperior[inicio:fim] = self._limitesMAD(matriz, multiplicador)
+                mascaraAbaixo = matriz < limiteInferior[inicio:fim]
+                mascaraAcima = matriz > limiteSuperior[inicio:fim]
+                abaixo[inicio:fim] = np.count_nonzero(mascaraAbaixo, axis=0)
+                acima[inicio:fim] = np.count_nonzero(mascaraAcima, axis=0)
+                if incluir_mascaras:
+                    for posicao, coluna in enumerate(colunas[inicio:fim]):
+                        mascarasAbaixo[coluna] = mascaraAbaixo[:, posicao]
+                        mascarasAcima[coluna] = mascaraAcima[:, posicao]
+
+        quantidade = perfil['Quantidade'].to_numpy(dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentual = np.where(quantidade > 0, (abaixo + acima) / quantidade * 100.0, np.nan)
+        resumo = pd.DataFrame({
+            'NomeColuna': colunas,
+            'Metodo': metodo,
+            'Multiplicador': float(multiplicador),
+            'LimiteInferior': limiteInferior,
+            'LimiteSuperior': limiteSuperior,
+            'QtdOutliersAbaixo': abaixo,
+            'QtdOutliersAcima': acima,
+            'QtdOutliers': abaixo + acima,
+            'PctOutliers': percentual,
+        }, index=pd.Index(colunas))
+        return {
+            'resumo': resumo,
+            'mascaras_abaixo': mascarasAbaixo,
+            'mascaras_acima': mascarasAcima,
+        }
+
+    def _limitesMAD(self, matriz: np.ndarray, multiplicador: float) -> tuple:
+        """
+        Calcula, coluna a coluna, os limites da regra MAD (veja `DeteccaoDeOutliers`).
+        """
+        with warnings.catch_warnings():
+            # colunas vazias ou totalmente nulas resultam em NaN
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            mediana = np.nanmedian(matriz, axis=0) if matriz.shape[0] > 0 else np.full(matriz.shape[1], np.nan)
+            desvios = np.abs(matriz - mediana)
+            escala = 1.4826 * (np.nanmedian(desvios, axis=0) if matriz.shape[0] > 0 else np.full(matriz.shape[1], np.nan))
+            escala = np.where(escala == 0, 1.2533 * np.nanmean(desvios, axis=0), escala)
+        return mediana - multiplicador * escala, mediana + multiplicador * escala
+
+    @_memorizar
+    def Outliers(self, coluna: str, qtd_desvios:float=1.5, aproximado: bool=False) -> ResultadoOutliers:
+        """
+        Identifica os outliers em uma coluna quantitativa pela regra do DIQ (veja `DeteccaoDeOutliers`).
+
+        Parâmetros:
+            coluna (str): Nome da coluna quantitativa para identificar os outliers.
+            qtd_desvios (float): Multiplicador do DIQ usado nos limites (Q1 - qtd_desvios x DIQ e Q3 + qtd_desvios x DIQ).
+            aproximado (bool, opcional): Se verdadeiro, os limites são obtidos do esboço de quantis da coluna, sem ordená-la.
+
+        Retorna:
+            ResultadoOutliers: Limites, quantidades e valores dos outliers, com acesso por página ou aos N mais 
+                extremos. Também pode ser lido como um dicionário contendo:
                 'valor': Número de outliers identificados.
                 'texto': String formatada com a quantidade de outliers.
                 'lista': Lista de valores que são considerados outliers.
+                'valor_acima', 'lista_acima': Quantidade e lista dos outliers acima do limite superior.
+                'valor_abaixo', 'lista_abaixo': Quantidade e lista dos outliers abaixo do limite inferior.
 
         Exemplo de uso:
         >>> import pandas as pd
         >>> dados = pd.DataFrame({'Valores': [10, 12, 14, 15, 18, 20, 22, 100]})
         >>> analise = AnaliseDataset(dados)
         >>> outliers = analise.Outliers('Valores')
-        >>> print(outliers)
+        >>> print(dict(outliers))
         {
             'valor': 1,
             'texto': 'Outliers: 1',
             'lista': [100],
+            'valor_acima': 1,
+            'lista_acima': [100],
+            'valor_abaixo': 0,
+            'lista_abaixo': [],
         }
+        >>> outliers.Maiores(5)
+        7    100
+        Name: Valores, dtype: int64
         """
 
-        # Calcular o primeiro quartil (Q1) e o terceiro quartil (Q3)
-        Q1 = self.Dados[coluna].quantile(0.25)
-        Q3 = self.Dados[coluna].quantile(0.75)
-        
-        # Calcular o intervalo interquartil (IQR)
-        IQR = Q3 - Q1
-        
-        # Definir os limites inferiores e superiores para outliers
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        # identifica outliers
-        outliers = self.Dados[ (self.Dados[coluna] < lower_bound) | (self.Dados[coluna] > upper_bound) ][coluna].sort_values().to_list()
-        outliers_acima  = [v for v in outliers if v > lower_bound]
-        outliers_abaixo = [v for v in outliers if v < upper_bound]
+        resumo = self.DeteccaoDeOutliers([coluna], 'DIQ', qtd_desvios, aproximado)['resumo'].loc[coluna]
+        return self._listarOutliers(coluna, resumo['LimiteInferior'], resumo['LimiteSuperior'])
 
-        return {
-            'valor': len(outliers),
-            'texto': f'〽️ Outliers: {len(outliers)}',
-            # 'valor_referencia': valor_referencia,
-            'lista': outliers,
-            'valor_acima': len(outliers_acima),
-            'lista_acima': outliers_acima,
-            'valor_abaixo': len(outliers_abaixo),
-            'lista_abaixo': outliers_abaixo,
-        }
+    def _listarOutliers(self, coluna: str, lower_bound: float, upper_bound: float) -> ResultadoOutliers:
+        """
+        Identifica os valores de uma coluna que estão fora dos limites informados.
 
+        Parâmetros:
+            coluna (str): Nome da coluna quantitativa.
+            lower_bound (float): Limite inferior.
+            upper_bound (float): Limite superior.
+
+        Retorna:
+            ResultadoOutliers: Resultado no formato retornado por `Outliers`.
+        """
+        return ResultadoOutliers(self._valoresForaDosLimites(coluna, lower_bound, upper_bound), lower_bound, upper_bound)
+
+    def _valoresForaDosLimites(self, coluna: str, lower_bound: float, upper_bound: float) -> pd.Series:
+        """
+        Retorna os valores da coluna menores que `lower_bound` ou maiores que `upper_bound`, indexados pela posição 
+        da linha.
+        """
+        serie = self.Dados[coluna]
+        fora = ((serie < lower_bound) | (serie > upper_bound)).to_numpy(dtype=bool, na_value=False)
+        posicoes = np.flatnonzero(fora)
+        return pd.Series(serie.iloc[posicoes].array, index=posicoes, name=coluna)
+
+    @_memorizar
     def EstatisticaDescritiva(self, coluna: str, 
-                              metricas: list=['Menor', 'Maior', 'Média', 'Mediana', 'Desvio-Padrão', 'Maior', '25%', '75%', 'DIQ', 'QtdOutliers', 'PctOutliers', 'Outliers']):
+                              metricas: list=['Menor', 'Maior', 'Média', 'Mediana', 'Desvio-Padrão', 'Maior', '25%', '75%', 'DIQ', 'QtdOutliers', 'PctOutliers', 'Outliers'],
+                              aproximado: bool=False):
         """
         Calcula as estatísticas descritivas de uma coluna quantitativa.
 
         Parâmetros:
             coluna (str): Nome da coluna quantitativa para calcular as estatísticas descritivas.
             metricas (list, opcional): Lista de métricas a serem calculadas. As métricas padrão são ['Menor', 'Maior', 'Média', 'Mediana', 'Desvio-Padrão', 'Maior', '25%', '75%', 'DIQ', 'QtdOutliers', 'PctOutliers', 'Outliers'].
+            aproximado (bool, opcional): Se verdadeiro, a mediana, os quartis e os outliers são obtidos do esboço de 
+                quantis da coluna (veja `PerfilQuantitativo`) e o dicionário inclui a métrica 'ErroDePosto'.
 
         Retorna:
             dict: Dicionário contendo as métricas calculadas.
@@ -509,109 +1854,911 @@ class AnaliseDataset:
                     'DIQ': 8.0,
                     'QtdOutliers': 1,
                     'PctOutliers': 12.5,
-                    'Outliers': [100]
+                    'Outliers': ResultadoOutliers(valor=1, valor_acima=1, valor_abaixo=0, limites=(1.5, 33.5))
                 }
             }
         """
         
-        if coluna not in self.ColunasQuantitativas:
-            raise Exception(f'A coluna {coluna} não é identificada como Quantitativa.')
+        self._validarPapel(coluna, 'Quantitativa')
         
+        perfil = self.PerfilQuantitativo([coluna], aproximado=aproximado).loc[coluna]
+
         informacao = {}
-        if 'Menor' in metricas:
-            informacao['Menor'] = self.Dados[coluna].min()
-        if 'Média' in metricas:
-            informacao['Média'] = self.Dados[coluna].mean()
-        if 'Mediana' in metricas:
-            informacao['Mediana'] = self.Dados[coluna].median()
-        if 'Desvio-Padrão' in metricas:
-            informacao['Desvio-Padrão'] = self.Dados[coluna].std()
-        if 'Maior' in metricas:
-            informacao['Maior'] = self.Dados[coluna].max()
-        if '25%' in metricas:
-            # informacao['0%'] = self.Dados[coluna].quantile(0)
-            informacao['25%'] = self.Dados[coluna].quantile(0.25)
-        if '75%' in metricas:
-            informacao['75%'] = self.Dados[coluna].quantile(0.75)
-            # informacao['100%'] = self.Dados[coluna].quantile(1)
-        if 'DIQ' in metricas:
-            informacao['DIQ'] = self.Dados[coluna].quantile(0.75) - self.Dados[coluna].quantile(0.25)
-        if 'QtdOutliers' in metricas or 'PctOutliers' in metricas or 'Outliers' in metricas:
-            # # identifica outliers
-            outliers = self.Outliers(coluna)
-
-            # adiciona informações
-            if 'QtdOutliers' in metricas:
-                informacao['QtdOutliers'] = outliers['valor'] 
-            if 'PctOutliers' in metricas:
-                informacao['PctOutliers'] = outliers['valor'] / self.Dados[coluna].count() * 100.0
-            if 'Outliers' in metricas:
-                informacao['Outliers'] = outliers['lista'] 
+        for metrica in ['Menor', 'Média', 'Mediana', 'Desvio-Padrão', 'Maior', '25%', '75%', 'DIQ', 'QtdOutliers', 'PctOutliers']:
+            if metrica in metricas:
+                informacao[metrica] = perfil[metrica]
+        if aproximado:
+            informacao['ErroDePosto'] = perfil['ErroDePosto']
+        if 'Outliers' in metricas:
+            # os valores ficam no resultado compacto e são lidos por página (veja `ResultadoOutliers`)
+            informacao['Outliers'] = self._listarOutliers(coluna, perfil['LimiteInferior'], perfil['LimiteSuperior'])
 
         #return informacao
         return {
             'lista': informacao
         }
+
+    @_memorizar
+    def Histograma(self, coluna: str, qtd_max_classes: int=200, aproximado: bool=False) -> pd.DataFrame:
+        """
+        Calcula o histograma de uma coluna quantitativa, com as classes já contadas, para que o gráfico receba apenas 
+        uma linha por classe em vez de todos os valores da coluna.
+
+        A largura das classes segue a regra de Freedman–Diaconis (2 x DIQ / n^(1/3)), usando o DIQ do perfil da 
+        coluna (`PerfilQuantitativo`). Quando o DIQ é zero, é usada a regra de Sturges. A quantidade de classes é 
+        limitada a `qtd_max_classes`.
+
+        Parâmetros:
+            coluna (str): Nome da coluna quantitativa.
+            qtd_max_classes (int, opcional): Quantidade máxima de classes.
+            aproximado (bool, opcional): Se verdadeiro, o DIQ é obtido do esboço de quantis da coluna. As contagens 
+                das classes são sempre exatas.
+
+        Retorna:
+            pd.DataFrame: DataFrame com uma linha por classe e as colunas 'Inicio', 'Fim', 'Quantidade' e 'Percentual'. 
+                Cada classe inclui o início e exclui o fim, exceto a última, que inclui os dois.
+
+        Lança:
+            Exception: Se a coluna fornecida não for identificada como quantitativa.
+
+        Exemplo de uso:
+            >>> import pandas as pd
+            >>> dados = pd.DataFrame({'Valores': [10, 12, 14, 15, 18, 20, 22, 100]})
+            >>> analise = AnaliseDataset(dados)
+            >>> analise.Histograma('Valores').head(2)
+                  Inicio        Fim  Quantidade  Percentual
+            0  10.000000  16.923077           4        50.0
+            1  16.923077  23.846154           3        37.5
+        """
+        self._validarPapel(coluna, 'Quantitativa')
+
+        perfil = self.PerfilQuantitativo([coluna], aproximado=aproximado).loc[coluna]
+        quantidade, menor, maior, diq = int(perfil['Quantidade']), perfil['Menor'], perfil['Maior'], perfil['DIQ']
+        if quantidade == 0:
+            return pd.DataFrame(columns=['Inicio', 'Fim', 'Quantidade', 'Percentual'])
+
+        if maior == menor:
+            limites = np.array([menor - 0.5, maior + 0.5])
+        else:
+            largura = 2 * diq / quantidade ** (1 / 3)
+            if largura > 0:
+                qtdClasses = int(np.ceil((maior - menor) / largura))
+            else:
+                qtdClasses = int(np.ceil(np.log2(quantidade))) + 1
+            limites = np.linspace(menor, maior, min(max(qtdClasses, 1), qtd_max_classes) + 1)
+
+        contagens = np.zeros(len(limites) - 1, dtype='int64')
+        for parte in self._partesDaColuna(coluna):
+            contagens += np.histogram(parte[~np.isnan(parte)], bins=limites)[0]
+
+        return pd.DataFrame({
+            'Inicio': limites[:-1],
+            'Fim': limites[1:],
+            'Quantidade': contagens,
+            'Percentual': contagens / quantidade * 100.0,
+        })
+
+    @_memorizar
+    def ResumoBoxplot(self, coluna: str, max_outliers: int=1000, aproximado: bool=False) -> dict:
+        """
+        Calcula as estatísticas de um boxplot de uma coluna quantitativa, para que o gráfico seja desenhado com os 
+        valores já resumidos em vez de todos os valores da coluna.
+
+        Os bigodes vão até o menor e o maior valor dentro dos limites de outliers (1,5 x DIQ). Os outliers são 
+        devolvidos como uma amostra de no máximo `max_outliers` valores igualmente espaçados na ordem crescente, que 
+        sempre inclui o menor e o maior outlier.
+
+        Parâmetros:
+            coluna (str): Nome da coluna quantitativa.
+            max_outliers (int, opcional): Quantidade máxima de outliers devolvidos.
+            aproximado (bool, opcional): Se verdadeiro, os quartis, a mediana e os limites são obtidos do esboço de 
+                quantis da coluna (veja `PerfilQuantitativo`).
+
+        Retorna:
+            dict: Dicionário contendo:
+                'q1', 'mediana', 'q3', 'media': Quartis, mediana e média da coluna.
+                'limite_inferior', 'limite_superior': Limites de outliers.
+                'bigode_inferior', 'bigode_superior': Menor e maior valor dentro dos limites.
+                'qtd_outliers': Quantidade total de outliers.
+                'outliers': Lista com a amostra de outliers, em ordem crescente.
+                'amostrado': Verdadeiro se a lista não contém todos os outliers.
+
+        Lança:
+            Exception: Se a coluna fornecida não for identificada como quantitativa.
+        """
+        self._validarPapel(coluna, 'Quantitativa')
+
+        perfil = self.PerfilQuantitativo([coluna], aproximado=aproximado).loc[coluna]
+        limiteInferior, limiteSuperior = perfil['LimiteInferior'], perfil['LimiteSuperior']
+
+        bigodeInferior, bigodeSuperior = np.inf, -np.inf
+        qtdOutliers = 0
+        outliers = np.empty(0)
+        for parte in self._partesDaColuna(coluna):
+            parte = parte[~np.isnan(parte)]
+            dentro = (parte >= limiteInferior) & (parte <= limiteSuperior)
+            if dentro.any():
+                bigodeInferior = min(bigodeInferior, parte[dentro].min())
+                bigodeSuperior = max(bigodeSuperior, parte[dentro].max())
+            fora = parte[~dentro]
+            qtdOutliers += len(fora)
+            outliers = np.concatenate([outliers, fora])
+            if len(outliers) > 2 * max_outliers:
+                # reduz a amostra a cada parte para limitar a memória usada
+                outliers = self._amostraOrdenada(outliers, max_outliers)
+        outliers = self._amostraOrdenada(outliers, max_outliers)
+
+        return {
+            'q1': perfil['25%'],
+            'mediana': perfil['Mediana'],
+            'q3': perfil['75%'],
+            'media': perfil['Média'],
+            'limite_inferior': limiteInferior,
+            'limite_superior': limiteSuperior,
+            'bigode_inferior': bigodeInferior if np.isfinite(bigodeInferior) else np.nan,
+            'bigode_superior': bigodeSuperior if np.isfinite(bigodeSuperior) else np.nan,
+            'qtd_outliers': qtdOutliers,
+            'outliers': outliers.tolist(),
+            'amostrado': len(outliers) < qtdOutliers,
+        }
+
+    def _amostraOrdenada(self, valores: np.ndarray, tamanho: int) -> np.ndarray:
+        """
+        Ordena os valores e mantém no máximo `tamanho` deles, igualmente espaçados (incluindo o menor e o maior).
+        """
+        valores = np.sort(valores)
+        if len(valores) <= tamanho:
+            return valores
+        return valores[np.linspace(0, len(valores) - 1, tamanho).round().astype('int64')]
     
 
     # # -----------------------------
     # # Análises Múltiplas
     
-    def MatrizDeConfusao(self, coluna1: str, coluna2: str) -> pd.DataFrame:
+    @_memorizar
+    def TabelaCruzada(self, coluna1: str, coluna2: str) -> dict:
+        """
+        Conta as combinações de valores de duas colunas qualitativas em uma representação esparsa, em que apenas as 
+        combinações que ocorrem são armazenadas.
+
+        As duas colunas são fatoradas uma única vez (`CodigosFatorados`, memorizado por coluna) e as combinações são 
+        contadas com `np.bincount` sobre o código combinado (código da linha x quantidade de colunas + código da 
+        coluna). Quando a quantidade de combinações possíveis é muito maior que a quantidade de linhas, as 
+        combinações são contadas por ordenação (`np.unique`), sem alocar a grade completa. Linhas com algum dos 
+        valores nulo são desconsideradas, como em `pd.crosstab`.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna qualitativa das linhas.
+            coluna2 (str): Nome da coluna qualitativa das colunas.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'linhas', 'colunas': pd.Index com os valores distintos de `coluna1` e de `coluna2`.
+                'codigos_linha', 'codigos_coluna', 'contagens': Posição em 'linhas', posição em 'colunas' e 
+                    quantidade de cada combinação que ocorre, em ordem decrescente de quantidade.
+                'total_linhas', 'total_colunas': Quantidade de registros de cada valor de 'linhas' e de 'colunas'.
+                'total': Quantidade de registros com os dois valores preenchidos.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como qualitativa.
+        """
         for coluna in [coluna1, coluna2]:
-            if coluna not in self.ColunasQualitativas:
-                raise Exception(f'A coluna {coluna} não é identificada como Qualitativa.')
+            self._validarPapel(coluna, 'Qualitativa')
 
-        dados = self.Dados[[coluna1, coluna2]]
-        return pd.crosstab(dados[coluna1], dados[coluna2])
-    
+        categorias1, categorias2, codigos1, codigos2, contagens = self._contagensCruzadas(coluna1, coluna2)
+        ordem = np.argsort(-contagens, kind='stable')
+        codigos1, codigos2, contagens = codigos1[ordem], codigos2[ordem], contagens[ordem]
+        return {
+            'linhas': categorias1,
+            'colunas': categorias2,
+            'codigos_linha': codigos1,
+            'codigos_coluna': codigos2,
+            'contagens': contagens,
+            'total_linhas': np.bincount(codigos1, weights=contagens, minlength=len(categorias1)).astype('int64'),
+            'total_colunas': np.bincount(codigos2, weights=contagens, minlength=len(categorias2)).astype('int64'),
+            'total': int(contagens.sum()),
+        }
 
-    def TotalPorCategoria(self, coluna1: str, coluna2: str, operacao='Soma') -> pd.DataFrame:
-        if coluna1 not in self.ColunasQualitativas:
-            raise Exception(f'A coluna {coluna1} não é identificada como Qualitativa.')
-        if coluna2 not in self.ColunasQuantitativas:
-            raise Exception(f'A coluna {coluna1} não é identificada como Quantitativa.')
+    def _contagensCruzadas(self, coluna1: str, coluna2: str) -> tuple:
+        """
+        Conta as combinações de valores de duas colunas a partir dos códigos fatorados (veja `TabelaCruzada`).
 
-        dados = self.Dados[[coluna1, coluna2]]
-        
-        if operacao == 'Soma':
-            operacao_agg = 'sum'
-        elif operacao == 'Média':
-            operacao_agg = 'mean'
+        Retorna:
+            tuple: (categorias de coluna1, categorias de coluna2, códigos de coluna1, códigos de coluna2, contagens), 
+                com uma posição por combinação que ocorre.
+        """
+        codigos1, categorias1 = self.CodigosFatorados(coluna1)
+        codigos2, categorias2 = self.CodigosFatorados(coluna2)
+        validos = (codigos1 >= 0) & (codigos2 >= 0)
+        combinados = codigos1[validos].astype('int64') * len(categorias2) + codigos2[validos]
+
+        qtdCombinacoes = len(categorias1) * len(categorias2)
+        if qtdCombinacoes <= max(len(combinados), 1 << 20):
+            contagens = np.bincount(combinados, minlength=qtdCombinacoes)
+            celulas = np.flatnonzero(contagens)
+            contagens = contagens[celulas]
         else:
-            operacao_agg = 'count'
+            # a grade completa seria muito maior que os dados: conta apenas as combinações que ocorrem
+            celulas, contagens = np.unique(combinados, return_counts=True)
+        largura = max(len(categorias2), 1)
+        return categorias1, categorias2, celulas // largura, celulas % largura, contagens.astype('int64')
 
-        # print(operacao, operacao_agg)
-        return dados.groupby(coluna1).agg({coluna2: operacao_agg}).reset_index()
-    
+    @_memorizar
+    def MatrizDeConfusao(self, coluna1: str, coluna2: str, max_linhas: int=None, max_colunas: int=None) -> pd.DataFrame:
+        """
+        Monta a tabela de contingência (quantidade de registros por combinação de valores) de duas colunas 
+        qualitativas a partir de `TabelaCruzada`.
+
+        Sem limites, o resultado equivale a `pd.crosstab`, com os valores em ordem crescente. Com `max_linhas` e/ou 
+        `max_colunas`, são mantidos apenas os valores mais frequentes de cada eixo, em ordem decrescente de frequência, 
+        e os demais são somados em uma linha e/ou coluna 'Outros'.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna qualitativa das linhas.
+            coluna2 (str): Nome da coluna qualitativa das colunas.
+            max_linhas (int, opcional): Quantidade máxima de valores de `coluna1` exibidos individualmente.
+            max_colunas (int, opcional): Quantidade máxima de valores de `coluna2` exibidos individualmente.
+
+        Retorna:
+            pd.DataFrame: Tabela de contingência, com o índice nomeado `coluna1` e as colunas nomeadas `coluna2`.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como qualitativa.
+        """
+        tabela = self.TabelaCruzada(coluna1, coluna2)
+        posicoesLinha, rotulosLinha = self._eixoDaMatriz(tabela['linhas'], tabela['total_linhas'], max_linhas)
+        posicoesColuna, rotulosColuna = self._eixoDaMatriz(tabela['colunas'], tabela['total_colunas'], max_colunas)
+
+        celulas = posicoesLinha[tabela['codigos_linha']] * len(rotulosColuna) + posicoesColuna[tabela['codigos_coluna']]
+        matriz = np.bincount(celulas, weights=tabela['contagens'], minlength=len(rotulosLinha) * len(rotulosColuna))
+        return pd.DataFrame(matriz.astype('int64').reshape(len(rotulosLinha), len(rotulosColuna)),
+                            index=pd.Index(rotulosLinha, name=coluna1), columns=pd.Index(rotulosColuna, name=coluna2))
+
+    def _eixoDaMatriz(self, categorias: pd.Index, totais: np.ndarray, maximo: int) -> tuple:
+        """
+        Define a posição de cada categoria em um eixo da tabela de contingência, agrupando as menos frequentes em 
+        'Outros' quando há mais de `maximo` categorias com registros.
+
+        Retorna:
+            tuple: (posição de cada categoria no eixo, rótulos do eixo).
+        """
+        presentes = np.flatnonzero(totais > 0)
+        posicoes = np.zeros(len(categorias), dtype='int64')
+        if maximo is None or len(presentes) <= maximo:
+            presentes = presentes[self._ordemDasCategorias(categorias[presentes])]
+            posicoes[presentes] = np.arange(len(presentes))
+            return posicoes, list(categorias[presentes])
+
+        maisFrequentes = presentes[np.argsort(-totais[presentes], kind='stable')[:maximo]]
+        posicoes[:] = maximo
+        posicoes[maisFrequentes] = np.arange(maximo)
+        return posicoes, list(categorias[maisFrequentes]) + ['Outros']
+
+    def CombinacoesDaTabelaCruzada(self, coluna1: str, coluna2: str, pagina: int=1, tamanho_pagina: int=100) -> dict:
+        """
+        Consulta, de forma paginada, as combinações de valores de duas colunas qualitativas em ordem decrescente de 
+        quantidade (veja `TabelaCruzada`). Apenas as combinações da página solicitada são convertidas em tabela.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna qualitativa das linhas.
+            coluna2 (str): Nome da coluna qualitativa das colunas.
+            pagina (int, opcional): Número da página (iniciando em 1).
+            tamanho_pagina (int, opcional): Quantidade de combinações por página.
+
+        Retorna:
+            dict: Dicionário no formato de `CatalogoDeColunas`, em que 'tabela' possui as colunas `coluna1`, `coluna2`, 
+                'Quantidade' e 'Percentual'.
+        """
+        tabela = self.TabelaCruzada(coluna1, coluna2)
+        pagina = _paginar(np.arange(len(tabela['contagens'])), pagina, tamanho_pagina)
+        posicoes = pagina['tabela']
+        contagens = tabela['contagens'][posicoes]
+        pagina['tabela'] = pd.DataFrame({
+            coluna1: tabela['linhas'][tabela['codigos_linha'][posicoes]],
+            coluna2: tabela['colunas'][tabela['codigos_coluna'][posicoes]],
+            'Quantidade': contagens,
+            'Percentual': contagens / max(tabela['total'], 1) * 100.0,
+        })
+        return pagina
+
+    def _ordemDasCategorias(self, categorias: pd.Index) -> np.ndarray:
+        """
+        Retorna as posições que colocam as categorias em ordem crescente, ou a ordem original quando os valores são de 
+        tipos que não podem ser comparados entre si.
+        """
+        try:
+            return np.argsort(categorias.to_numpy(), kind='stable')
+        except TypeError:
+            return np.arange(len(categorias))
+
+    @_memorizar
+    def AgrupamentoPorCategoria(self, coluna: str) -> dict:
+        """
+        Agrupa as linhas do dataset pelos valores de uma coluna qualitativa, uma única vez por coluna, para que os 
+        totais de qualquer coluna quantitativa por categoria sejam obtidos sem agrupar novamente.
+
+        As linhas com valor preenchido são ordenadas pelo código fatorado da categoria (`CodigosFatorados`), de modo 
+        que cada categoria ocupa um intervalo contínuo da ordenação.
+
+        Parâmetros:
+            coluna (str): Nome da coluna qualitativa.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'ordem': Posições das linhas, agrupadas por categoria.
+                'inicios': Posição em 'ordem' em que começa cada grupo.
+                'categorias': pd.Index com a categoria de cada grupo.
+
+        Lança:
+            Exception: Se a coluna fornecida não for identificada como qualitativa.
+        """
+        self._validarPapel(coluna, 'Qualitativa')
+
+        codigos, categorias = self.CodigosFatorados(coluna)
+        # a ordem dos códigos segue a ordem crescente das categorias, como em groupby
+        ordemCategorias = self._ordemDasCategorias(categorias)
+        codigosOrdenados = np.empty(len(categorias), dtype='int64')
+        codigosOrdenados[ordemCategorias] = np.arange(len(categorias))
+        validas = np.flatnonzero(codigos >= 0)
+        chaves = codigosOrdenados[codigos[validas]]
+        ordemValidas = np.argsort(chaves, kind='stable')
+        ordem = validas[ordemValidas]
+        chaves = chaves[ordemValidas]
+        inicios = np.flatnonzero(np.concatenate([[True], chaves[1:] != chaves[:-1]])) if len(chaves) > 0 else np.empty(0, dtype='int64')
+        return {
+            'ordem': ordem,
+            'inicios': inicios,
+            'categorias': categorias[ordemCategorias][chaves[inicios]],
+        }
+
+    @_memorizar
+    def ResumoPorCategoria(self, coluna1: str, coluna2: str) -> pd.DataFrame:
+        """
+        Calcula, em uma única passagem sobre o agrupamento da coluna qualitativa (`AgrupamentoPorCategoria`), a soma, 
+        a média, a contagem, o menor e o maior valor e o desvio-padrão de uma coluna quantitativa por categoria.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna qualitativa.
+            coluna2 (str): Nome da coluna quantitativa.
+
+        Retorna:
+            pd.DataFrame: DataFrame com uma linha por categoria (em ordem crescente) e as colunas `coluna1`, 'Soma', 
+                'Média', 'Contagem' (valores não nulos), 'Mínimo', 'Máximo' e 'Desvio-Padrão', com os mesmos 
+                resultados de `groupby(coluna1)[coluna2]`.
+
+        Lança:
+            Exception: Se as colunas não forem uma coluna qualitativa e uma coluna quantitativa.
+        """
+        self._validarPapel(coluna2, 'Quantitativa')
+        agrupamento = self.AgrupamentoPorCategoria(coluna1)
+        inicios = agrupamento['inicios']
+        if len(inicios) == 0:
+            return self._tabelaDoResumo(coluna1, agrupamento['categorias'], *[np.empty(0)] * 5)
+
+        valores = self._matrizQuantitativa([coluna2])[agrupamento['ordem'], 0]
+        preenchidos = ~np.isnan(valores)
+        zerados = np.where(preenchidos, valores, 0.0)
+
+        contagem = np.add.reduceat(preenchidos.astype('int64'), inicios)
+        soma = np.add.reduceat(zerados, inicios)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            media = soma / contagem
+            # desvios em relação à média de cada grupo (duas passagens, como em pandas)
+            desvios = np.where(preenchidos, valores - np.repeat(media, np.diff(np.append(inicios, len(valores)))), 0.0)
+            desvioPadrao = np.sqrt(np.add.reduceat(desvios ** 2, inicios) / (contagem - 1))
+        desvioPadrao[contagem < 2] = np.nan
+        return self._tabelaDoResumo(coluna1, agrupamento['categorias'], soma, contagem, 
+                                    np.fmin.reduceat(valores, inicios), np.fmax.reduceat(valores, inicios), desvioPadrao)
+
+    def _tabelaDoResumo(self, coluna: str, categorias: pd.Index, soma: np.ndarray, contagem: np.ndarray, 
+                        menor: np.ndarray, maior: np.ndarray, desvioPadrao: np.ndarray) -> pd.DataFrame:
+        """
+        Monta a tabela de `ResumoPorCategoria` a partir dos totais de cada categoria.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            media = np.where(contagem > 0, soma / np.maximum(contagem, 1), np.nan)
+        return pd.DataFrame({
+            coluna: categorias,
+            'Soma': soma,
+            'Média': media,
+            'Contagem': np.asarray(contagem, dtype='int64'),
+            'Mínimo': menor,
+            'Máximo': maior,
+            'Desvio-Padrão': desvioPadrao,
+        })
+
+    def TotalPorCategoria(self, coluna1: str, coluna2: str, operacao='Soma') -> pd.DataFrame:
+        """
+        Totaliza uma coluna quantitativa por categoria de uma coluna qualitativa. O resultado é obtido de 
+        `ResumoPorCategoria`, que calcula todas as operações de uma vez, então trocar a operação não agrupa os dados 
+        novamente.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna qualitativa.
+            coluna2 (str): Nome da coluna quantitativa.
+            operacao (str, opcional): 'Soma', 'Média', 'Contagem', 'Mínimo', 'Máximo' ou 'Desvio-Padrão'.
+
+        Retorna:
+            pd.DataFrame: DataFrame com as colunas `coluna1` e `coluna2` (valor da operação), uma linha por categoria.
+
+        Lança:
+            Exception: Se as colunas não forem uma coluna qualitativa e uma coluna quantitativa, ou se a operação não 
+                for reconhecida.
+        """
+        self._validarPapel(coluna1, 'Qualitativa')
+        self._validarPapel(coluna2, 'Quantitativa')
+        if operacao not in ('Soma', 'Média', 'Contagem', 'Mínimo', 'Máximo', 'Desvio-Padrão'):
+            raise Exception(f'A operação {operacao} não é suportada.')
+
+        resumo = self.ResumoPorCategoria(coluna1, coluna2)
+        return resumo[[coluna1, operacao]].rename(columns={operacao: coluna2})
     
+    @_memorizar
+    def DensidadeDispersao(self, coluna1: str, coluna2: str, qtd_classes: int=100) -> dict:
+        """
+        Conta os pares de valores de duas colunas quantitativas em uma grade de `qtd_classes` x `qtd_classes` células 
+        quadradas, considerando todas as linhas em que as duas colunas são preenchidas. O gráfico de dispersão pode 
+        então ser desenhado como um mapa de calor com tamanho constante, qualquer que seja a quantidade de linhas.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna quantitativa do eixo x.
+            coluna2 (str): Nome da coluna quantitativa do eixo y.
+            qtd_classes (int, opcional): Quantidade de classes em cada eixo.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'contagens': np.ndarray (qtd_classes x qtd_classes) com a quantidade de pares de cada célula, 
+                    indexado por [classe de coluna1, classe de coluna2].
+                'limites_x', 'limites_y': Limites das classes de cada eixo (qtd_classes + 1 valores).
+                'qtd_pares': Quantidade de linhas com as duas colunas preenchidas.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como quantitativa.
+        """
+        for coluna in [coluna1, coluna2]:
+            self._validarPapel(coluna, 'Quantitativa')
+
+        # apenas o menor e o maior valor são usados, e eles são exatos também no perfil aproximado (sem ordenação)
+        perfil = self.PerfilQuantitativo([coluna1, coluna2], aproximado=True)
+        limites = [np.linspace(perfil.loc[coluna, 'Menor'], perfil.loc[coluna, 'Maior'], qtd_classes + 1) 
+                   if perfil.loc[coluna, 'Quantidade'] > 0 else np.zeros(qtd_classes + 1) 
+                   for coluna in [coluna1, coluna2]]
+
+        contagens = np.zeros(qtd_classes * qtd_classes, dtype='int64')
+        for matriz in self._partesDasColunas([coluna1, coluna2]):
+            matriz = matriz[~np.isnan(matriz).any(axis=1)]
+            contagens += np.bincount(self._celulasDaGrade(matriz, limites), minlength=len(contagens))
+
+        return {
+            'contagens': contagens.reshape(qtd_classes, qtd_classes),
+            'limites_x': limites[0],
+            'limites_y': limites[1],
+            'qtd_pares': int(contagens.sum()),
+        }
+
+    def _celulasDaGrade(self, matriz: np.ndarray, limites: list) -> np.ndarray:
+        """
+        Calcula a célula da grade (índice linear) de cada linha de uma matriz de duas colunas sem valores nulos.
+        """
+        qtdClasses = len(limites[0]) - 1
+        indices = []
+        for posicao, limitesEixo in enumerate(limites):
+            amplitude = limitesEixo[-1] - limitesEixo[0]
+            escala = qtdClasses / amplitude if amplitude > 0 else 0.0
+            indices.append(np.clip(((matriz[:, posicao] - limitesEixo[0]) * escala).astype('int64'), 0, qtdClasses - 1))
+        return indices[0] * qtdClasses + indices[1]
+
+    @_memorizar
+    def AmostraExtremos(self, coluna1: str, coluna2: str, tamanho: int=5000, qtd_classes: int=100, semente: int=42) -> pd.DataFrame:
+        """
+        Seleciona uma amostra de linhas para o gráfico de dispersão de duas colunas quantitativas que preserva as 
+        regiões raras e os extremos.
+
+        As linhas são amostradas por célula da grade de `DensidadeDispersao`: cada célula contribui com no máximo uma 
+        mesma cota de linhas, de modo que as células pouco povoadas (inclusive as de outliers) são mantidas por 
+        inteiro e apenas as células densas são reduzidas. As linhas com o menor e o maior valor de cada coluna são 
+        sempre incluídas. Quando há até `tamanho` linhas válidas, todas são retornadas, sem repetição.
+
+        Parâmetros:
+            coluna1 (str): Nome da coluna quantitativa do eixo x.
+            coluna2 (str): Nome da coluna quantitativa do eixo y.
+            tamanho (int, opcional): Tamanho aproximado da amostra.
+            qtd_classes (int, opcional): Quantidade de classes em cada eixo da grade.
+            semente (int, opcional): Semente do gerador aleatório (amostras reproduzíveis).
+
+        Retorna:
+            pd.DataFrame: DataFrame com as colunas `coluna1` e `coluna2`, indexado pela posição das linhas no dataset.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como quantitativa.
+        """
+        densidade = self.DensidadeDispersao(coluna1, coluna2, qtd_classes)
+        contagens = densidade['contagens'].ravel()
+        limites = [densidade['limites_x'], densidade['limites_y']]
+
+        # cota por célula: a maior cota c para a qual a soma de min(contagem, c) não ultrapassa o tamanho da amostra
+        cota = np.inf
+        if densidade['qtd_pares'] > tamanho:
+            ordenadas = np.sort(contagens[contagens > 0])
+            acumuladas = np.concatenate([[0], np.cumsum(ordenadas)])
+            restantes = len(ordenadas) - np.arange(len(ordenadas))
+            # ao usar a contagem da posição i como cota, as células anteriores são mantidas e as demais, limitadas
+            totais = acumuladas[:-1] + ordenadas * restantes
+            posicao = np.searchsorted(totais, tamanho, side='right')
+            cota = (tamanho - acumuladas[posicao]) / restantes[posicao] if posicao < len(ordenadas) else np.inf
+        probabilidades = np.minimum(1.0, cota / np.maximum(contagens, 1))
+
+        aleatorio = np.random.default_rng(semente)
+        selecionadas = []
+        # candidatos a extremos de cada parte: (valor, posição) do menor e do maior valor de cada coluna
+        menores, maiores = [], []
+        deslocamento = 0
+        for matriz in self._partesDasColunas([coluna1, coluna2]):
+            validas = np.flatnonzero(~np.isnan(matriz).any(axis=1))
+            if len(validas) > 0:
+                valores = matriz[validas]
+                mantidas = aleatorio.random(len(validas)) < probabilidades[self._celulasDaGrade(valores, limites)]
+                selecionadas.append(validas[mantidas] + deslocamento)
+                menores.append([(valores[indice, eixo], validas[indice] + deslocamento) for eixo, indice in enumerate(valores.argmin(axis=0))])
+                maiores.append([(valores[indice, eixo], validas[indice] + deslocamento) for eixo, indice in enumerate(valores.argmax(axis=0))])
+            deslocamento += matriz.shape[0]
+
+        if len(menores) > 0:
+            for eixo in range(2):
+                selecionadas.append(np.array([min(parte[eixo] for parte in menores)[1], max(parte[eixo] for parte in maiores)[1]], dtype='int64'))
+        posicoes = np.unique(np.concatenate(selecionadas)) if len(selecionadas) > 0 else np.empty(0, dtype='int64')
+
+        # os valores são obtidos novamente apenas para as posições escolhidas
+        amostra = self._linhasDasPosicoes([coluna1, coluna2], posicoes)
+        amostra.index = pd.Index(posicoes)
+        return amostra
+
+    def _linhasDasPosicoes(self, colunas: list, posicoes: np.ndarray) -> pd.DataFrame:
+        """
+        Obtém os valores das colunas informadas nas posições (números das linhas) informadas.
+        """
+        return self.Dados[colunas].iloc[posicoes].reset_index(drop=True)
+
+    def _datasEmNanossegundos(self, serie: pd.Series) -> np.ndarray:
+        """
+        Converte uma coluna de datas em um array int64 de nanossegundos desde 1970-01-01 (horário local, sem fuso), 
+        com os valores nulos representados por `np.iinfo('int64').min` (NaT).
+        """
+        serie = pd.to_datetime(serie, errors='coerce')
+        if serie.dt.tz is not None:
+            serie = serie.dt.tz_localize(None)
+        return serie.to_numpy(dtype='datetime64[ns]').view('int64')
+
+    def _partesDaSerie(self, colunaData: str, colunaValor: str):
+        """
+        Percorre os pares (datas em nanossegundos, valores float64) de uma coluna de datas e uma coluna quantitativa, 
+        em partes. Na análise em memória, há uma única parte.
+        """
+        yield self._datasEmNanossegundos(self.Dados[colunaData]), self.Dados[colunaValor].to_numpy(dtype='float64', na_value=np.nan)
+
+    def _partesDasDatas(self, coluna: str):
+        """
+        Percorre os valores de uma coluna de datas em partes, em nanossegundos (veja `_datasEmNanossegundos`). Na 
+        análise em memória, há uma única parte.
+        """
+        yield self._datasEmNanossegundos(self.Dados[coluna])
+
+    @_memorizar
+    def PerfilTemporal(self, coluna: str) -> dict:
+        """
+        Conta os registros de uma coluna Data ou Data/Hora por dia, por mês, por dia da semana e por hora do dia.
+
+        As contagens são obtidas da representação inteira das datas (nanossegundos desde 1970-01-01): cada valor é 
+        convertido uma única vez no número do dia e na hora, e as contagens por mês e por dia da semana são derivadas 
+        das contagens diárias. Nenhum texto é formatado por linha e os dados da análise não são alterados.
+
+        Parâmetros:
+            coluna (str): Nome da coluna Data ou Data/Hora.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'diario': DataFrame com as colunas `coluna` (dia) e 'Quantidade', apenas para os dias com registros.
+                'mensal': DataFrame com as colunas `coluna` (primeiro dia do mês) e 'Quantidade'.
+                'dia_da_semana': DataFrame com as colunas 'DiaDaSemana' e 'Quantidade', de segunda-feira a domingo.
+                'hora': DataFrame com as colunas 'Hora' (0 a 23) e 'Quantidade'.
+
+        Lança:
+            Exception: Se a coluna fornecida não for identificada como Data ou Data/Hora.
+        """
+        if self.PapelDaColuna(coluna) not in ('Data', 'Data/Hora'):
+            raise Exception(f'A coluna {coluna} não é identificada como Data ou Data/Hora.')
+
+        nanossegundosPorDia = 86400 * 10 ** 9
+        partesDias, partesContagens = [np.empty(0, dtype='int64')], [np.empty(0, dtype='int64')]
+        horas = np.zeros(24, dtype='int64')
+        for datas in self._partesDasDatas(coluna):
+            datas = datas[datas != np.iinfo('int64').min]
+            if len(datas) == 0:
+                continue
+            dias = datas // nanossegundosPorDia
+            horas += np.bincount((datas - dias * nanossegundosPorDia) // (3600 * 10 ** 9), minlength=24)
+            primeiroDia = dias.min()
+            contagens = np.bincount(dias - primeiroDia)
+            comRegistros = np.flatnonzero(contagens)
+            partesDias.append(comRegistros + primeiroDia)
+            partesContagens.append(contagens[comRegistros])
+
+        dias, posicoes = np.unique(np.concatenate(partesDias), return_inverse=True)
+        contagens = np.bincount(posicoes, weights=np.concatenate(partesContagens), minlength=len(dias)).astype('int64')
+        meses, posicoes = np.unique(dias.view('datetime64[D]').astype('datetime64[M]'), return_inverse=True)
+        contagensMensais = np.bincount(posicoes, weights=contagens, minlength=len(meses)).astype('int64')
+        # 1970-01-01 foi uma quinta-feira (dia 3, contando a partir da segunda-feira)
+        diasDaSemana = np.bincount((dias + 3) % 7, weights=contagens, minlength=7).astype('int64')
+
+        return {
+            'diario': pd.DataFrame({coluna: dias.view('datetime64[D]').astype('datetime64[ns]'), 'Quantidade': contagens}),
+            'mensal': pd.DataFrame({coluna: meses.astype('datetime64[ns]'), 'Quantidade': contagensMensais}),
+            'dia_da_semana': pd.DataFrame({'DiaDaSemana': DIAS_DA_SEMANA, 'Quantidade': diasDaSemana}),
+            'hora': pd.DataFrame({'Hora': np.arange(24), 'Quantidade': horas}),
+        }
+
+    @_memorizar
+    def _intervaloDeDatas(self, colunaData: str, colunaValor: str) -> tuple:
+        """
+        Obtém a menor e a maior data (em nanossegundos) das linhas em que a data e o valor são preenchidos.
+        """
+        menor, maior = None, None
+        for datas, valores in self._partesDaSerie(colunaData, colunaValor):
+            datas = datas[(datas != np.iinfo('int64').min) & ~np.isnan(valores)]
+            if len(datas) > 0:
+                menor = datas.min() if menor is None else min(menor, datas.min())
+                maior = datas.max() if maior is None else max(maior, datas.max())
+        return menor, maior
+
+    @_memorizar
+    def SerieTemporal(self, colunaData: str, colunaValor: str, granularidade: str='Auto', operacao: str='Soma', max_pontos: int=2000) -> dict:
+        """
+        Monta a série temporal de uma coluna quantitativa ao longo de uma coluna de datas, com uma quantidade limitada 
+        de pontos, para que o gráfico não receba todas as linhas do dataset.
+
+        Os valores são agrupados por período (minuto, hora, dia, semana, mês ou ano) e cada período é resumido pela 
+        operação escolhida. Com a granularidade 'Auto', é usado o menor período que resulta em até `max_pontos` 
+        pontos. Com a granularidade 'Original', os valores não são agrupados: as linhas são ordenadas pela data e a 
+        série é reduzida pelo algoritmo LTTB, que preserva picos e vales. A série agrupada também é reduzida pelo LTTB 
+        quando possui mais de `max_pontos` pontos.
+
+        Parâmetros:
+            colunaData (str): Nome da coluna Data ou Data/Hora.
+            colunaValor (str): Nome da coluna quantitativa.
+            granularidade (str, opcional): 'Auto', 'Original' ou uma das chaves de `GRANULARIDADES_TEMPORAIS`.
+            operacao (str, opcional): 'Soma', 'Média', 'Mínimo', 'Máximo' ou 'Contagem' (ignorada na granularidade 
+                'Original').
+            max_pontos (int, opcional): Quantidade máxima de pontos da série.
+
+        Retorna:
+            dict: Dicionário contendo:
+                'serie': DataFrame com as colunas `colunaData` (início do período ou data original) e `colunaValor`, 
+                    ordenado pela data.
+                'granularidade': Granularidade usada.
+                'qtd_periodos': Quantidade de períodos (ou de linhas, na granularidade 'Original') antes da redução 
+                    pelo LTTB.
+
+        Lança:
+            Exception: Se as colunas não forem uma coluna de datas e uma coluna quantitativa, ou se a granularidade ou a 
+                operação não forem reconhecidas.
+
+        Exemplo de uso:
+            >>> serie = analise.SerieTemporal('DataVenda', 'Valor', granularidade='Auto', operacao='Soma')
+            >>> serie['granularidade'], serie['serie'].shape
+            ('Dia', (365, 2))
+        """
+        if self.PapelDaColuna(colunaData) not in ('Data', 'Data/Hora'):
+            raise Exception(f'A coluna {colunaData} não é identificada como Data ou Data/Hora.')
+        self._validarPapel(colunaValor, 'Quantitativa')
+        if granularidade not in ('Auto', 'Original') and granularidade not in GRANULARIDADES_TEMPORAIS:
+            raise Exception(f'A granularidade {granularidade} não é suportada.')
+        if operacao not in ('Soma', 'Média', 'Mínimo', 'Máximo', 'Contagem'):
+            raise Exception(f'A operação {operacao} não é suportada.')
+
+        if granularidade == 'Auto':
+            menor, maior = self._intervaloDeDatas(colunaData, colunaValor)
+            duracao = 0 if menor is None else (maior - menor) / 1e9
+            granularidade = next((nome for nome, (_, segundos) in GRANULARIDADES_TEMPORAIS.items() if duracao / segundos < max_pontos), 'Ano')
+
+        if granularidade == 'Original':
+            partesDatas, partesValores = [np.empty(0, dtype='int64')], [np.empty(0)]
+            for datas, valores in self._partesDaSerie(colunaData, colunaValor):
+                validos = (datas != np.iinfo('int64').min) & ~np.isnan(valores)
+                partesDatas.append(datas[validos])
+                partesValores.append(valores[validos])
+            datas, valores = np.concatenate(partesDatas), np.concatenate(partesValores)
+            ordem = np.argsort(datas, kind='stable')
+            datas, valores = datas[ordem], valores[ordem]
+        else:
+            unidade = GRANULARIDADES_TEMPORAIS[granularidade][0]
+            acumulado = (np.empty(0, dtype='int64'), np.empty(0), np.empty(0, dtype='int64'), np.empty(0), np.empty(0))
+            for datas, valores in self._partesDaSerie(colunaData, colunaValor):
+                validos = (datas != np.iinfo('int64').min) & ~np.isnan(valores)
+                chaves = self._periodosDasDatas(datas[validos], unidade)
+                valores = valores[validos]
+                parcial = _reduzirPorChave(chaves, valores, np.ones(len(valores), dtype='int64'), valores, valores)
+                acumulado = _reduzirPorChave(*[np.concatenate([anterior, atual]) for anterior, atual in zip(acumulado, parcial)])
+            chaves, soma, contagem, menores, maiores = acumulado
+            datas = self._inicioDosPeriodos(chaves, unidade)
+            valores = {'Soma': soma, 'Média': soma / np.maximum(contagem, 1), 'Mínimo': menores, 'Máximo': maiores, 
+                       'Contagem': contagem}[operacao].astype('float64')
+
+        qtdPeriodos = len(datas)
+        posicoes = _lttb(datas.astype('float64'), valores, max_pontos)
+        return {
+            'serie': pd.DataFrame({colunaData: datas[posicoes].view('datetime64[ns]'), colunaValor: valores[posicoes]}),
+            'granularidade': granularidade,
+            'qtd_periodos': qtdPeriodos,
+        }
+
+    def _periodosDasDatas(self, datas: np.ndarray, unidade: str) -> np.ndarray:
+        """
+        Converte datas em nanossegundos na chave inteira do período que as contém (semanas iniciadas na segunda-feira).
+        """
+        if unidade == 'W':
+            dias = datas.view('datetime64[ns]').astype('datetime64[D]').view('int64')
+            # 1970-01-01 foi uma quinta-feira: (dias + 3) % 7 é a quantidade de dias desde a segunda-feira
+            return dias - (dias + 3) % 7
+        return datas.view('datetime64[ns]').astype(f'datetime64[{unidade}]').view('int64')
+
+    def _inicioDosPeriodos(self, chaves: np.ndarray, unidade: str) -> np.ndarray:
+        """
+        Converte as chaves de período de `_periodosDasDatas` na data de início de cada período, em nanossegundos.
+        """
+        unidade = 'D' if unidade == 'W' else unidade
+        return chaves.view(f'datetime64[{unidade}]').astype('datetime64[ns]').view('int64')
+
+    @_memorizar
     def ValorDeCorrelacao(self, coluna1: str, coluna2: str) -> float:
-        return self.Dados[coluna1].corr(self.Dados[coluna2])
+        """
+        Obtém a correlação de Pearson entre duas colunas quantitativas. Se a matriz de correlação ou pares 
+        correlacionados que incluem as duas colunas já tiverem sido calculados, o valor é obtido deles; caso 
+        contrário, apenas o par é calculado.
+        """
+        for chave, resultado in list(self._cache.items()):
+            if chave[0] == 'MatrizDeCorrelacao' and resultado is not None:
+                return resultado.loc[coluna1, coluna2]
+            if chave[0] == 'ParesCorrelacionados' and dict(chave[1])['metodo'] == 'Pearson':
+                par = resultado[((resultado['coluna_a'] == coluna1) & (resultado['coluna_b'] == coluna2)) | 
+                                ((resultado['coluna_a'] == coluna2) & (resultado['coluna_b'] == coluna1))]
+                if par.shape[0] > 0:
+                    return par['correlacao'].iloc[0]
+
+        return self._correlacaoDoPar(coluna1, coluna2)
+
+    def _correlacaoDoPar(self, coluna1: str, coluna2: str) -> float:
+        """
+        Calcula a correlação de Pearson de um único par de colunas.
+        """
+        matriz, validos = self._prepararCorrelacao([coluna1, coluna2], 'Pearson')
+        return _correlacaoEntre(matriz[:, :1], None if validos is None else validos[:, :1], 
+                                matriz[:, 1:], None if validos is None else validos[:, 1:])[0, 0]
+
+    def _prepararCorrelacao(self, colunas: list, metodo: str) -> tuple:
+        """
+        Prepara as colunas para `_correlacaoEntre`: converte para float64 (ou para postos, no método de Spearman), 
+        subtrai a média de cada coluna e substitui os nulos por zero.
+
+        Retorna:
+            tuple: (matriz preparada, matriz booleana de valores preenchidos ou None se não houver nulos).
+        """
+        matriz = self._matrizQuantitativa(colunas)
+        if metodo == 'Spearman':
+            # postos médios em caso de empate; os nulos permanecem nulos
+            matriz = pd.DataFrame(matriz).rank().to_numpy()
+        validos = ~np.isnan(matriz)
+        with warnings.catch_warnings():
+            # colunas totalmente nulas não possuem média
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            matriz = np.nan_to_num(matriz - np.nanmean(matriz, axis=0), copy=False)
+        return matriz, None if validos.all() else validos
+
+    def _blocosDeCorrelacao(self, colunas: list, metodo: str, tamanho_bloco: int):
+        """
+        Percorre o triângulo superior da matriz de correlação em blocos de `tamanho_bloco` x `tamanho_bloco` colunas.
+
+        Retorna:
+            generator: Tuplas (posição da primeira linha, posição da primeira coluna, bloco de correlações).
+        """
+        matriz, validos = self._prepararCorrelacao(colunas, metodo)
+        for inicioA in range(0, len(colunas), tamanho_bloco):
+            fimA = inicioA + tamanho_bloco
+            for inicioB in range(inicioA, len(colunas), tamanho_bloco):
+                fimB = inicioB + tamanho_bloco
+                yield inicioA, inicioB, _correlacaoEntre(
+                    matriz[:, inicioA:fimA], None if validos is None else validos[:, inicioA:fimA], 
+                    matriz[:, inicioB:fimB], None if validos is None else validos[:, inicioB:fimB])
+
+    @_memorizar
+    def ParesCorrelacionados(self, valor_base_correlacao: float=0.7, metodo: str='Pearson', tamanho_bloco: int=256) -> pd.DataFrame:
+        """
+        Lista os pares de colunas quantitativas cuja correlação, em valor absoluto, é maior ou igual a 
+        `valor_base_correlacao`, sem montar a matriz de correlação completa.
+
+        Apenas o triângulo superior da matriz é calculado, em blocos de `tamanho_bloco` colunas, e de cada bloco são 
+        mantidos somente os pares que atingem o valor base, de modo que a memória usada não cresce com o quadrado da 
+        quantidade de colunas. Para cada par, são consideradas apenas as linhas em que as duas colunas são 
+        preenchidas. No método de Spearman, cada coluna é convertida em postos desconsiderando os seus próprios nulos.
+
+        Parâmetros:
+            valor_base_correlacao (float, opcional): Correlação mínima, em valor absoluto.
+            metodo (str, opcional): 'Pearson' ou 'Spearman'.
+            tamanho_bloco (int, opcional): Quantidade de colunas de cada bloco.
+
+        Retorna:
+            pd.DataFrame: DataFrame com as colunas 'coluna_a', 'coluna_b' e 'correlacao', com um único sentido por 
+                par ('coluna_a' antes de 'coluna_b' na ordem das colunas), ordenado de forma decrescente pela 
+                correlação.
+
+        Lança:
+            Exception: Se o método não for reconhecido.
+        """
+        if metodo not in ('Pearson', 'Spearman'):
+            raise Exception(f'O método de correlação {metodo} não é suportado.')
+
+        colunas = np.array(self.ColunasQuantitativas, dtype='object')
+        partes = []
+        if len(colunas) >= 2:
+            for inicioA, inicioB, bloco in self._blocosDeCorrelacao(list(colunas), metodo, tamanho_bloco):
+                relevantes = np.abs(bloco) >= valor_base_correlacao
+                if inicioA == inicioB:
+                    # no bloco da diagonal, apenas os pares acima da diagonal
+                    relevantes &= np.triu(np.ones(bloco.shape, dtype='bool'), k=1)
+                linhas, colunasBloco = np.nonzero(relevantes)
+                if len(linhas) > 0:
+                    partes.append(pd.DataFrame({'coluna_a': colunas[linhas + inicioA], 'coluna_b': colunas[colunasBloco + inicioB], 
+                                                'correlacao': bloco[linhas, colunasBloco]}))
+
+        if len(partes) == 0:
+            return pd.DataFrame({'coluna_a': pd.Series(dtype='object'), 'coluna_b': pd.Series(dtype='object'), 
+                                 'correlacao': pd.Series(dtype='float64')})
+        pares = pd.concat(partes, ignore_index=True)
+        return pares.sort_values(by='correlacao', ascending=False, ignore_index=True)
+
+    def CorrelacaoComColunas(self, colunas: list) -> pd.DataFrame:
+        """
+        Calcula a correlação de Pearson entre as colunas informadas e todas as colunas quantitativas, sem calcular a 
+        matriz de correlação completa.
+
+        Parâmetros:
+            colunas (list): Lista de colunas quantitativas.
+
+        Retorna:
+            pd.DataFrame: DataFrame com uma linha para cada coluna informada e uma coluna para cada coluna quantitativa.
+
+        Lança:
+            Exception: Se alguma coluna fornecida não for identificada como quantitativa.
+        """
+        for coluna in colunas:
+            self._validarPapel(coluna, 'Quantitativa')
+
+        # não é memorizado: o resultado depende de todas as colunas quantitativas, não apenas das informadas
+        quantitativas = self.ColunasQuantitativas
+        matriz, validos = self._prepararCorrelacao(quantitativas, 'Pearson')
+        posicoes = [quantitativas.index(coluna) for coluna in colunas]
+        correlacao = _correlacaoEntre(matriz[:, posicoes], None if validos is None else validos[:, posicoes], matriz, validos)
+        return pd.DataFrame(correlacao, index=colunas, columns=quantitativas)
     
+    @_memorizar
     def MatrizDeCorrelacao(self) -> pd.DataFrame:
         colunas = self.ColunasQuantitativas
         if len(colunas) < 2:
             return None
         return self.Dados[colunas].corr()
     
-    def CorrelacoesRelevantes(self, valor_base_correlacao: int=0.7):
-        # gera a matriz de correlação das colunas quantitativas
-        matriz_correlacao_orig = self.MatrizDeCorrelacao()
-        if matriz_correlacao_orig is None:
-            return None
-
-        # remove o índice das linhas transformando em coluna_a
-        matriz_correlacao_1 = matriz_correlacao_orig.reset_index().rename({'index': 'coluna_a'}, axis=1)
-        # unpivota as colunas, transformando-as em linhas, gerando as colunas coluna_b e correlacao
-        matriz_correlacao_2 = pd.melt(matriz_correlacao_1, id_vars=['coluna_a'], var_name='coluna_b', value_name='correlacao')
-
-        # filtra apenas correlações de interesse com base no valor
-        matriz_correlacao_3 = matriz_correlacao_2[
-            (
-                (matriz_correlacao_2['correlacao'] <= -valor_base_correlacao) |             # correlação negativa
-                (matriz_correlacao_2['correlacao'] >= valor_base_correlacao)                # correlação positiva
-            ) & (matriz_correlacao_2['coluna_a'] != matriz_correlacao_2['coluna_b'])        # coluna com ela mesma
-        ].sort_values(by='correlacao', ascending=False)                                     # ordena de forma decrescente
+    @_memorizar
+    def CorrelacoesRelevantes(self, valor_base_correlacao: int=0.7, metodo: str='Pearson'):
+        """
+        Lista as correlações relevantes entre as colunas quantitativas nos dois sentidos (A com B e B com A), a partir 
+        de `ParesCorrelacionados`.
 
-        return matriz_correlacao_3
+        Retorna:
+            pd.DataFrame: DataFrame com as colunas 'coluna_a', 'coluna_b' e 'correlacao', ordenado de forma decrescente 
+                pela correlação, ou None se houver menos de duas colunas quantitativas.
+        """
+        if len(self.ColunasQuantitativas) < 2:
+            return None
 
+        pares = self.ParesCorrelacionados(valor_base_correlacao, metodo)
+        invertidos = pares.rename(columns={'coluna_a': 'coluna_b', 'coluna_b': 'coluna_a'})
+        return pd.concat([pares, invertidos[pares.columns]], ignore_index=True).sort_values(by='correlacao', ascending=False)
@@ -0,0 +1,422 @@
+import os
+import glob
+import time
+import shutil
+import tempfile
+import warnings
+import numpy as np
+import pandas as pd
+from classes.Dataset import AnaliseDataset, _memorizar, TOLERANCIA_VARIANCIA
+from classes.Quantis import EsbocoDeQuantis
+from classes.InferenciaTipos import InferenciaDeTipos
+
+PREFIXO_ARQUIVO_EM_BLOCOS = 'datainsight_blocos_'
+
+class FonteEmBlocos:
+    """
+    Classe FonteEmBlocos
+
+    Esta classe representa um arquivo CSV em disco que é lido em blocos de linhas, sem que o arquivo inteiro seja
+    carregado na memória. Quando `inferir_tipos` é verdadeiro, os tipos são inferidos no primeiro bloco (veja
+    `InferenciaDeTipos`) e as mesmas conversões são aplicadas a cada bloco lido.
+
+    Exemplo de uso:
+        >>> fonte = FonteEmBlocos('dados.csv', sep=';', decimal=',', linhas_por_bloco=500000)
+        >>> for bloco in fonte.Blocos(colunas=['Valor']):
+        ...     print(bloco.shape)
+    """
+    def __init__(self, caminho: str, sep: str=',', decimal: str='.', linhas_por_bloco: int=500000, inferir_tipos: bool=False):
+        """
+        Inicializa a fonte.
+
+        Parâmetros:
+            caminho (str): Caminho do arquivo CSV.
+            sep (str, opcional): Separador de colunas.
+            decimal (str, opcional): Separador de decimais.
+            linhas_por_bloco (int, opcional): Quantidade de linhas de cada bloco.
+            inferir_tipos (bool, opcional): Se verdadeiro, infere datas, números em texto, booleanos e categorias.
+        """
+        self._caminho = caminho
+        self._sep = sep
+        self._decimal = decimal
+        self._linhasPorBloco = linhas_por_bloco
+        self._inferencia = InferenciaDeTipos(decimal=decimal) if inferir_tipos else None
+        self._amostra = None
+        self._configColunas = None
+
+    @property
+    def Caminho(self) -> str:
+        return self._caminho
+
+    @staticmethod
+    def GravarArquivo(arquivo, diretorio: str=None, tamanho_parte: int=16*1024*1024, validade: int=24*60*60) -> str:
+        """
+        Grava em disco o conteúdo de um arquivo aberto (por exemplo, o arquivo enviado ao Streamlit), copiando-o em 
+        partes para que o conteúdo inteiro nunca fique na memória.
+
+        O conteúdo é gravado em um arquivo temporário e renomeado apenas ao final da cópia, de modo que um arquivo 
+        incompleto nunca é usado. Arquivos de gravações anteriores com mais de `validade` segundos são removidos.
+
+        Parâmetros:
+            arquivo: Objeto de arquivo binário com os métodos `seek` e `read`.
+            diretorio (str, opcional): Diretório de destino. Se não for fornecido, usa o diretório temporário do sistema.
+            tamanho_parte (int, opcional): Quantidade de bytes copiados a cada vez.
+            validade (int, opcional): Idade, em segundos, a partir da qual os arquivos anteriores são removidos.
+
+        Retorna:
+            str: Caminho do arquivo gravado. Deve ser removido com `RemoverArquivo` quando não for mais usado.
+        """
+        diretorio = diretorio or tempfile.gettempdir()
+        limite = time.time() - validade
+        for caminhoAntigo in glob.glob(os.path.join(diretorio, f'{PREFIXO_ARQUIVO_EM_BLOCOS}*')):
+            try:
+                if os.path.getmtime(caminhoAntigo) < limite:
+                    os.remove(caminhoAntigo)
+            except OSError:
+                pass
+
+        descritor, caminhoTemporario = tempfile.mkstemp(dir=diretorio, prefix=PREFIXO_ARQUIVO_EM_BLOCOS, suffix='.csv.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as destino:
+                arquivo.seek(0)
+                shutil.copyfileobj(arquivo, destino, tamanho_parte)
+            caminho = caminhoTemporario[:-len('.tmp')]
+            os.replace(caminhoTemporario, caminho)
+        except BaseException:
+            if os.path.exists(caminhoTemporario):
+                os.remove(caminhoTemporario)
+            raise
+        return caminho
+
+    def RemoverArquivo(self):
+        """
+        Remove o arquivo da fonte do disco. A fonte não pode mais ser lida depois disso.
+        """
+        try:
+            os.remove(self._caminho)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def Amostra(self) -> pd.DataFrame:
+        """Primeiro bloco do arquivo, usado para preparar a configuração das colunas e para o preview."""
+        if self._amostra is None:
+            amostra = pd.read_csv(self._caminho, sep=self._sep, decimal=self._decimal, nrows=self._linhasPorBloco)
+            if self._inferencia is not None:
+                inferencia = self._inferencia.Aplicar(amostra)
+                self._amostra, self._configColunas = inferencia['dados'], inferencia['colunas']
+            else:
+                self._amostra, self._configColunas = amostra, AnaliseDataset(amostra).ConfigColunas
+        return self._amostra
+
+    @property
+    def ConfigColunas(self) -> pd.DataFrame:
+        """Configuração das colunas preparada a partir do primeiro bloco."""
+        if self._configColunas is None:
+            self.Amostra
+        return self._configColunas
+
+    def Blocos(self, colunas: list=None):
+        """
+        Percorre o arquivo em blocos.
+
+        Parâmetros:
+            colunas (list, opcional): Colunas a ler. Se não for fornecido, todas as colunas são lidas.
+
+        Retorna:
+            Iterador de pd.DataFrame, um para cada bloco de linhas.
+        """
+        with pd.read_csv(self._caminho, sep=self._sep, decimal=self._decimal, usecols=colunas,
+                         chunksize=self._linhasPorBloco) as leitor:
+            for bloco in leitor:
+                if self._inferencia is not None:
+                    bloco = self._inferencia.Converter(bloco)
+                yield bloco
+
+
+class AnaliseDatasetEmBlocos(AnaliseDataset):
+    """
+    Classe AnaliseDatasetEmBlocos
+
+    Esta classe oferece as análises de AnaliseDataset para arquivos maiores que a memória disponível. A propriedade
+    `Dados` contém apenas o primeiro bloco do arquivo (usado no preview e na configuração das colunas), enquanto
+    `PercentualValoresNulos`, `DistribuicaoDeFrequencia` (e `PrincipaisItens` e `PaginaDaFrequencia`),
+    `ConcentracaoDeItens`, `ResumoPorCategoria` (e o `TotalPorCategoria` obtido dele), `MatrizDeCorrelacao` (e as
+    correlações obtidas dela), `EstatisticaDescritiva`, `Histograma`, `ResumoBoxplot`, `DensidadeDispersao`,
+    `AmostraExtremos`, `SerieTemporal`, `PerfilTemporal` e `TabelaCruzada` (e a `MatrizDeConfusao` obtida dela)
+    percorrem o arquivo inteiro em blocos, combinando os resultados parciais de cada bloco. Os retornos têm o mesmo
+    formato dos métodos de AnaliseDataset.
+
+    As demais análises são calculadas sobre o primeiro bloco.
+
+    Para as estatísticas descritivas, os valores de cada grupo de colunas quantitativas são reunidos para o cálculo
+    exato dos quartis, com o arquivo percorrido uma vez por grupo. O grupo tem quantas colunas do arquivo inteiro
+    couberem em `LIMITE_BYTES_MATRIZ` (veja `AnaliseDataset.PerfilQuantitativo`). No modo
+    aproximado (`aproximado=True`), os quartis vêm de esboços de quantis construídos em uma única passagem pelo arquivo.
+    """
+    def __init__(self, fonte: FonteEmBlocos, configColunas: pd.DataFrame=None):
+        """
+        Inicializa a classe com a fonte em blocos e a configuração das colunas.
+
+        Parâmetros:
+            fonte (FonteEmBlocos): Arquivo a analisar.
+            configColunas (pd.DataFrame, opcional): Configuração das colunas. Se não for fornecida, é preparada a partir do primeiro bloco.
+        """
+        self._fonte = fonte
+        super().__init__(fonte.Amostra, configColunas)
+
+    @property
+    def Fonte(self) -> FonteEmBlocos:
+        return self._fonte
+
+    @property
+    def QuantidadeDeLinhas(self) -> int:
+        return self._contarLinhas()
+
+    @_memorizar
+    def _contarLinhas(self) -> int:
+        return sum(bloco.shape[0] for bloco in self._blocos(self.Colunas[:1]))
+
+    def _mesmaOrigem(self, anterior: AnaliseDataset, colunas_convertidas: list=None) -> bool:
+        return super()._mesmaOrigem(anterior, colunas_convertidas) and anterior.Fonte is self._fonte
+
+    def _blocos(self, colunas: list=None):
+        """
+        Percorre a fonte em blocos, convertendo as colunas para os tipos definidos na configuração das colunas.
+        """
+        for bloco in self._fonte.Blocos(colunas):
+            for coluna in bloco.columns:
+                tipo = self._configColunas.loc[coluna, 'TipoColuna']
+                if tipo == self._obterTipoDeDados(bloco[coluna].dtype) or (tipo == 'Data' and pd.api.types.is_datetime64_any_dtype(bloco[coluna])):
+                    continue
+                if tipo in ('Inteiro', 'Decimal'):
+                    bloco[coluna] = pd.to_numeric(bloco[coluna], errors='coerce')
+                elif tipo in ('Data', 'Data/Hora'):
+                    bloco[coluna] = pd.to_datetime(bloco[coluna], errors='coerce')
+                elif tipo == 'Texto':
+                    bloco[coluna] = bloco[coluna].astype('object')
+            yield bloco
+
+    def _contarNulos(self, colunas: list) -> dict:
+        """
+        Conta os valores nulos das colunas informadas em uma única passagem pelo arquivo, somando os nulos de cada bloco.
+        """
+        contagens = dict.fromkeys(colunas, 0)
+        for bloco in self._blocos(colunas):
+            for coluna, qtdNulos in bloco.isnull().sum().items():
+                contagens[coluna] += int(qtdNulos)
+        return contagens
+
+    @_memorizar
+    def _contagensPorCategoria(self, coluna: str) -> tuple:
+        """
+        Conta as ocorrências de cada valor distinto da coluna no arquivo inteiro, somando as contagens de cada bloco.
+        """
+        contagens = None
+        qtdNulos = 0
+        for bloco in self._blocos([coluna]):
+            contagensBloco = bloco[coluna].value_counts(sort=False)
+            contagens = contagensBloco if contagens is None else contagens.add(contagensBloco, fill_value=0)
+            qtdNulos += int(bloco[coluna].isnull().sum())
+
+        if contagens is None:
+            # arquivo sem linhas de dados
+            return pd.Index([]), np.empty(0, dtype='int64'), 0
+        return contagens.index, contagens.to_numpy(dtype='int64'), qtdNulos
+
+    def _contagensCruzadas(self, coluna1: str, coluna2: str) -> tuple:
+        """
+        Conta as combinações de valores de duas colunas no arquivo inteiro, somando as contagens de cada bloco, e 
+        fatora os valores das combinações encontradas (veja `AnaliseDataset._contagensCruzadas`).
+        """
+        parciais = [bloco.groupby([coluna1, coluna2], observed=True).size() for bloco in self._blocos([coluna1, coluna2])]
+        parciais = [parcial for parcial in parciais if len(parcial) > 0]
+        if len(parciais) == 0:
+            vazio = np.empty(0, dtype='int64')
+            return pd.Index([]), pd.Index([]), vazio, vazio, vazio
+
+        totais = pd.concat(parciais).groupby(level=[0, 1], observed=True).sum()
+        codigos1, categorias1 = pd.factorize(totais.index.get_level_values(0))
+        codigos2, categorias2 = pd.factorize(totais.index.get_level_values(1))
+        return pd.Index(categorias1), pd.Index(categorias2), codigos1.astype('int64'), codigos2.astype('int64'), totais.to_numpy(dtype='int64')
+
+    @_memorizar
+    def ResumoPorCategoria(self, coluna1: str, coluna2: str) -> pd.DataFrame:
+        """
+        Calcula a soma, a média, a contagem, o menor e o maior valor e o desvio-padrão de uma coluna quantitativa por 
+        categoria, combinando os totais parciais de cada bloco (os desvios-padrão são combinados pelas somas dos 
+        quadrados dos desvios de cada bloco).
+        """
+        self._validarPapel(coluna1, 'Qualitativa')
+        self._validarPapel(coluna2, 'Quantitativa')
+
+        totais = None
+        for bloco in self._blocos([coluna1, coluna2]):
+            parcial = bloco.groupby(coluna1, observed=True)[coluna2].agg(['sum', 'count', 'min', 'max', 'mean', 'var'])
+            parcial['m2'] = (parcial['var'] * (parcial['count'] - 1)).fillna(0.0)
+            parcial['mean'] = parcial['mean'].fillna(0.0)
+            if totais is None:
+                totais = parcial
+                continue
+            totais, parcial = totais.align(parcial, join='outer')
+            for nome in ['sum', 'count', 'm2', 'mean']:
+                totais[nome] = totais[nome].fillna(0.0)
+                parcial[nome] = parcial[nome].fillna(0.0)
+            contagem = totais['count'] + parcial['count']
+            delta = parcial['mean'] - totais['mean']
+            # combinação das médias e das somas dos quadrados dos desvios de duas partes (Chan et al.)
+            totais['m2'] = totais['m2'] + parcial['m2'] + delta ** 2 * totais['count'] * parcial['count'] / contagem.where(contagem > 0)
+            totais['mean'] = (totais['mean'] + delta * parcial['count'] / contagem.where(contagem > 0)).fillna(0.0)
+            totais['sum'] = totais['sum'] + parcial['sum']
+            totais['min'] = np.fmin(totais['min'], parcial['min'])
+            totais['max'] = np.fmax(totais['max'], parcial['max'])
+            totais['count'] = contagem
+
+        if totais is None:
+            return self._tabelaDoResumo(coluna1, pd.Index([]), *[np.empty(0)] * 5)
+        totais = totais.iloc[self._ordemDasCategorias(totais.index)]
+        contagem = totais['count'].to_numpy(dtype='int64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            desvioPadrao = np.where(contagem > 1, np.sqrt(totais['m2'].to_numpy(dtype='float64') / (contagem - 1)), np.nan)
+        return self._tabelaDoResumo(coluna1, totais.index, totais['sum'].to_numpy(dtype='float64'), contagem,
+                                    totais['min'].to_numpy(dtype='float64'), totais['max'].to_numpy(dtype='float64'), desvioPadrao)
+
+    @_memorizar
+    def MatrizDeCorrelacao(self) -> pd.DataFrame:
+        """
+        Calcula a matriz de correlação de Pearson das colunas quantitativas, acumulando as somas por par de colunas
+        em cada bloco (considerando, para cada par, apenas as linhas em que ambas as colunas são não nulas).
+        """
+        colunas = self.ColunasQuantitativas
+        if len(colunas) < 2:
+            return None
+
+        # os valores são deslocados pela média do primeiro bloco para reduzir erros de arredondamento
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            deslocamento = np.nan_to_num(np.nanmean(self.Dados[colunas].to_numpy(dtype='float64', na_value=np.nan), axis=0))
+        k = len(colunas)
+        n = np.zeros((k, k))
+        somaX = np.zeros((k, k))
+        somaXX = np.zeros((k, k))
+        somaXY = np.zeros((k, k))
+        for bloco in self._blocos(colunas):
+            matriz = bloco[colunas].to_numpy(dtype='float64', na_value=np.nan) - deslocamento
+            validos = (~np.isnan(matriz)).astype('float64')
+            matriz = np.nan_to_num(matriz)
+            n += validos.T @ validos
+            somaX += matriz.T @ validos
+            somaXX += (matriz ** 2).T @ validos
+            somaXY += matriz.T @ matriz
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariancia = somaXY - somaX * somaX.T / n
+            variancia = somaXX - somaX ** 2 / n
+            correlacao = covariancia / np.sqrt(variancia * variancia.T)
+        # colunas constantes no par deixam apenas resíduos de arredondamento na variância (veja `_correlacaoEntre`)
+        constantes = variancia <= TOLERANCIA_VARIANCIA * somaXX
+        correlacao[(n < 2) | constantes | constantes.T] = np.nan
+        correlacao = np.clip(correlacao, -1.0, 1.0)
+        np.fill_diagonal(correlacao, np.where(np.diag(constantes), np.nan, 1.0))
+
+        return pd.DataFrame(correlacao, index=colunas, columns=colunas)
+
+    def _blocosDeCorrelacao(self, colunas: list, metodo: str, tamanho_bloco: int):
+        """
+        Fornece a matriz de correlação calculada em uma única passagem pelo arquivo como um único bloco (veja 
+        `AnaliseDataset._blocosDeCorrelacao`). Apenas o método de Pearson é suportado, pois os postos do método de 
+        Spearman dependem da coluna inteira.
+        """
+        if metodo != 'Pearson':
+            raise Exception(f'O método de correlação {metodo} não é suportado no modo out-of-core.')
+        yield 0, 0, self.MatrizDeCorrelacao().loc[colunas, colunas].to_numpy()
+
+    def _correlacaoDoPar(self, coluna1: str, coluna2: str) -> float:
+        """
+        Obtém a correlação de um par de colunas da matriz de correlação, calculada em uma única passagem pelo arquivo.
+        """
+        return self.MatrizDeCorrelacao().loc[coluna1, coluna2]
+
+    def CorrelacaoComColunas(self, colunas: list) -> pd.DataFrame:
+        """
+        Obtém as linhas das colunas informadas na matriz de correlação, calculada em uma única passagem pelo arquivo.
+        """
+        for coluna in colunas:
+            self._validarPapel(coluna, 'Quantitativa')
+        matriz = self.MatrizDeCorrelacao()
+        if matriz is None:
+            # com uma única coluna quantitativa não há matriz de correlação
+            return pd.DataFrame(np.nan, index=colunas, columns=self.ColunasQuantitativas)
+        return matriz.loc[colunas]
+
+    def _matrizQuantitativa(self, colunas: list) -> np.ndarray:
+        """
+        Reúne os valores das colunas informadas de todos os blocos em uma matriz float64, lendo apenas essas colunas.
+        """
+        partes = [bloco[colunas].to_numpy(dtype='float64', na_value=np.nan) for bloco in self._blocos(colunas)]
+        if len(partes) == 0:
+            return np.empty((0, len(colunas)))
+        return np.concatenate(partes)
+
+    def _partesDasColunas(self, colunas: list):
+        """
+        Percorre os valores de colunas quantitativas bloco a bloco, lendo apenas essas colunas.
+        """
+        for bloco in self._blocos(colunas):
+            yield bloco[colunas].to_numpy(dtype='float64', na_value=np.nan)
+
+    def _partesDasDatas(self, coluna: str):
+        """
+        Percorre os valores de uma coluna de datas bloco a bloco, lendo apenas essa coluna.
+        """
+        for bloco in self._blocos([coluna]):
+            yield self._datasEmNanossegundos(bloco[coluna])
+
+    def _partesDaSerie(self, colunaData: str, colunaValor: str):
+        """
+        Percorre os pares (datas em nanossegundos, valores float64) bloco a bloco, lendo apenas as duas colunas.
+        """
+        for bloco in self._blocos([colunaData, colunaValor]):
+            yield self._datasEmNanossegundos(bloco[colunaData]), bloco[colunaValor].to_numpy(dtype='float64', na_value=np.nan)
+
+    def _linhasDasPosicoes(self, colunas: list, posicoes: np.ndarray) -> pd.DataFrame:
+        """
+        Obtém os valores das colunas informadas nas posições informadas, filtrando cada bloco.
+        """
+        partes = []
+        deslocamento = 0
+        for bloco in self._blocos(colunas):
+            noBloco = posicoes[(posicoes >= deslocamento) & (posicoes < deslocamento + bloco.shape[0])]
+            if len(noBloco) > 0:
+                partes.append(bloco[colunas].iloc[noBloco - deslocamento])
+            deslocamento += bloco.shape[0]
+        if len(partes) == 0:
+            return pd.DataFrame(columns=colunas)
+        return pd.concat(partes, ignore_index=True)
+
+    def _construirEsbocos(self, colunas: list, k: int, tamanho_bloco: int=None) -> dict:
+        """
+        Constrói os esboços de quantis das colunas informadas em uma única passagem pelo arquivo, atualizando os
+        esboços com os valores de cada bloco.
+        """
+        esbocos = {coluna: EsbocoDeQuantis(k) for coluna in colunas}
+        for bloco in self._blocos(colunas):
+            matriz = bloco[colunas].to_numpy(dtype='float64', na_value=np.nan)
+            for posicao, coluna in enumerate(colunas):
+                esbocos[coluna].Atualizar(matriz[:, posicao])
+        return esbocos
+
+    def _valoresForaDosLimites(self, coluna: str, lower_bound: float, upper_bound: float) -> pd.Series:
+        """
+        Retorna os valores da coluna fora dos limites informados, indexados pela posição da linha, filtrando cada bloco.
+        """
+        partes = [pd.Series([], dtype='float64', name=coluna)]
+        inicio = 0
+        for bloco in self._blocos([coluna]):
+            serie = bloco[coluna]
+            fora = ((serie < lower_bound) | (serie > upper_bound)).to_numpy(dtype=bool, na_value=False)
+            posicoes = np.flatnonzero(fora)
+            if len(posicoes) > 0:
+                partes.append(pd.Series(serie.iloc[posicoes].array, index=posicoes + inicio, name=coluna))
+            inicio += len(serie)
+        return pd.concat(partes[1:]) if len(partes) > 1 else partes[0]
@@ -0,0 +1,364 @@
+import io
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from classes.Dataset import AnaliseDataset
+from classes.InferenciaTipos import InferenciaDeTipos
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+
+class _LeitorComContagem(io.RawIOBase):
+    """
+    Envolve um arquivo binário contabilizando a quantidade de bytes lidos, para acompanhar o progresso da importação.
+    """
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+        self.BytesLidos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        dados = self._arquivo.read(len(buffer))
+        quantidade = len(dados)
+        buffer[:quantidade] = dados
+        self.BytesLidos += quantidade
+        return quantidade
+
+
+class ImportadorCSV:
+    """
+    Classe ImportadorCSV
+
+    Esta classe importa um arquivo CSV em blocos, em uma thread em segundo plano, informando o progresso
+    (bytes e linhas processados) e permitindo o cancelamento. A configuração das colunas é preparada a partir
+    do primeiro bloco, de modo que o preview pode ser apresentado antes do término da importação.
+
+    Quando o pyarrow está instalado, os blocos são lidos pelo leitor de CSV do pyarrow (multithread); caso
+    contrário, ou se o pyarrow não conseguir interpretar o arquivo, é usado o leitor C do pandas.
+
+    Ao final, os tipos das colunas importadas como texto são inferidos a partir de uma amostra (veja
+    `InferenciaDeTipos`), a menos que `inferir_tipos` seja falso.
+
+    Exemplo de uso:
+        >>> importador = ImportadorCSV(open('dados.csv', 'rb'), sep=';', decimal=',')
+        >>> importador.Iniciar()
+        >>> importador.Aguardar()
+        >>> importador.Status
+        'Concluído'
+        >>> importador.Dados.shape
+        (1000000, 12)
+    """
+    def __init__(self, arquivo, sep: str=',', decimal: str='.', tamanho_bloco: int=16 * 1024 * 1024, motor: str=None,
+                 inferir_tipos: bool=True):
+        """
+        Inicializa o importador.
+
+        Parâmetros:
+            arquivo: Arquivo binário a importar (ex.: o retorno de st.file_uploader). O arquivo passa a ser lido
+                exclusivamente pelo importador e não deve ser usado por outro código durante a importação.
+            sep (str, opcional): Separador de colunas.
+            decimal (str, opcional): Separador de decimais.
+            tamanho_bloco (int, opcional): Tamanho aproximado, em bytes, de cada bloco lido.
+            motor (str, opcional): 'pyarrow' ou 'c'. Se não for fornecido, usa o pyarrow quando estiver disponível.
+            inferir_tipos (bool, opcional): Se verdadeiro, infere datas, números em texto, booleanos e categorias.
+        """
+        self._arquivo = arquivo
+        self._sep = sep
+        self._decimal = decimal
+        self._tamanhoBloco = tamanho_bloco
+        self._motor = motor if motor is not None else ('pyarrow' if pacsv is not None else 'c')
+        self._inferirTipos = inferir_tipos
+        self._inferencia = None
+
+        self._arquivo.seek(0, io.SEEK_END)
+        self._tamanhoArquivo = self._arquivo.tell()
+        self._arquivo.seek(0)
+
+        self._leitor = None
+        self._linhas = 0
+        self._primeiroBloco = None
+        self._configColunas = None
+        self._dados = None
+        self._erro = None
+        self._status = 'Aguardando'
+        self._cancelar = threading.Event()
+        self._thread = None
+
+    @property
+    def Status(self) -> str:
+        """Situação da importação: Aguardando, Importando, Concluído, Cancelado ou Erro."""
+        return self._status
+
+    @property
+    def Motor(self) -> str:
+        return self._motor
+
+    @property
+    def TamanhoArquivo(self) -> int:
+        return self._tamanhoArquivo
+
+    @property
+    def BytesProcessados(self) -> int:
+        return self._leitor.BytesLidos if self._leitor is not None else 0
+
+    @property
+    def LinhasProcessadas(self) -> int:
+        return self._linhas
+
+    @property
+    def Progresso(self) -> float:
+        """Fração (entre 0 e 1) do arquivo já processada."""
+        if self._status == 'Concluído' or self._tamanhoArquivo == 0:
+            return 1.0
+        return min(self.BytesProcessados / self._tamanhoArquivo, 1.0)
+
+    @property
+    def PrimeiroBloco(self) -> pd.DataFrame:
+        """Primeiro bloco lido, disponível assim que ele for processado (None até lá)."""
+        return self._primeiroBloco
+
+    @property
+    def ConfigColunas(self) -> pd.DataFrame:
+        """Configuração das colunas (do primeiro bloco durante a importação e do arquivo completo ao final)."""
+        return self._configColunas
+
+    @property
+    def Dados(self) -> pd.DataFrame:
+        """DataFrame completo, disponível quando o Status for 'Concluído'."""
+        return self._dados
+
+    @property
+    def Erro(self) -> Exception:
+        return self._erro
+
+    @property
+    def Inferencia(self) -> pd.DataFrame:
+        """Relatório da inferência de tipos (veja `InferenciaDeTipos.Aplicar`), disponível ao final da importação."""
+        return self._inferencia
+
+    def Iniciar(self):
+        """
+        Inicia a importação em uma thread em segundo plano.
+        """
+        self._status = 'Importando'
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def Cancelar(self):
+        """
+        Solicita o cancelamento da importação. A leitura é interrompida ao final do bloco em andamento.
+        """
+        self._cancelar.set()
+
+    def Aguardar(self, timeout: float=None):
+        """
+        Aguarda o término da importação.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _executar(self):
+        try:
+            if self._motor == 'pyarrow':
+                try:
+                    dados = self._lerComPyarrow()
+                except pa.ArrowInvalid:
+                    # tipos inconsistentes entre blocos ou formato não suportado: reinicia com o leitor do pandas
+                    self._motor = 'c'
+                    self._linhas = 0
+                    self._primeiroBloco = None
+                    dados = self._lerComPandas()
+            else:
+                dados = self._lerComPandas()
+
+            if self._cancelar.is_set():
+                self._status = 'Cancelado'
+                return
+
+            # os tipos finais podem diferir dos inferidos no primeiro bloco (ex.: inteiros com nulos em blocos seguintes)
+            if self._inferirTipos:
+                inferencia = InferenciaDeTipos(decimal=self._decimal).Aplicar(dados)
+                self._dados = inferencia['dados']
+                self._configColunas = inferencia['colunas']
+                self._inferencia = inferencia['relatorio']
+            else:
+                self._dados = dados
+                self._configColunas = AnaliseDataset(dados).ConfigColunas
+            self._status = 'Concluído'
+        except Exception as erro:
+            self._erro = erro
+            self._status = 'Erro'
+
+    def _registrarPrimeiroBloco(self, bloco: pd.DataFrame):
+        self._primeiroBloco = bloco
+        self._configColunas = AnaliseDataset(bloco).ConfigColunas
+
+    def _lerComPandas(self) -> pd.DataFrame:
+        self._arquivo.seek(0)
+        self._leitor = _LeitorComContagem(self._arquivo)
+
+        # estima a quantidade de linhas por bloco a partir do tamanho médio das primeiras linhas
+        amostra = self._arquivo.read(64 * 1024)
+        self._arquivo.seek(0)
+        tamanhoLinha = max(1, len(amostra) // max(1, amostra.count(b'\n')))
+        linhasPorBloco = max(1000, self._tamanhoBloco // tamanhoLinha)
+
+        blocos = []
+        with pd.read_csv(io.BufferedReader(self._leitor), sep=self._sep, decimal=self._decimal,
+                         chunksize=linhasPorBloco, engine='c') as leitor:
+            for bloco in leitor:
+                blocos.append(bloco)
+                if self._primeiroBloco is None:
+                    self._registrarPrimeiroBloco(bloco)
+                self._linhas += bloco.shape[0]
+                if self._cancelar.is_set():
+                    return None
+
+        if len(blocos) == 0:
+            return self._primeiroBloco
+        return pd.concat(blocos, ignore_index=True)
+
+    def _lerComPyarrow(self) -> pd.DataFrame:
+        self._arquivo.seek(0)
+        self._leitor = _LeitorComContagem(self._arquivo)
+
+        leitor = pacsv.open_csv(
+            self._leitor,
+            read_options=pacsv.ReadOptions(block_size=self._tamanhoBloco, use_threads=True),
+            parse_options=pacsv.ParseOptions(delimiter=self._sep),
+            convert_options=pacsv.ConvertOptions(decimal_point=self._decimal, strings_can_be_null=True),
+        )
+
+        lotes = []
+        for lote in leitor:
+            lotes.append(lote)
+            if self._primeiroBloco is None:
+                self._registrarPrimeiroBloco(lote.to_pandas(date_as_object=False, coerce_temporal_nanoseconds=True))
+            self._linhas += lote.num_rows
+            if self._cancelar.is_set():
+                return None
+
+        tabela = pa.Table.from_batches(lotes, schema=leitor.schema)
+        del lotes
+        return tabela.to_pandas(date_as_object=False, coerce_temporal_nanoseconds=True, split_blocks=True, self_destruct=True)
+
+
+class CacheDeImportacao:
+    """
+    Classe CacheDeImportacao
+
+    Esta classe mantém os DataFrames já importados, indexados por (hash do conteúdo do arquivo, separador de colunas,
+    separador de decimais), para que o mesmo arquivo não seja interpretado novamente. Os itens menos usados
+    recentemente são descartados quando a memória ocupada ultrapassa o limite configurado.
+
+    Exemplo de uso:
+        >>> cache = CacheDeImportacao(limite_bytes=512 * 1024 * 1024)
+        >>> chave = (cache.HashDoConteudo(arquivo), ';', ',')
+        >>> if cache.Obter(chave) is None:
+        ...     cache.Armazenar(chave, dados, configColunas)
+        >>> dados, configColunas = cache.Obter(chave)
+    """
+    def __init__(self, limite_bytes: int=1024 * 1024 * 1024):
+        """
+        Inicializa o cache.
+
+        Parâmetros:
+            limite_bytes (int, opcional): Memória máxima (medida com memory_usage(deep=True)) ocupada pelos DataFrames armazenados.
+        """
+        self._limiteBytes = limite_bytes
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._hashPorArquivo = {}
+
+    @property
+    def MemoriaEmBytes(self) -> int:
+        return self._bytes
+
+    @property
+    def QuantidadeDeItens(self) -> int:
+        return len(self._itens)
+
+    def HashDoConteudo(self, arquivo) -> str:
+        """
+        Calcula o hash (BLAKE2b) do conteúdo do arquivo.
+
+        Para arquivos do st.file_uploader, o hash é guardado pelo `file_id`, de modo que o conteúdo é percorrido 
+        apenas uma vez por envio.
+
+        Parâmetros:
+            arquivo: Arquivo binário.
+
+        Retorna:
+            str: Hash do conteúdo em hexadecimal.
+        """
+        idArquivo = getattr(arquivo, 'file_id', None)
+        if idArquivo is not None and idArquivo in self._hashPorArquivo:
+            return self._hashPorArquivo[idArquivo]
+
+        impressao = hashlib.blake2b(digest_size=32)
+        if hasattr(arquivo, 'getbuffer'):
+            impressao.update(arquivo.getbuffer())
+        else:
+            posicao = arquivo.tell()
+            arquivo.seek(0)
+            for parte in iter(lambda: arquivo.read(8 * 1024 * 1024), b''):
+                impressao.update(parte)
+            arquivo.seek(posicao)
+
+        hashConteudo = impressao.hexdigest()
+        if idArquivo is not None:
+            self._hashPorArquivo[idArquivo] = hashConteudo
+        return hashConteudo
+
+    def Obter(self, chave: tuple):
+        """
+        Obtém um item do cache, marcando-o como usado recentemente.
+
+        Parâmetros:
+            chave (tuple): (hash do conteúdo, separador de colunas, separador de decimais).
+
+        Retorna:
+            tuple: (dados, configColunas), ou None se a chave não estiver no cache. Os DataFrames retornados são 
+            cópias rasas, de modo que substituir colunas neles não altera o item armazenado.
+        """
+        if chave not in self._itens:
+            return None
+        self._itens.move_to_end(chave)
+        dados, configColunas, _ = self._itens[chave]
+        return dados.copy(deep=False), configColunas.copy()
+
+    def Armazenar(self, chave: tuple, dados: pd.DataFrame, configColunas: pd.DataFrame):
+        """
+        Armazena um DataFrame importado, descartando os itens menos usados recentemente se o limite de memória for ultrapassado.
+
+        Parâmetros:
+            chave (tuple): (hash do conteúdo, separador de colunas, separador de decimais).
+            dados (pd.DataFrame): DataFrame importado.
+            configColunas (pd.DataFrame): Configuração das colunas do DataFrame importado.
+        """
+        self.Remover(chave)
+        tamanho = int(dados.memory_usage(deep=True).sum())
+        if tamanho > self._limiteBytes:
+            return
+
+        self._itens[chave] = (dados.copy(deep=False), configColunas.copy(), tamanho)
+        self._bytes += tamanho
+        while self._bytes > self._limiteBytes:
+            _, (_, _, tamanhoDescartado) = self._itens.popitem(last=False)
+            self._bytes -= tamanhoDescartado
+
+    def Remover(self, chave: tuple):
+        """
+        Remove um item do cache, se existir.
+        """
+        if chave in self._itens:
+            _, _, tamanho = self._itens.pop(chave)
+            self._bytes -= tamanho
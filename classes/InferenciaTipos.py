@@ -0,0 +1,228 @@
+import re
+import numpy as np
+import pandas as pd
+from classes.Dataset import AnaliseDataset, _posicoesDaAmostra
+
+
+# formatos testados na detecção de datas, em ordem de preferência (dia antes do mês em datas ambíguas)
+FORMATOS_DATA = [
+    '%Y-%m-%d', '%d/%m/%Y', '%Y/%m/%d', '%d-%m-%Y', '%d.%m.%Y', '%m/%d/%Y',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%d %H:%M',
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M',
+]
+
+# pares de valores reconhecidos como booleanos (comparados em minúsculas)
+VALORES_BOOLEANOS = [
+    {'true', 'false'}, {'verdadeiro', 'falso'}, {'sim', 'não'}, {'sim', 'nao'}, {'s', 'n'}, {'yes', 'no'}, {'y', 'n'}, {'t', 'f'},
+]
+
+
+class InferenciaDeTipos:
+    """
+    Classe InferenciaDeTipos
+
+    Esta classe infere, a partir de uma amostra de linhas, o tipo das colunas importadas como texto e converte cada
+    coluna detectada, em uma única passagem, para o tipo de dados mais econômico que a representa corretamente:
+
+        - Datas e datas/horas em texto (com o formato detectado) são convertidas para datetime64.
+        - Números em texto com separador de milhar são convertidos para int64/Int64 ou float64 (colunas detectadas
+          como inteiras na amostra, mas com valores fracionários fora dela, são convertidas para float64).
+        - Colunas booleanas (ex.: 'Sim'/'Não', 'true'/'false') e colunas de baixa cardinalidade são convertidas para
+          categorias, mantendo os valores originais.
+        - Colunas datetime64 cujos valores não possuem horário são configuradas como Data.
+
+    Uma coluna só é convertida se todos os seus valores não nulos forem convertidos; caso contrário, ela é mantida
+    como está. Códigos numéricos com zeros à esquerda (ex.: CEP) não são tratados como números.
+
+    Exemplo de uso:
+        >>> inferencia = InferenciaDeTipos(decimal=',')
+        >>> resultado = inferencia.Aplicar(dados)
+        >>> resultado['relatorio']
+                 NomeColuna TipoDeDadosAntes Deteccao     Formato TipoDeDadosDepois TipoColuna
+        Emissao     Emissao           object     Data    %d/%m/%Y    datetime64[ns]       Data
+        Valor         Valor           object  Decimal  1.234,56         float64    Decimal
+        >>> dados, configColunas = resultado['dados'], resultado['colunas']
+    """
+    def __init__(self, decimal: str='.', tamanho_amostra: int=1000, limite_categorias: float=0.05):
+        """
+        Inicializa a inferência.
+
+        Parâmetros:
+            decimal (str, opcional): Separador de decimais do arquivo. O separador de milhar é o outro entre '.' e ','.
+            tamanho_amostra (int, opcional): Quantidade de linhas igualmente espaçadas usadas na detecção.
+            limite_categorias (float, opcional): Proporção máxima de valores distintos na amostra para que uma coluna
+                de texto seja convertida para categoria.
+        """
+        self._decimal = decimal
+        self._milhar = '.' if decimal == ',' else ','
+        self._tamanhoAmostra = tamanho_amostra
+        self._limiteCategorias = limite_categorias
+        self._deteccoes = {}
+
+        numero = rf'[+-]?(?:\d{{1,3}}(?:{re.escape(self._milhar)}\d{{3}})+|\d+)'
+        self._padraoInteiro = re.compile(rf'^{numero}$')
+        self._padraoDecimal = re.compile(rf'^{numero}(?:{re.escape(decimal)}\d+)?$')
+        self._padraoZeroAEsquerda = re.compile(r'^[+-]?0\d')
+
+    @property
+    def Deteccoes(self) -> dict:
+        """Detecções da última chamada de `Aplicar`, no formato {nome da coluna: (detecção, formato)}."""
+        return self._deteccoes
+
+    def Detectar(self, dados: pd.DataFrame) -> dict:
+        """
+        Detecta o tipo das colunas a partir de uma amostra de linhas igualmente espaçadas.
+
+        Parâmetros:
+            dados (pd.DataFrame): Dados importados.
+
+        Retorna:
+            dict: Dicionário {nome da coluna: (detecção, formato)}, apenas para as colunas detectadas. A detecção é
+                'Data', 'Data/Hora', 'Inteiro', 'Decimal', 'Booleano' ou 'Categoria'; o formato é o formato da data
+                (ex.: '%d/%m/%Y') ou None.
+        """
+        if dados.shape[0] == 0:
+            return {}
+
+        amostra = dados.iloc[_posicoesDaAmostra(dados.shape[0], self._tamanhoAmostra)]
+        deteccoes = {}
+        for coluna in dados.columns:
+            serie = amostra[coluna]
+            if pd.api.types.is_datetime64_any_dtype(serie):
+                if (serie.dropna() == serie.dropna().dt.normalize()).all():
+                    deteccoes[coluna] = ('Data', None)
+            elif pd.api.types.is_bool_dtype(serie):
+                deteccoes[coluna] = ('Booleano', None)
+            elif pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+                deteccao = self._detectarTexto(serie.dropna().astype('str').str.strip())
+                if deteccao is not None:
+                    deteccoes[coluna] = deteccao
+        return deteccoes
+
+    def _detectarTexto(self, valores: pd.Series) -> tuple:
+        if len(valores) == 0:
+            return None
+
+        minusculos = set(valores.str.lower().unique())
+        if any(minusculos <= par for par in VALORES_BOOLEANOS):
+            return ('Booleano', None)
+
+        if not valores.str.match(self._padraoZeroAEsquerda).any():
+            if valores.str.match(self._padraoInteiro).all():
+                return ('Inteiro', None)
+            if valores.str.match(self._padraoDecimal).all():
+                return ('Decimal', None)
+
+        for formato in FORMATOS_DATA:
+            if pd.to_datetime(valores, format=formato, errors='coerce').notnull().all():
+                return ('Data/Hora' if '%H' in formato else 'Data', formato)
+
+        if valores.nunique() <= max(1, self._limiteCategorias * len(valores)):
+            return ('Categoria', None)
+        return None
+
+    def Converter(self, dados: pd.DataFrame, deteccoes: dict=None, incluir_categorias: bool=False) -> pd.DataFrame:
+        """
+        Converte as colunas detectadas, transformando em nulos os valores que não puderem ser convertidos.
+
+        Útil para converter os blocos seguintes de um arquivo com as detecções feitas no primeiro bloco. Em colunas
+        detectadas como inteiras, um bloco com valores fracionários é convertido para float64, sem perder a fração.
+
+        Parâmetros:
+            dados (pd.DataFrame): Dados a converter (não são alterados).
+            deteccoes (dict, opcional): Detecções a aplicar. Se não for fornecido, usa `Deteccoes`.
+            incluir_categorias (bool, opcional): Se verdadeiro, também converte as colunas booleanas e categóricas.
+
+        Retorna:
+            pd.DataFrame: Cópia rasa dos dados com as colunas convertidas.
+        """
+        if deteccoes is None:
+            deteccoes = self._deteccoes
+
+        convertidos = dados.copy(deep=False)
+        for coluna, (deteccao, formato) in deteccoes.items():
+            if coluna in convertidos.columns and (incluir_categorias or deteccao not in ('Booleano', 'Categoria')):
+                convertidos[coluna] = self._converterColuna(convertidos[coluna], deteccao, formato)
+        return convertidos
+
+    def _converterColuna(self, serie: pd.Series, deteccao: str, formato: str) -> pd.Series:
+        if deteccao in ('Booleano', 'Categoria'):
+            return serie.astype('category')
+        if deteccao in ('Data', 'Data/Hora'):
+            if pd.api.types.is_datetime64_any_dtype(serie):
+                return serie
+            return pd.to_datetime(serie, format=formato, errors='coerce')
+
+        texto = serie.astype('str').str.strip().str.replace(self._milhar, '', regex=False)
+        if self._decimal != '.':
+            texto = texto.str.replace(self._decimal, '.', regex=False)
+        numeros = pd.to_numeric(texto.where(serie.notnull()), errors='coerce')
+        if deteccao == 'Inteiro' and self._saoInteiros(numeros.dropna()):
+            return numeros.astype('Int64' if numeros.isnull().any() else 'int64')
+        # a detecção de inteiros vem da amostra: valores com parte fracionária fora dela mantêm a coluna como decimal
+        return numeros.astype('float64')
+
+    @staticmethod
+    def _saoInteiros(valores: pd.Series) -> bool:
+        if pd.api.types.is_integer_dtype(valores):
+            return len(valores) == 0 or valores.max() <= np.iinfo('int64').max
+        with np.errstate(invalid='ignore'):
+            return bool((np.isfinite(valores) & (valores % 1 == 0) & (valores.abs() < 2.0 ** 63)).all())
+
+    def Aplicar(self, dados: pd.DataFrame) -> dict:
+        """
+        Detecta os tipos na amostra e converte as colunas detectadas. Colunas em que algum valor não nulo não pode ser
+        convertido são mantidas como estão.
+
+        Parâmetros:
+            dados (pd.DataFrame): Dados importados (não são alterados).
+
+        Retorna:
+            dict: Dicionário contendo:
+                'dados': Cópia rasa dos dados, com as colunas detectadas convertidas.
+                'colunas': Configuração das colunas (TipoColuna e ClassifColuna preenchidos, inclusive Data e Data/Hora).
+                'relatorio': DataFrame com uma linha por coluna detectada e as colunas 'NomeColuna',
+                    'TipoDeDadosAntes', 'Deteccao', 'Formato', 'TipoDeDadosDepois' e 'TipoColuna' (None quando a
+                    conversão foi descartada).
+        """
+        deteccoes = self.Detectar(dados)
+        convertidos = dados.copy(deep=False)
+        linhas = []
+        for coluna, (deteccao, formato) in list(deteccoes.items()):
+            serie = dados[coluna]
+            convertida = self._converterColuna(serie, deteccao, formato)
+            if deteccao == 'Categoria' and len(convertida.cat.categories) > 0.5 * len(convertida):
+                # a amostra indicou baixa cardinalidade, mas a coluna completa possui muitos valores distintos
+                convertida = None
+            elif (convertida.isnull() & serie.notnull()).any():
+                convertida = None
+            elif deteccao == 'Inteiro' and pd.api.types.is_float_dtype(convertida):
+                # a coluna completa possui valores com parte fracionária; os blocos seguintes também são decimais
+                deteccao = 'Decimal'
+                deteccoes[coluna] = (deteccao, formato)
+
+            if convertida is None:
+                del deteccoes[coluna]
+                linhas.append([coluna, str(serie.dtype), deteccao, formato, str(serie.dtype), None])
+                continue
+            convertidos[coluna] = convertida
+            linhas.append([coluna, str(serie.dtype), deteccao, formato, str(convertida.dtype), None])
+
+        self._deteccoes = deteccoes
+        configColunas = AnaliseDataset(convertidos).ConfigColunas
+        for coluna, (deteccao, _) in deteccoes.items():
+            if deteccao == 'Data':
+                configColunas.loc[coluna, 'TipoColuna'] = 'Data'
+        # reclassifica as colunas após os ajustes de Data
+        configColunas = AnaliseDataset(convertidos, configColunas).ConfigColunas
+
+        relatorio = pd.DataFrame(data=linhas, columns=['NomeColuna', 'TipoDeDadosAntes', 'Deteccao', 'Formato', 'TipoDeDadosDepois', 'TipoColuna'],
+                                 index=pd.Index([linha[0] for linha in linhas], dtype='object'))
+        detectadas = relatorio['NomeColuna'].isin(list(deteccoes.keys()))
+        relatorio.loc[detectadas, 'TipoColuna'] = configColunas.loc[relatorio.loc[detectadas, 'NomeColuna'], 'TipoColuna'].to_numpy()
+
+        return {
+            'dados': convertidos,
+            'colunas': configColunas,
+            'relatorio': relatorio,
+        }
@@ -0,0 +1,174 @@
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from classes.Dataset import AnaliseDataset
+
+
+# 'Coluna Relacionada' registra a outra coluna de que o insight depende (ex.: a outra coluna de uma correlação)
+COLUNAS_INSIGHTS = ['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor', 'Coluna Relacionada']
+
+
+def _insightsDasColunas(analise: AnaliseDataset, colunas: list, aproximado: bool, metodo_outliers: str='DIQ', 
+                        multiplicador_outliers: float=None) -> list:
+    """
+    Calcula os insights de percentual de nulos, concentração de itens e outliers de um grupo de colunas.
+
+    Retorna:
+        list: Lista de linhas no formato de `COLUNAS_INSIGHTS`.
+    """
+    linhas = []
+    # uma única contagem para o grupo (no modo out-of-core, uma única passagem pelo arquivo); os percentuais de cada 
+    # coluna são obtidos das contagens já armazenadas
+    analise.NulosPorColuna(colunas)
+    for coluna in colunas:
+        nulos = analise.PercentualValoresNulos(coluna)
+        linhas.append([coluna, 'Percentual de Nulos', nulos['texto'], nulos['valor'], None])
+
+    qualitativas = [coluna for coluna in colunas if analise.PapelDaColuna(coluna) == 'Qualitativa']
+    if len(qualitativas) > 0:
+        concentracao = analise.ConcentracaoDeItensPorColuna(qualitativas)
+        for coluna, texto, valor in zip(concentracao['NomeColuna'], concentracao['texto'], concentracao['valor']):
+            linhas.append([coluna, 'Concentração de Itens', texto, valor, None])
+
+    quantitativas = [coluna for coluna in colunas if analise.PapelDaColuna(coluna) == 'Quantitativa']
+    if len(quantitativas) > 0:
+        # uma única chamada para todas as colunas quantitativas do grupo
+        resumo = analise.DeteccaoDeOutliers(quantitativas, metodo_outliers, multiplicador_outliers, aproximado)['resumo']
+        for coluna, qtdOutliers in resumo['QtdOutliers'].items():
+            linhas.append([coluna, 'Outliers', f'〽️ Outliers: {qtdOutliers}', qtdOutliers, None])
+
+    return linhas
+
+
+def _insightsDeCorrelacao(analise: AnaliseDataset, valor_base_correlacao: float) -> list:
+    """
+    Calcula os insights de correlação relevante entre as colunas quantitativas.
+
+    Retorna:
+        list: Lista de linhas no formato de `COLUNAS_INSIGHTS`.
+    """
+    dfCorrelacoes = analise.CorrelacoesRelevantes(valor_base_correlacao)
+    if dfCorrelacoes is None:
+        return []
+
+    return [_linhaDeCorrelacao(colunaA, colunaB, correlacao)
+            for colunaA, colunaB, correlacao in zip(dfCorrelacoes['coluna_a'], dfCorrelacoes['coluna_b'], dfCorrelacoes['correlacao'])]
+
+
+def _insightsDeCorrelacaoDasColunas(analise: AnaliseDataset, colunas: list, valor_base_correlacao: float) -> list:
+    """
+    Calcula apenas os insights de correlação relevante que envolvem as colunas informadas, nos dois sentidos 
+    (coluna informada com as demais e demais com a coluna informada).
+
+    Retorna:
+        list: Lista de linhas no formato de `COLUNAS_INSIGHTS`.
+    """
+    linhas = []
+    dfCorrelacoes = analise.CorrelacaoComColunas(colunas)
+    for coluna, correlacoes in dfCorrelacoes.iterrows():
+        relevantes = correlacoes[((correlacoes <= -valor_base_correlacao) | (correlacoes >= valor_base_correlacao)) & (correlacoes.index != coluna)]
+        for outra, correlacao in relevantes.items():
+            linhas.append(_linhaDeCorrelacao(coluna, outra, correlacao))
+            if outra not in colunas:
+                # quando as duas colunas estão na lista, o outro sentido é gerado pela linha da outra coluna
+                linhas.append(_linhaDeCorrelacao(outra, coluna, correlacao))
+    return linhas
+
+
+def _linhaDeCorrelacao(colunaA: str, colunaB: str, correlacao: float) -> list:
+    return [colunaA, 'Correlação', f'📈 Correlação com {colunaB} ({correlacao})', correlacao, colunaB]
+
+
+class GeradorDeInsights:
+    """
+    Classe GeradorDeInsights
+
+    Esta classe calcula os insights de um dataset (percentual de nulos, concentração de itens, outliers e correlações
+    relevantes) distribuindo os grupos de colunas entre as tarefas de um pool de threads. As correlações são 
+    calculadas em uma tarefa própria, ao mesmo tempo que as análises por coluna.
+
+    As operações do pandas e do numpy liberam o GIL durante os cálculos, de modo que as threads avançam em paralelo 
+    sem copiar os dados. Os resultados ficam armazenados na própria instância de AnaliseDataset e são reaproveitados 
+    pelas demais páginas.
+
+    Quando são informados os insights e as assinaturas das colunas de uma geração anterior, apenas as colunas cuja 
+    assinatura mudou são recalculadas (junto com as correlações que as envolvem); os demais insights são reaproveitados.
+
+    Exemplo de uso:
+        >>> gerador = GeradorDeInsights(max_workers=8)
+        >>> dfInsights = gerador.Gerar(AnaliseDataset(dados))
+        >>> dfInsights.columns.to_list()
+        ['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor', 'Coluna Relacionada']
+        >>> # após alterar o tipo de uma coluna
+        >>> dfInsights = gerador.Gerar(AnaliseDataset(dados_ajustados), anteriores=dfInsights, assinaturas_anteriores=assinaturas)
+    """
+    def __init__(self, max_workers: int=None, colunas_por_tarefa: int=None):
+        """
+        Inicializa o gerador.
+
+        Parâmetros:
+            max_workers (int, opcional): Quantidade máxima de threads. Se não for fornecida, usa a quantidade de 
+                processadores.
+            colunas_por_tarefa (int, opcional): Quantidade de colunas de cada tarefa. Se não for fornecida, as colunas
+                são divididas em cerca de quatro tarefas por worker.
+        """
+        self._maxWorkers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._colunasPorTarefa = colunas_por_tarefa
+
+    @property
+    def MaxWorkers(self) -> int:
+        return self._maxWorkers
+
+    def Gerar(self, analise: AnaliseDataset, aproximado: bool=False, valor_base_correlacao: float=0.7, 
+              anteriores: pd.DataFrame=None, assinaturas_anteriores: dict=None, metodo_outliers: str='DIQ', 
+              multiplicador_outliers: float=None) -> pd.DataFrame:
+        """
+        Calcula os insights do dataset.
+
+        Parâmetros:
+            analise (AnaliseDataset): Análise do dataset.
+            aproximado (bool, opcional): Se verdadeiro, os outliers da regra 'DIQ' são estimados com esboços de quantis.
+            valor_base_correlacao (float, opcional): Correlação mínima (em valor absoluto) considerada relevante.
+            anteriores (pd.DataFrame, opcional): Insights de uma geração anterior, calculados com as mesmas opções.
+            assinaturas_anteriores (dict, opcional): `AssinaturasDasColunas` da análise usada na geração anterior.
+            metodo_outliers (str, opcional): Regra de identificação de outliers (veja `AnaliseDataset.DeteccaoDeOutliers`).
+            multiplicador_outliers (float, opcional): Multiplicador da regra. Se não for fornecido, usa o padrão da regra.
+
+        Retorna:
+            pd.DataFrame: DataFrame com as colunas 'Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor' e 
+                'Coluna Relacionada', ordenado pelo nome da coluna e pelo tipo de informação.
+        """
+        assinaturas = analise.AssinaturasDasColunas
+        if anteriores is None or assinaturas_anteriores is None:
+            colunas = analise.Colunas
+            mantidos = None
+        else:
+            colunas = [coluna for coluna in analise.Colunas if assinaturas_anteriores.get(coluna) != assinaturas[coluna]]
+            # insights de colunas alteradas ou removidas, ou que dependem delas, são descartados
+            obsoletas = set(colunas) | (set(assinaturas_anteriores) - set(assinaturas))
+            mantidos = anteriores[~anteriores['Nome da Coluna'].isin(obsoletas) & ~anteriores['Coluna Relacionada'].isin(obsoletas)]
+
+        tamanhoGrupo = self._colunasPorTarefa or max(1, math.ceil(len(colunas) / (self._maxWorkers * 4)))
+        grupos = [colunas[inicio:inicio + tamanhoGrupo] for inicio in range(0, len(colunas), tamanhoGrupo)]
+        quantitativasAlteradas = [coluna for coluna in colunas if analise.PapelDaColuna(coluna) == 'Quantitativa']
+
+        with ThreadPoolExecutor(max_workers=self._maxWorkers) as pool:
+            if mantidos is None:
+                tarefaCorrelacao = pool.submit(_insightsDeCorrelacao, analise, valor_base_correlacao)
+            elif len(quantitativasAlteradas) > 0:
+                tarefaCorrelacao = pool.submit(_insightsDeCorrelacaoDasColunas, analise, quantitativasAlteradas, valor_base_correlacao)
+            else:
+                tarefaCorrelacao = None
+            tarefas = [pool.submit(_insightsDasColunas, analise, grupo, aproximado, metodo_outliers, multiplicador_outliers) 
+                       for grupo in grupos]
+
+            linhas = [linha for tarefa in tarefas for linha in tarefa.result()]
+            if tarefaCorrelacao is not None:
+                linhas.extend(tarefaCorrelacao.result())
+
+        dfFinal = pd.DataFrame(data=linhas, columns=COLUNAS_INSIGHTS)
+        if mantidos is not None and mantidos.shape[0] > 0:
+            dfFinal = pd.concat([mantidos, dfFinal], ignore_index=True) if dfFinal.shape[0] > 0 else mantidos.copy()
+        dfFinal.sort_values(by=['Nome da Coluna', 'Tipo de Informação'], inplace=True)
+        return dfFinal
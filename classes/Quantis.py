@@ -0,0 +1,218 @@
+import math
+import numpy as np
+
+
+class EsbocoDeQuantis:
+    """
+    Classe EsbocoDeQuantis
+
+    Esta classe mantém um esboço KLL (Karnin, Lang e Liberty) dos valores de uma coluna quantitativa: um resumo de
+    tamanho limitado (proporcional a `k`) a partir do qual quantis e postos são respondidos sem ordenar a coluna.
+    Os valores podem ser adicionados em partes e esboços de partes diferentes do dataset podem ser combinados.
+
+    O erro de posto normalizado (`ErroDePosto`) é de aproximadamente 2,296 / k^0,9723 (com 99% de confiança), ou seja,
+    cerca de 1,3% do total de valores para k = 200. A quantidade, o menor e o maior valor, a média e o desvio-padrão
+    são exatos.
+
+    Exemplo de uso:
+        >>> import numpy as np
+        >>> esboco = EsbocoDeQuantis(k=200)
+        >>> esboco.Atualizar(np.arange(1000000))
+        >>> esboco.Quantil([0.25, 0.5, 0.75])
+        array([249012., 499874., 750511.])
+        >>> esboco.ErroDePosto
+        0.0133...
+    """
+    def __init__(self, k: int=200, semente: int=0):
+        """
+        Inicializa um esboço vazio.
+
+        Parâmetros:
+            k (int, opcional): Parâmetro de precisão. Valores maiores reduzem o erro e aumentam o tamanho do esboço.
+            semente (int, opcional): Semente do gerador aleatório usado nas compactações (resultados reproduzíveis).
+        """
+        if k < 8:
+            raise Exception('O parâmetro k do esboço de quantis deve ser maior ou igual a 8.')
+        self._k = k
+        self._aleatorio = np.random.default_rng(semente)
+        self._niveis = [np.empty(0)]
+        self._quantidade = 0
+        self._menor = np.nan
+        self._maior = np.nan
+        self._media = 0.0
+        self._m2 = 0.0
+        self._ordenado = None
+
+    @property
+    def K(self) -> int:
+        return self._k
+
+    @property
+    def Quantidade(self) -> int:
+        return self._quantidade
+
+    @property
+    def Menor(self) -> float:
+        return self._menor
+
+    @property
+    def Maior(self) -> float:
+        return self._maior
+
+    @property
+    def Media(self) -> float:
+        return self._media if self._quantidade > 0 else np.nan
+
+    @property
+    def DesvioPadrao(self) -> float:
+        """Desvio-padrão amostral (ddof=1), como em pandas."""
+        return math.sqrt(self._m2 / (self._quantidade - 1)) if self._quantidade > 1 else np.nan
+
+    @property
+    def ErroDePosto(self) -> float:
+        """Erro máximo (com 99% de confiança) do posto normalizado retornado pelo esboço, entre 0 e 1."""
+        return 2.296 / self._k ** 0.9723
+
+    @property
+    def QuantidadeRetida(self) -> int:
+        """Quantidade de valores efetivamente armazenados no esboço."""
+        return sum(len(nivel) for nivel in self._niveis)
+
+    def Atualizar(self, valores):
+        """
+        Adiciona valores ao esboço. Os valores nulos (NaN) são ignorados.
+
+        Parâmetros:
+            valores (array-like): Valores numéricos a adicionar.
+        """
+        valores = np.asarray(valores, dtype='float64').ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return
+
+        self._acumularMomentos(len(valores), valores.min(), valores.max(), valores.mean(), ((valores - valores.mean()) ** 2).sum())
+
+        # a entrada é processada em partes para limitar a memória usada na ordenação das compactações
+        tamanhoParte = max(self._k, 65536)
+        for inicio in range(0, len(valores), tamanhoParte):
+            self._niveis[0] = np.concatenate([self._niveis[0], valores[inicio:inicio + tamanhoParte]])
+            self._compactar()
+        self._ordenado = None
+
+    def Combinar(self, outro: 'EsbocoDeQuantis'):
+        """
+        Incorpora ao esboço os valores resumidos em outro esboço (ex.: de outro bloco de linhas do mesmo arquivo).
+
+        Parâmetros:
+            outro (EsbocoDeQuantis): Esboço a incorporar. Ele não é alterado.
+        """
+        if outro.Quantidade == 0:
+            return
+
+        self._acumularMomentos(outro._quantidade, outro._menor, outro._maior, outro._media, outro._m2)
+
+        while len(self._niveis) < len(outro._niveis):
+            self._niveis.append(np.empty(0))
+        for nivel, itens in enumerate(outro._niveis):
+            self._niveis[nivel] = np.concatenate([self._niveis[nivel], itens])
+        self._compactar()
+        self._ordenado = None
+
+    def Quantil(self, q):
+        """
+        Estima um ou mais quantis.
+
+        Parâmetros:
+            q (float ou list): Quantil(is) desejado(s), entre 0 e 1.
+
+        Retorna:
+            float ou np.ndarray: Valor(es) estimado(s); NaN se o esboço estiver vazio.
+        """
+        escalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype='float64'))
+        if self._quantidade == 0:
+            resultado = np.full(len(q), np.nan)
+        else:
+            itens, pesosAcum = self._itensOrdenados()
+            posicao = np.searchsorted(pesosAcum, q * pesosAcum[-1], side='left')
+            resultado = itens[np.minimum(posicao, len(itens) - 1)]
+            # os extremos são conhecidos com exatidão
+            resultado = np.where(q <= 0, self._menor, np.where(q >= 1, self._maior, resultado))
+        return resultado[0] if escalar else resultado
+
+    def Posto(self, valor, inclusivo: bool=True):
+        """
+        Estima a fração dos valores menores (ou menores ou iguais) que `valor`.
+
+        Parâmetros:
+            valor (float ou list): Valor(es) de referência.
+            inclusivo (bool, opcional): Se verdadeiro, considera os valores iguais a `valor`.
+
+        Retorna:
+            float ou np.ndarray: Fração estimada, entre 0 e 1.
+        """
+        escalar = np.ndim(valor) == 0
+        valor = np.atleast_1d(np.asarray(valor, dtype='float64'))
+        if self._quantidade == 0:
+            resultado = np.full(len(valor), np.nan)
+        else:
+            itens, pesosAcum = self._itensOrdenados()
+            posicao = np.searchsorted(itens, valor, side='right' if inclusivo else 'left')
+            resultado = np.where(posicao > 0, pesosAcum[np.maximum(posicao - 1, 0)], 0) / pesosAcum[-1]
+        return resultado[0] if escalar else resultado
+
+    def ContarForaDosLimites(self, limite_inferior: float, limite_superior: float) -> tuple:
+        """
+        Estima a quantidade de valores menores que `limite_inferior` e maiores que `limite_superior`.
+
+        Retorna:
+            tuple: (quantidade abaixo, quantidade acima). Cada estimativa tem erro de até
+            `ErroDePosto` x `Quantidade` valores.
+        """
+        if self._quantidade == 0 or np.isnan(limite_inferior) or np.isnan(limite_superior):
+            return 0, 0
+        abaixo = 0 if limite_inferior <= self._menor else round(self.Posto(limite_inferior, inclusivo=False) * self._quantidade)
+        acima = 0 if limite_superior >= self._maior else round((1 - self.Posto(limite_superior)) * self._quantidade)
+        return int(abaixo), int(acima)
+
+    def _acumularMomentos(self, quantidade: int, menor: float, maior: float, media: float, m2: float):
+        # combinação das médias e somas dos quadrados dos desvios de duas partes (Chan et al.)
+        total = self._quantidade + quantidade
+        delta = media - self._media
+        self._media += delta * quantidade / total
+        self._m2 += m2 + delta ** 2 * self._quantidade * quantidade / total
+        self._quantidade = total
+        self._menor = menor if np.isnan(self._menor) else min(self._menor, menor)
+        self._maior = maior if np.isnan(self._maior) else max(self._maior, maior)
+
+    def _capacidade(self, nivel: int) -> int:
+        # os níveis mais altos (de maior peso) comportam k itens; cada nível abaixo comporta 2/3 do nível acima
+        profundidade = len(self._niveis) - nivel - 1
+        return max(2, int(math.ceil(self._k * (2 / 3) ** profundidade)))
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self._niveis):
+            itens = self._niveis[nivel]
+            if len(itens) > self._capacidade(nivel):
+                if nivel + 1 == len(self._niveis):
+                    self._niveis.append(np.empty(0))
+                itens = np.sort(itens)
+                # com quantidade ímpar, um item permanece no nível atual
+                sobra = itens[:len(itens) % 2]
+                itens = itens[len(itens) % 2:]
+                promovidos = itens[self._aleatorio.integers(2)::2]
+                self._niveis[nivel] = sobra
+                self._niveis[nivel + 1] = np.concatenate([self._niveis[nivel + 1], promovidos])
+                # um novo nível reduz a capacidade dos níveis inferiores, que são verificados novamente
+                nivel = 0
+            else:
+                nivel += 1
+
+    def _itensOrdenados(self) -> tuple:
+        if self._ordenado is None:
+            itens = np.concatenate(self._niveis)
+            pesos = np.concatenate([np.full(len(nivel), 2.0 ** altura) for altura, nivel in enumerate(self._niveis)])
+            ordem = np.argsort(itens, kind='stable')
+            self._ordenado = (itens[ordem], np.cumsum(pesos[ordem]))
+        return self._ordenado
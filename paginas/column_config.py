@@ -1,7 +1,9 @@
 import streamlit as st
 import time
 import pandas as pd
-from classes.Dataset import AnaliseDataset
+from classes.Dataset import AnaliseDataset, RegistrarConversaoDaSessao
+from classes.ArmazenamentoColunar import ArmazenamentoColunar
+from classes.ConversaoTipos import ConversorDeTipos
 
 if st.session_state['dados'] is None:
     mensagem = "Não há um dataset carregado. Redirecionando para a página de importação de arquivos em instantes."
@@ -13,6 +15,8 @@ if st.session_state['dados'] is None:
 
 st.title('Configuração de Colunas')
 st.write('Refine a definição de cada uma das colunas do dataset e clique em Confirmar.')
+if st.session_state.get('fonte_blocos') is not None:
+    st.info(f'Modo out-of-core: o catálogo, a validação da conversão e o preview usam apenas as primeiras {st.session_state['dados'].shape[0]} linhas do arquivo. Nas análises, os tipos confirmados são aplicados a todos os blocos.')
 
 # obtém os dados armazenados
 dados = st.session_state['dados']
@@ -22,8 +26,32 @@ if st.session_state['colunas'] is not None:
     pass 
 dfColunas = st.session_state['colunas']
 
-dfColunas_Edit = st.data_editor(
-    dfColunas,
+# as edições ficam pendentes (em todas as páginas do catálogo) até a confirmação
+dfPendentes = st.session_state.get('colunas_pendentes')
+if dfPendentes is None or not dfPendentes.index.equals(dfColunas.index):
+    dfPendentes = dfColunas.copy()
+    st.session_state['colunas_pendentes'] = dfPendentes
+
+# catálogo de colunas paginado
+colFiltro, colPapel, colTamanho, colPagina = st.columns([0.4, 0.2, 0.2, 0.2])
+with colFiltro:
+    filtro = st.text_input('Filtrar colunas pelo nome', placeholder='Digite parte do nome da coluna')
+with colPapel:
+    papel = st.selectbox('Papel', options=['Qualitativa', 'Quantitativa', 'Data', 'Data/Hora'], index=None, placeholder='Todos')
+with colTamanho:
+    tamanho_pagina = st.selectbox('Colunas por página', options=[25, 50, 100, 200], index=1)
+
+ds_pendente = AnaliseDataset(dados, dfPendentes)
+with colPagina:
+    total = ds_pendente.CatalogoDeColunas(filtro, papel)['total']
+    paginas = max(1, -(-total // tamanho_pagina))
+    pagina = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, value=1, step=1)
+catalogo = ds_pendente.CatalogoDeColunas(filtro, papel, pagina, tamanho_pagina)
+st.caption(f'{catalogo['total']} de {ds_pendente.QuantidadeDeColunas} colunas')
+
+dfColunas_Pagina = st.data_editor(
+    catalogo['tabela'],
+    key=f'editor_colunas_{filtro}_{papel}_{tamanho_pagina}_{pagina}',
     column_config={
         "NomeColuna": st.column_config.TextColumn(
             "Nome da Coluna",
@@ -61,35 +89,71 @@ dfColunas_Edit = st.data_editor(
     hide_index=True
 )
 
+# registra as edições da página atual
+if not dfColunas_Pagina['TipoColuna'].equals(catalogo['tabela']['TipoColuna']):
+    dfPendentes.loc[dfColunas_Pagina.index, 'TipoColuna'] = dfColunas_Pagina['TipoColuna']
+    st.rerun()
+dfColunas_Edit = dfPendentes
+
 # se confirmado, atualiza a configuração de colunas
-if st.button('Confirmar'):
+def aplicar_configuracao(conversor: ConversorDeTipos):
+    conversao = conversor.Converter()
+    dados_ajuste = conversao['dados']
+
+    st.session_state['colunas_pendentes'] = None
+    st.session_state['validacao_conversao'] = None
+    st.session_state['relatorio_conversao'] = conversao['relatorio'] if conversao['relatorio'].shape[0] > 0 else None
     st.session_state['colunas'] = dfColunas_Edit
 
-    dados_ajuste = pd.DataFrame( st.session_state['dados'] )
-    for idx, row in dfColunas_Edit.iterrows():
-        tipo = None
-        if row['TipoColuna'] == 'Inteiro':
-            tipo = 'int64'
-        elif row['TipoColuna'] == 'Decimal':
-            tipo = 'float64'
-        elif row['TipoColuna'] == 'Texto':
-            tipo = 'object'
-        elif row['TipoColuna'] == 'Data':
-            tipo = 'datetime64[ns]'
-        elif row['TipoColuna'] == 'Data/Hora':
-            tipo = 'datetime64[ns]'
-
-        if tipo is not None:
-            dados_ajuste[idx] = dados_ajuste[idx].astype(tipo)
-
-    # print(dados_ajuste.info())
-
-    # aplica a alteração nos dados
+    # aplica a alteração nos dados; sem colunas convertidas, o mesmo objeto é mantido. Com conversões, a cópia rasa é 
+    # registrada para que a análise da sessão e os insights reaproveitem os resultados das colunas não convertidas
+    if conversao['relatorio'].shape[0] == 0:
+        dados_ajuste = st.session_state['dados']
+    else:
+        RegistrarConversaoDaSessao(dados_ajuste, conversao['relatorio']['NomeColuna'].to_list())
     st.session_state['dados'] = dados_ajuste
+
+    # próximas cargas do mesmo arquivo já recebem os tipos confirmados
+    if st.session_state.get('chave_cache') is not None:
+        st.session_state['cache_importacao'].Armazenar(st.session_state['chave_cache'], dados_ajuste, dfColunas_Edit)
+        if st.session_state.get('chave_armazenamento') is not None:
+            if not ArmazenamentoColunar().Salvar(st.session_state['chave_armazenamento'], dados_ajuste, dfColunas_Edit):
+                st.session_state['chave_armazenamento'] = None
+    # a análise da sessão é recriada na próxima página, reaproveitando os resultados das colunas não alteradas
     st.rerun()
 
+conversor = ConversorDeTipos(ds_pendente)
+if st.button('Confirmar'):
+    # valida a conversão em uma amostra antes de converter as colunas inteiras
+    validacao = conversor.ValidarAmostra()
+    if validacao['FalhasAmostra'].sum() > 0:
+        st.session_state['validacao_conversao'] = validacao
+    else:
+        aplicar_configuracao(conversor)
+
+validacao = st.session_state.get('validacao_conversao')
+if validacao is not None:
+    st.warning('Alguns valores da amostra não puderam ser convertidos. Na conversão, eles serão substituídos por nulos.')
+    st.dataframe(validacao, hide_index=True, width='stretch')
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button('Converter mesmo assim'):
+            aplicar_configuracao(conversor)
+    with col2:
+        if st.button('Cancelar'):
+            st.session_state['validacao_conversao'] = None
+            st.rerun()
+
+relatorio = st.session_state.get('relatorio_conversao')
+if relatorio is not None:
+    with st.expander(f'Última conversão: {relatorio.shape[0]} coluna(s) convertida(s), {relatorio['QtdFalhas'].sum()} valor(es) inválido(s) substituído(s) por nulos'):
+        st.dataframe(relatorio, hide_index=True, width='stretch')
+
 
-st.info(f'Linhas: {st.session_state['dados'].shape[0]}, Colunas: {st.session_state['dados'].shape[1]}')
+if st.session_state.get('fonte_blocos') is not None:
+    st.info(f'Linhas (primeiro bloco): {st.session_state['dados'].shape[0]}, Colunas: {st.session_state['dados'].shape[1]}')
+else:
+    st.info(f'Linhas: {st.session_state['dados'].shape[0]}, Colunas: {st.session_state['dados'].shape[1]}')
 st.subheader('Preview com a configuração')
 dados_preview = st.session_state['dados'].head(10)
 # print(dados_preview)
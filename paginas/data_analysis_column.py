@@ -1,7 +1,7 @@
 import streamlit as st
 import time
 import pandas as pd
-from classes.Dataset import AnaliseDataset
+from classes.Dataset import AnaliseDaSessao
 # import locale 
 # locale.setlocale(locale.LC_ALL, locale='pt_BR.UTF-8')
 import plotly.express as px
@@ -20,18 +20,22 @@ if st.session_state['dados'] is None:
 
 
 st.title('Análise de Dados Univariada')
-ds = AnaliseDataset(st.session_state['dados'], st.session_state['colunas'])
+ds = AnaliseDaSessao()
 colunas = pd.DataFrame(st.session_state['colunas'])
 
-colNome, _ = st.columns(2)
+colNome, colFiltro = st.columns(2)
+with colFiltro:
+    filtro = st.text_input('Filtrar colunas pelo nome', placeholder='Digite parte do nome da coluna')
 with colNome:
-    nomeColuna = st.selectbox('Selecione a coluna a detalhar', options=ds.Colunas)
+    nomeColuna = st.selectbox('Selecione a coluna a detalhar', options=ds.CatalogoDeColunas(filtro)['tabela']['NomeColuna'])
+    if nomeColuna is None:
+        st.warning('Nenhuma coluna encontrada com o filtro informado.')
+        st.stop()
     coluna = colunas[colunas.NomeColuna == nomeColuna]
 
 # informações iniciais
-dados = pd.DataFrame(st.session_state['dados'][nomeColuna])
 st.write(f'Tipo de dados: {coluna['TipoColuna'].iloc[0]} | Classificação: {coluna['ClassifColuna'].iloc[0]}')
-st.write(f'{ds.PercentualValoresNulos()['texto']}')
+st.write(f'{ds.PercentualValoresNulos(nomeColuna)['texto']}')
 
 
 # coluna qualitativa
@@ -39,7 +43,6 @@ if 'Qualitativa' in coluna['ClassifColuna'].iloc[0]:
     st.divider()
     
     col1, col2 = st.columns([0.4, 0.6])
-    dfDistFreq = ds.DistribuicaoDeFrequencia(nomeColuna)
     concentracao_itens = ds.ConcentracaoDeItens(nomeColuna)
     # print(concentracao_itens)
 
@@ -48,19 +51,33 @@ if 'Qualitativa' in coluna['ClassifColuna'].iloc[0]:
         # st.write('Concentração de Itens')
         # st.write(ds.ConcentracaoDeItens(nomeColuna)['texto'])
         st.write(concentracao_itens['texto'])
-        st.dataframe(dfDistFreq, width='stretch')
+        # a distribuição completa é exibida por página, sem montar a tabela de todos os itens
+        colTamanho, colPagina = st.columns(2)
+        with colTamanho:
+            tamanho_pagina = st.selectbox('Itens por página', options=[25, 50, 100, 200], index=2)
+        with colPagina:
+            qtd_distintos = ds.PrincipaisItens(nomeColuna)['qtd_distintos']
+            paginas = max(1, -(-qtd_distintos // tamanho_pagina))
+            pagina = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, value=1, step=1)
+        st.dataframe(ds.PaginaDaFrequencia(nomeColuna, pagina, tamanho_pagina)['tabela'], hide_index=True, width='stretch')
 
     with col2:
         # # st.subheader('Distribuição dos Itens')
         # fig = px.bar(dfDistFreq, x='Quantidade', y=nomeColuna, text_auto=True, orientation='h', title='Distribuição dos Itens')
         # fig.update_layout(yaxis={'categoryorder': 'total ascending'})
         # st.plotly_chart(fig)
+        # o gráfico recebe apenas os itens mais frequentes e a soma dos demais em 'Outros'
+        max_itens = st.slider('Quantidade de itens mais frequentes exibidos', min_value=5, max_value=50, value=20)
+        principais = ds.PrincipaisItens(nomeColuna, max_itens)
+        dfDistFreq = principais['tabela']
+        if principais['qtd_outros'] > 0:
+            st.caption(f'{principais['qtd_distintos']} itens distintos; {principais['qtd_outros']} estão somados em "Outros".')
         fig = go.Figure()
  
         # altera cor da barra para itens que fazem parte da concentração
         # itens_concentracao = ds.ConcentracaoDeItens(nomeColuna)['lista']
-        marker_colors = ['darkgreen' if (len(concentracao_itens['lista']) > 0) and (str(item) in concentracao_itens['lista']) 
-                         else 'blue' 
+        itens_concentracao = set(str(item) for item in concentracao_itens['lista'])
+        marker_colors = ['darkgreen' if str(item) in itens_concentracao else 'blue' 
                          for item in dfDistFreq[nomeColuna]]
         
         fig.add_trace(go.Bar(
@@ -100,60 +117,89 @@ if 'Qualitativa' in coluna['ClassifColuna'].iloc[0]:
 
 # coluna quantitativa
 if 'Quantitativa' in coluna['ClassifColuna'].iloc[0]:
+    aproximado = st.toggle('Estatísticas aproximadas (esboço de quantis, sem ordenar a coluna)', value=st.session_state.get('fonte_blocos') is not None)
     col1, col2, col3 = st.columns(3)
 
     with col1:
         # st.subheader('Histograma')
-        fig = px.histogram(dados, title=f'Histograma de {nomeColuna}', labels=None)
-        fig.update(layout_showlegend=False)
+        # histograma com as classes já contadas, sem enviar todos os valores para o gráfico
+        histograma = ds.Histograma(nomeColuna, aproximado=aproximado)
+        fig = go.Figure(go.Bar(
+            x=(histograma['Inicio'] + histograma['Fim']) / 2,
+            y=histograma['Quantidade'],
+            width=histograma['Fim'] - histograma['Inicio'],
+            customdata=histograma[['Inicio', 'Fim']],
+            hovertemplate='%{customdata[0]:.4g} a %{customdata[1]:.4g}<br>Quantidade: %{y}<extra></extra>',
+        ))
+        fig.update_layout(title=f'Histograma de {nomeColuna}', bargap=0, showlegend=False)
         st.plotly_chart(fig)
 
     with col2:
-        st.dataframe(ds.EstatisticaDescritiva(nomeColuna), width='stretch')
+        estatisticas = ds.EstatisticaDescritiva(nomeColuna, aproximado=aproximado)
+        # os valores dos outliers são exibidos por página, abaixo do boxplot
+        metricas = {metrica: valor for metrica, valor in estatisticas['lista'].items() if metrica != 'Outliers'}
+        st.dataframe({'lista': metricas}, width='stretch')
+        if aproximado:
+            st.caption(f'Erro máximo de posto dos quartis: {estatisticas['lista']['ErroDePosto']:.2%} dos valores.')
 
     with col3:
         # st.subheader('Outliers')
-        outliers = ds.Outliers(nomeColuna)
-        st.write(f'Quantidade de outliers: {outliers['valor']}')
+        st.write(f'Quantidade de outliers: {estatisticas['lista']['QtdOutliers']}')
         # st.write(f'% outliers: {ds.EstatisticaDescritiva(nomeColuna)['lista']['PctOutliers']}')
 
-        # Criar o boxplot com Plotly
-        fig = px.box(dados, title=f'Boxplot')
+        # boxplot montado com as estatísticas já calculadas e uma amostra limitada dos outliers
+        resumo = ds.ResumoBoxplot(nomeColuna, aproximado=aproximado)
+        fig = go.Figure(go.Box(
+            x=[nomeColuna], name=nomeColuna,
+            q1=[resumo['q1']], median=[resumo['mediana']], q3=[resumo['q3']], mean=[resumo['media']],
+            lowerfence=[resumo['bigode_inferior']], upperfence=[resumo['bigode_superior']],
+        ))
+        if len(resumo['outliers']) > 0:
+            fig.add_trace(go.Scatter(
+                x=[nomeColuna] * len(resumo['outliers']), y=resumo['outliers'],
+                mode='markers', name='Outliers', marker_color='red',
+            ))
+        fig.update_layout(title='Boxplot', showlegend=False)
         st.plotly_chart(fig)
+        if resumo['amostrado']:
+            st.caption(f'Exibindo {len(resumo['outliers'])} de {resumo['qtd_outliers']} outliers.')
+
+        outliers = estatisticas['lista']['Outliers']
+        if outliers.Quantidade > 0:
+            with st.expander(f'Valores dos outliers ({outliers.QuantidadeAbaixo} abaixo e {outliers.QuantidadeAcima} acima dos limites)'):
+                colLado, colPagina = st.columns(2)
+                with colLado:
+                    lado = st.selectbox('Lado', options=['Todos', 'Abaixo', 'Acima'])
+                    lado = None if lado == 'Todos' else lado
+                total = outliers.Quantidade if lado is None else (outliers.QuantidadeAcima if lado == 'Acima' else outliers.QuantidadeAbaixo)
+                with colPagina:
+                    paginas = max(1, -(-total // 100))
+                    pagina = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, value=1, step=1)
+                st.dataframe(outliers.Pagina(pagina, 100, lado)['tabela'], hide_index=True, width='stretch')
 
 # colunas Data e Data/Hora
 if ('Data' in coluna['ClassifColuna'].iloc[0]) or ('Data/Hora' in coluna['ClassifColuna'].iloc[0]):
+    # contagens por dia, mês, dia da semana e hora calculadas em uma única passagem, sem alterar os dados
+    perfil_temporal = ds.PerfilTemporal(nomeColuna)
     col1, col2, col3 = st.columns(3)
 
     with col1:
         # st.subheader('Registros diários')
-        dados_agrupados = dados.value_counts().reset_index()
-        dados_agrupados.sort_values(by=[nomeColuna], inplace=True)
-
-        fig = px.line(dados_agrupados, x=nomeColuna, y='count', title='Registros Diários')
+        fig = px.line(perfil_temporal['diario'], x=nomeColuna, y='Quantidade', title='Registros Diários')
         fig.update_traces(texttemplate="%{y}")
         st.plotly_chart(fig)
 
     with col2:
         # st.subheader('Registros por mês')
-        dados_agrupados = dados
-        dados_agrupados['__anomes'] = dados_agrupados[nomeColuna].dt.to_period('M')
-        dados_agrupados['__anomes'] = dados_agrupados['__anomes'].dt.to_timestamp()
-        dados_agrupados = dados['__anomes'].value_counts().reset_index()
-        dados_agrupados.sort_values(by=['__anomes'], inplace=True)
-        
-        fig = px.bar(dados_agrupados, x='__anomes', y='count', labels='y', title='Registros por Mês')
+        fig = px.bar(perfil_temporal['mensal'], x=nomeColuna, y='Quantidade', labels='y', title='Registros por Mês')
         fig.update_traces(texttemplate="%{y}")
         st.plotly_chart(fig)
 
     with col3:
         # st.subheader('Registros por dia sem.')
-        dados_agrupados = dados
-        dados_agrupados['__diasem'] = dados_agrupados[nomeColuna].dt.day_name(locale='pt_BR')
-        dados_agrupados = dados['__diasem'].value_counts().reset_index()
-        dados_agrupados.sort_values(by=['count'], ascending=True, inplace=True)
+        dados_agrupados = perfil_temporal['dia_da_semana'].sort_values(by=['Quantidade'], ascending=True)
         
-        fig = px.bar(dados_agrupados, x='count', y='__diasem', labels='y', orientation='h', title='Registros por Dia da Semana')
+        fig = px.bar(dados_agrupados, x='Quantidade', y='DiaDaSemana', labels='y', orientation='h', title='Registros por Dia da Semana')
         fig.update_traces(texttemplate="%{x}")
         st.plotly_chart(fig)
         
@@ -162,12 +208,6 @@ if 'Data/Hora' in coluna['ClassifColuna'].iloc[0]:
 
     with col1:
         # st.subheader('Registros por hora do dia')
-        dados_agrupados = dados
-        dados_agrupados['__hora'] = dados_agrupados[nomeColuna].dt.hour
-        dados_agrupados = dados['__hora'].value_counts().reset_index()
-        dados_agrupados.sort_values(by=['count'], ascending=True, inplace=True)
-        
-        fig = px.bar(dados_agrupados, x='__hora', y='count', labels='y', title='Registros por Hora do Dia')
+        fig = px.bar(perfil_temporal['hora'], x='Hora', y='Quantidade', labels='y', title='Registros por Hora do Dia')
         fig.update_traces(texttemplate="%{y}")
         st.plotly_chart(fig)
-
@@ -1,7 +1,7 @@
 import streamlit as st
 import time
 import pandas as pd
-from classes.Dataset import AnaliseDataset
+from classes.Dataset import AnaliseDaSessao, GRANULARIDADES_TEMPORAIS
 # import locale 
 # locale.setlocale(locale.LC_ALL, locale='pt_BR')
 import plotly.express as px
@@ -22,18 +22,19 @@ if st.session_state['dados'] is None:
 st.title('Análise de Dados Multivariada')
 blnContinuar = True
 
-ds = AnaliseDataset(st.session_state['dados'], st.session_state['colunas'])
-dados = ds.Dados
+ds = AnaliseDaSessao()
 colunas = ds.ConfigColunas
 
 colEsq, colDir = st.columns(2)
 with colEsq:
-    nomeColunaEsq = st.selectbox('Selecione uma coluna', options=ds.Colunas, key='nomeColunaEsq', index=None)
+    filtroEsq = st.text_input('Filtrar colunas pelo nome', key='filtroEsq', placeholder='Digite parte do nome da coluna')
+    nomeColunaEsq = st.selectbox('Selecione uma coluna', options=ds.CatalogoDeColunas(filtroEsq)['tabela']['NomeColuna'], key='nomeColunaEsq', index=None)
     if nomeColunaEsq is not None:
         colunaEsq = colunas.loc[nomeColunaEsq]
         st.write(colunaEsq['ClassifColuna'])
 with colDir:
-    nomeColunaDir = st.selectbox('Selecione uma coluna', options=ds.Colunas, key='nomeColunaDir', index=None)
+    filtroDir = st.text_input('Filtrar colunas pelo nome', key='filtroDir', placeholder='Digite parte do nome da coluna')
+    nomeColunaDir = st.selectbox('Selecione uma coluna', options=ds.CatalogoDeColunas(filtroDir)['tabela']['NomeColuna'], key='nomeColunaDir', index=None)
     if nomeColunaDir is not None:
         colunaDir = colunas.loc[nomeColunaDir]
         st.write(colunaDir['ClassifColuna'])
@@ -56,8 +57,25 @@ if blnContinuar:
 
     # qualitativa vs qualitativa
     if ('Qualitativa' in colunaEsq['ClassifColuna']) and ('Qualitativa' in colunaDir['ClassifColuna']):
-        matriz = ds.MatrizDeConfusao(nomeColunaEsq, nomeColunaDir)
+        # contagens esparsas; apenas os itens mais frequentes são exibidos na matriz e os demais somados em 'Outros'
+        tabela = ds.TabelaCruzada(nomeColunaEsq, nomeColunaDir)
+        qtd_itens = max((tabela['total_linhas'] > 0).sum(), (tabela['total_colunas'] > 0).sum())
+        max_itens = None
+        if qtd_itens > 50:
+            max_itens = st.slider('Quantidade de itens mais frequentes exibidos em cada eixo', min_value=5, max_value=50, value=20)
+            st.caption(f'{(tabela['total_linhas'] > 0).sum()} itens em {nomeColunaEsq} e {(tabela['total_colunas'] > 0).sum()} itens em {nomeColunaDir}; os demais estão somados em "Outros".')
+        matriz = ds.MatrizDeConfusao(nomeColunaEsq, nomeColunaDir, max_itens, max_itens)
         st.dataframe(matriz.style.highlight_max(axis=0, color='orange').highlight_min(axis=0, color='lightblue'), width='stretch')
+
+        with st.expander(f'Todas as combinações ({len(tabela['contagens'])})'):
+            colTamanho, colPagina = st.columns(2)
+            with colTamanho:
+                tamanho_pagina = st.selectbox('Combinações por página', options=[25, 50, 100, 200], index=2)
+            with colPagina:
+                paginas = max(1, -(-len(tabela['contagens']) // tamanho_pagina))
+                pagina = st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, value=1, step=1)
+            combinacoes = ds.CombinacoesDaTabelaCruzada(nomeColunaEsq, nomeColunaDir, pagina, tamanho_pagina)
+            st.dataframe(combinacoes['tabela'], hide_index=True, width='stretch')
         # fig = px.density_heatmap(matriz, title='Matriz de Confusão')
         # fig = px.density_mapbox(matriz)
         # st.plotly_chart(fig)
@@ -65,7 +83,8 @@ if blnContinuar:
     
     # qualitativa vs quantitativa
     if (('Qualitativa' in colunaEsq['ClassifColuna']) and ('Quantitativa' in colunaDir['ClassifColuna'])): # or (('Quantitativa' in colunaEsq['ClassifColuna']) and ('Qualitativa' in colunaDir['ClassifColuna'])):
-        operacao1 = st.selectbox('Informe a operação a aplicar na coluna Qualitativa', options=['Soma', 'Média', 'Contagem'])
+        # todas as operações são calculadas juntas e reaproveitadas: trocar a operação não agrupa os dados novamente
+        operacao1 = st.selectbox('Informe a operação a aplicar na coluna Qualitativa', options=['Soma', 'Média', 'Contagem', 'Mínimo', 'Máximo', 'Desvio-Padrão'])
 
         dados_analise = ds.TotalPorCategoria(nomeColunaEsq, nomeColunaDir, operacao1)
         # print(dados_analise)
@@ -90,16 +109,31 @@ if blnContinuar:
             blnMostrarCorr = False
         box(f'Correlação: {correlacao}')
 
-        dados_amostra = dados.sample(10000, random_state=42, replace=True)
+        # o gráfico recebe a grade de densidade ou uma amostra limitada, qualquer que seja a quantidade de linhas
+        densidade = ds.DensidadeDispersao(nomeColunaEsq, nomeColunaDir)
+        modo = st.radio('Exibição', options=['Densidade', 'Amostra com extremos'], horizontal=True, 
+                        index=0 if densidade['qtd_pares'] > 5000 else 1)
         fig = go.Figure()
-        fig.add_trace(go.Scatter(
-        # fig.add_trace(go.Scattergl(
-            x=dados_amostra[nomeColunaEsq],
-            y=dados_amostra[nomeColunaDir],
-            mode='markers',
-            name='Itens',
-            zorder=1,
-        ))
+        if modo == 'Densidade':
+            limites_x, limites_y = densidade['limites_x'], densidade['limites_y']
+            contagens = densidade['contagens'].T.astype('float64')
+            contagens[contagens == 0] = None
+            fig.add_trace(go.Heatmap(
+                x=(limites_x[:-1] + limites_x[1:]) / 2,
+                y=(limites_y[:-1] + limites_y[1:]) / 2,
+                z=contagens,
+                colorscale='Blues',
+                name='Itens',
+            ))
+        else:
+            dados_amostra = ds.AmostraExtremos(nomeColunaEsq, nomeColunaDir)
+            st.caption(f'Amostra de {dados_amostra.shape[0]} de {densidade['qtd_pares']} linhas, preservando regiões raras e extremos.')
+            fig.add_trace(go.Scattergl(
+                x=dados_amostra[nomeColunaEsq],
+                y=dados_amostra[nomeColunaDir],
+                mode='markers',
+                name='Itens',
+            ))
         fig.update_layout(
             title=dict(
                 text=f'{nomeColunaEsq} vs {nomeColunaDir}'
@@ -117,9 +151,10 @@ if blnContinuar:
         )
 
         if blnMostrarCorr:
+            limites_x, limites_y = densidade['limites_x'], densidade['limites_y']
             fig.add_trace(go.Scatter(
-                x=[dados[nomeColunaEsq].min(), dados[nomeColunaEsq].max()] if correlacao > 0 else [dados[nomeColunaEsq].min(), dados[nomeColunaEsq].max()] ,
-                y=[dados[nomeColunaDir].min(), dados[nomeColunaDir].max()] if correlacao > 0 else [dados[nomeColunaDir].max(), dados[nomeColunaDir].min()],
+                x=[limites_x[0], limites_x[-1]],
+                y=[limites_y[0], limites_y[-1]] if correlacao > 0 else [limites_y[-1], limites_y[0]],
                 mode='lines',
                 name='Correlação',
                 yaxis='y',
@@ -134,5 +169,17 @@ if blnContinuar:
 
     # data ou data/hora vs quantitativa
     if (('Data' in colunaEsq['ClassifColuna']) or ('Data/Hora' in colunaEsq['ClassifColuna'])) and ('Quantitativa' in colunaDir['ClassifColuna']):
-        fig = px.line(data_frame=dados, x=nomeColunaEsq, y=nomeColunaDir, title=f'{nomeColunaDir} por {nomeColunaEsq}')
+        colGranularidade, colOperacao = st.columns(2)
+        with colGranularidade:
+            granularidade = st.selectbox('Granularidade', options=['Auto'] + list(GRANULARIDADES_TEMPORAIS.keys()) + ['Original'])
+        with colOperacao:
+            operacao = st.selectbox('Operação em cada período', options=['Soma', 'Média', 'Mínimo', 'Máximo', 'Contagem'], 
+                                    disabled=granularidade == 'Original')
+
+        # série agrupada por período e reduzida a um número limitado de pontos (LTTB)
+        serie = ds.SerieTemporal(nomeColunaEsq, nomeColunaDir, granularidade, operacao)
+        st.caption(f'Granularidade: {serie['granularidade']} | {serie['serie'].shape[0]} de {serie['qtd_periodos']} pontos exibidos')
+        fig = go.Figure(go.Scattergl(x=serie['serie'][nomeColunaEsq], y=serie['serie'][nomeColunaDir], mode='lines', name=nomeColunaDir))
+        fig.update_layout(title=f'{nomeColunaDir} por {nomeColunaEsq}', xaxis=dict(title=dict(text=nomeColunaEsq)), 
+                          yaxis=dict(title=dict(text=nomeColunaDir)))
         st.plotly_chart(fig)
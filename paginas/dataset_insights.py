@@ -1,7 +1,9 @@
+import os
 import streamlit as st
 import time
 import pandas as pd
-from classes.Dataset import AnaliseDataset
+from classes.Dataset import AnaliseDaSessao, ColunasConvertidasNaSessao, METODOS_OUTLIERS
+from classes.Insights import GeradorDeInsights
 import plotly.express as px
 
 if st.session_state['dados'] is None:
@@ -13,51 +15,42 @@ if st.session_state['dados'] is None:
     st.switch_page('paginas/load_dataset.py')
 
 st.title('Insights para o Dataset')
-ds = AnaliseDataset(st.session_state['dados'], st.session_state['colunas'])
-st.info(f'Linhas: {st.session_state['dados'].shape[0]}, Colunas: {st.session_state['dados'].shape[1]}')
-
-# @st.cache_data
-def load_insights():
-    # ds = AnaliseDataset(st.session_state['dados'], st.session_state['colunas'])
-
-    percNulos = []
-    for coluna in ds.Colunas:
-        _aux = ds.PercentualValoresNulos(coluna)
-        percNulos.append([coluna, 'Percentual de Nulos', _aux['texto'], _aux['valor']])
-    dfPercNulos = pd.DataFrame(data=percNulos, columns=['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor'])
-    # print(dfPercNulos)
-
-
-    concItens = []
-    for coluna in ds.ColunasQualitativas:
-        _aux = ds.ConcentracaoDeItens(coluna)
-        concItens.append([coluna, 'Concentração de Itens', _aux['texto'], _aux['valor']])
-    dfConcItens = pd.DataFrame(data=concItens, columns=['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor'])
-    # print(dfConcItens)
+ds = AnaliseDaSessao()
+# no modo out-of-core, a quantidade de linhas é contada percorrendo o arquivo inteiro
+st.info(f'Linhas: {ds.QuantidadeDeLinhas}, Colunas: {ds.QuantidadeDeColunas}')
+colMetodo, colMultiplicador = st.columns(2)
+with colMetodo:
+    metodo_outliers = st.selectbox('Regra de identificação de outliers', options=list(METODOS_OUTLIERS.keys()))
+with colMultiplicador:
+    multiplicador_outliers = st.number_input('Multiplicador da regra', min_value=0.1, value=METODOS_OUTLIERS[metodo_outliers], step=0.5, 
+                                             key=f'multiplicador_{metodo_outliers}')
+aproximado = st.toggle('Outliers aproximados (esboço de quantis, sem ordenar as colunas)', value=st.session_state.get('fonte_blocos') is not None, 
+                       disabled=metodo_outliers != 'DIQ')
 
+with st.expander('Opções de processamento'):
+    max_workers = st.number_input('Quantidade de workers', min_value=1, max_value=64, value=os.cpu_count() or 1)
 
-    outliers = []
-    for coluna in ds.ColunasQuantitativas:
-        _aux = ds.Outliers(coluna)
-        outliers.append([coluna, 'Outliers', _aux['texto'], _aux['valor']])
-    dfOutliers = pd.DataFrame(data=outliers, columns=['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor'])
-
-
-    dfCorrelacoes_orig = ds.CorrelacoesRelevantes()
-    if dfCorrelacoes_orig is not None:
-        dfCorrelacoes = dfCorrelacoes_orig.copy()
-        dfCorrelacoes['Nome da Coluna'] = dfCorrelacoes['coluna_a']
-        dfCorrelacoes['Tipo de Informação'] = 'Correlação'
-        dfCorrelacoes['Informação'] = '📈 Correlação com ' + dfCorrelacoes['coluna_b'] + ' (' + dfCorrelacoes['correlacao'].astype('str') + ')'
-        dfCorrelacoes['Valor'] = dfCorrelacoes['correlacao']
-        dfCorrelacoes = dfCorrelacoes[ ['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor'] ]
-    else:
-        dfCorrelacoes = pd.DataFrame(data=None, columns=['Nome da Coluna', 'Tipo de Informação', 'Informação', 'Valor'])
-
-
-    dfFinal = pd.concat([dfPercNulos, dfConcItens, dfOutliers, dfCorrelacoes], ignore_index=True)
-    dfFinal.sort_values(by=['Nome da Coluna', 'Tipo de Informação'], inplace=True)
-    return dfFinal
+def load_insights():
+    # os insights são reaproveitados enquanto os dados, a configuração e as opções não mudarem
+    chave = (ds.ImpressaoDigital, aproximado, metodo_outliers, multiplicador_outliers)
+    chave_anterior = st.session_state.get('chave_insights')
+    if chave_anterior != chave:
+        gerador = GeradorDeInsights(max_workers=max_workers)
+        opcoes = dict(aproximado=aproximado, metodo_outliers=metodo_outliers, multiplicador_outliers=multiplicador_outliers)
+        convertidas = ColunasConvertidasNaSessao(st.session_state.get('dados_insights'), ds.Dados)
+        if chave_anterior is not None and chave_anterior[1:] == chave[1:] and convertidas is not None:
+            # após confirmar a configuração das colunas (com ou sem conversão de tipos), recalcula apenas as colunas 
+            # alteradas; as colunas convertidas sempre são recalculadas
+            assinaturas_anteriores = {coluna: assinatura for coluna, assinatura in st.session_state['assinaturas_insights'].items() 
+                                      if coluna not in convertidas}
+            st.session_state['insights'] = gerador.Gerar(ds, anteriores=st.session_state['insights'],
+                                                         assinaturas_anteriores=assinaturas_anteriores, **opcoes)
+        else:
+            st.session_state['insights'] = gerador.Gerar(ds, **opcoes)
+        st.session_state['chave_insights'] = chave
+        st.session_state['assinaturas_insights'] = ds.AssinaturasDasColunas
+        st.session_state['dados_insights'] = ds.Dados
+    return st.session_state['insights']
 
 # carrega as informações
 dados = load_insights()
@@ -76,7 +69,7 @@ if dados_filtrados.shape[0] > 0:
         fig = px.pie(dados_filtrados, names='Tipo de Informação')
         st.plotly_chart(fig)
     with col2:
-        st.dataframe(dados_filtrados.drop('Valor', axis=1), hide_index=True, width='stretch', selection_mode='multi-row')
+        st.dataframe(dados_filtrados.drop(['Valor', 'Coluna Relacionada'], axis=1), hide_index=True, width='stretch', selection_mode='multi-row')
     
 else:
     st.info('Não há insights a apresentar.')
\ No newline at end of file
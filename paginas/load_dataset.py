@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
-from classes.Dataset import AnaliseDataset
+from classes.Dataset import AnaliseDataset, InvalidarAnaliseDaSessao
+from classes.Importacao import ImportadorCSV, CacheDeImportacao
+from classes.ArmazenamentoColunar import ArmazenamentoColunar
+from classes.DatasetEmBlocos import FonteEmBlocos
 
 st.title('Importar Arquivo')
 
@@ -11,24 +14,158 @@ with col1:
 with col2:
     sep = st.selectbox('Selecione o separador de colunas', [',', ';', '\t', '|'])
     decimal = st.selectbox('Selecione o separador de decimais', ['.', ','])
+    inferir_tipos = st.checkbox('Inferir tipos automaticamente (datas, números em texto, booleanos e categorias)', value=True)
+    fora_da_memoria = st.checkbox('Modo out-of-core (arquivos maiores que a memória, analisados em blocos)', value=False)
+    compactar = st.checkbox('Modo compacto (reduz a memória ocupada pelo dataset)', value=False, disabled=fora_da_memoria)
+    usar_float32 = st.checkbox('Usar float32 nas colunas decimais (menor precisão)', value=False, disabled=fora_da_memoria or not compactar)
 
     if uploaded_file is not None:
-        data = pd.read_csv(uploaded_file, sep=sep, decimal=decimal)
+        if 'cache_importacao' not in st.session_state:
+            st.session_state['cache_importacao'] = CacheDeImportacao()
+        cache = st.session_state['cache_importacao']
+        armazenamento = ArmazenamentoColunar()
+
+        # inicia uma nova importação apenas quando o arquivo ou os separadores mudarem; o modo compacto é aplicado 
+        # depois, sobre os dados já importados
+        chave_importacao = (uploaded_file.file_id, sep, decimal, fora_da_memoria, inferir_tipos)
+        importador = st.session_state.get('importador')
+        if st.session_state.get('chave_importacao') != chave_importacao:
+            if importador is not None:
+                importador.Cancelar()
+            st.session_state['chave_importacao'] = chave_importacao
+            st.session_state['chave_cache'] = (cache.HashDoConteudo(uploaded_file),) + chave_importacao[1:]
+            st.session_state['relatorio_memoria'] = None
+            st.session_state['chave_compactacao'] = None
+            st.session_state['relatorio_inferencia'] = None
+            st.session_state['chave_armazenamento'] = None
+            if st.session_state.get('fonte_blocos') is not None:
+                # o arquivo gravado para o modo out-of-core só serve para a importação anterior
+                st.session_state['fonte_blocos'].RemoverArquivo()
+            st.session_state['fonte_blocos'] = None
+            st.session_state['colunas'] = None
+            # os resultados da análise e os insights anteriores nunca valem para outra importação
+            InvalidarAnaliseDaSessao()
+            st.session_state['chave_insights'] = None
+            st.session_state['insights'] = None
+            st.session_state['dados_insights'] = None
+            st.session_state['conversao_dados'] = None
+
+            item_cache = None
+            if fora_da_memoria:
+                # o arquivo é gravado em disco e analisado em blocos; apenas o primeiro bloco fica na memória
+                with st.spinner('Gravando o arquivo em disco...'):
+                    caminho = FonteEmBlocos.GravarArquivo(uploaded_file)
+                fonte = FonteEmBlocos(caminho, sep=sep, decimal=decimal, inferir_tipos=inferir_tipos)
+                st.session_state['fonte_blocos'] = fonte
+                item_cache = (fonte.Amostra, fonte.ConfigColunas)
+            else:
+                item_cache = cache.Obter(st.session_state['chave_cache'])
+            if item_cache is None:
+                # arquivo colunar salvo em uma carga anterior (lido com memory-map)
+                item_cache = armazenamento.Carregar(st.session_state['chave_cache'])
+                if item_cache is not None:
+                    cache.Armazenar(st.session_state['chave_cache'], *item_cache)
+            if item_cache is not None:
+                # o mesmo conteúdo já foi importado com os mesmos separadores (ou está no modo out-of-core)
+                importador = None
+                if armazenamento.Existe(st.session_state['chave_cache']):
+                    st.session_state['chave_armazenamento'] = st.session_state['chave_cache']
+                st.session_state['importacao_registrada'] = True
+                st.session_state['dados'], st.session_state['colunas'] = item_cache
+            else:
+                importador = ImportadorCSV(uploaded_file, sep=sep, decimal=decimal, inferir_tipos=inferir_tipos)
+                importador.Iniciar()
+                st.session_state['importacao_registrada'] = False
+                st.session_state['dados'] = None
+            st.session_state['importador'] = importador
+
         st.session_state['uploaded_file'] = uploaded_file
         st.session_state['sep'] = sep
         st.session_state['decimal'] = decimal
-        st.session_state['dados'] = data
 
-        if 'dados_preview' in st.session_state and st.session_state['colunas'] is not None:
-            ds = AnaliseDataset(st.session_state['dados'], st.session_state['colunas'])
-        else:
-            ds = AnaliseDataset(st.session_state['dados'])
-            st.session_state['colunas'] = ds.ConfigColunas
+        if importador is None:
+            # dados obtidos do cache de importação
+            pass
+        elif importador.Status == 'Concluído' and not st.session_state['importacao_registrada']:
+            st.session_state['importacao_registrada'] = True
+            st.session_state['dados'] = importador.Dados
+            st.session_state['relatorio_inferencia'] = importador.Inferencia
+
+            if 'dados_preview' in st.session_state and st.session_state['colunas'] is not None:
+                ds = AnaliseDataset(st.session_state['dados'], st.session_state['colunas'])
+            else:
+                ds = AnaliseDataset(st.session_state['dados'], importador.ConfigColunas)
+                st.session_state['colunas'] = ds.ConfigColunas
+
+            # o cache e a cópia colunar guardam os dados sem compactação, para que o modo compacto possa ser alterado 
+            # sem importar o arquivo novamente
+            cache.Armazenar(st.session_state['chave_cache'], st.session_state['dados'], st.session_state['colunas'])
+            with st.spinner('Salvando cópia colunar do dataset...'):
+                if armazenamento.Salvar(st.session_state['chave_cache'], st.session_state['dados'], st.session_state['colunas']):
+                    st.session_state['chave_armazenamento'] = st.session_state['chave_cache']
+        elif importador.Status == 'Cancelado':
+            st.warning('Importação cancelada.')
+        elif importador.Status == 'Erro':
+            st.error(f'Não foi possível importar o arquivo: {importador.Erro}')
+
+        # aplica (ou desfaz) o modo compacto sobre a importação já armazenada no cache
+        chave_compactacao = (compactar, compactar and usar_float32)
+        if (st.session_state['dados'] is not None and st.session_state.get('fonte_blocos') is None
+                and st.session_state.get('chave_compactacao') != chave_compactacao):
+            dados_importados = st.session_state['dados']
+            if st.session_state.get('relatorio_memoria') is not None:
+                # os dados da sessão já estão compactados; a compactação parte sempre dos dados importados
+                item_cache = cache.Obter(st.session_state['chave_cache'])
+                if item_cache is None:
+                    item_cache = armazenamento.Carregar(st.session_state['chave_cache'])
+                if item_cache is not None:
+                    dados_importados = item_cache[0]
+            st.session_state['chave_compactacao'] = chave_compactacao
+            st.session_state['relatorio_memoria'] = None
+            if compactar:
+                with st.spinner('Compactando o dataset...'):
+                    compactacao = AnaliseDataset(dados_importados, st.session_state['colunas']).Compactar(usar_float32=usar_float32)
+                st.session_state['dados'] = compactacao['dados']
+                st.session_state['relatorio_memoria'] = compactacao
+            else:
+                st.session_state['dados'] = dados_importados
+
+
+@st.fragment(run_every=0.5)
+def acompanhar_importacao():
+    importador = st.session_state['importador']
+    if importador.Status != 'Importando':
+        # recarrega a página inteira para registrar o resultado da importação
+        st.rerun()
+
+    mb_processados = importador.BytesProcessados / 1024 / 1024
+    mb_total = importador.TamanhoArquivo / 1024 / 1024
+    st.progress(importador.Progresso, text=f'Importando ({importador.Motor}): {mb_processados:.1f} de {mb_total:.1f} MB | {importador.LinhasProcessadas} linhas')
+    if st.button('Cancelar importação'):
+        importador.Cancelar()
+
+    if importador.PrimeiroBloco is not None:
+        st.subheader('Preview (primeiro bloco)')
+        st.write(importador.PrimeiroBloco.head(1000))
+
+if uploaded_file is not None and st.session_state['importador'] is not None and st.session_state['importador'].Status == 'Importando':
+    acompanhar_importacao()
 
 # parte inferior
 if 'dados' in st.session_state and st.session_state['dados'] is not None:
+    if st.session_state.get('fonte_blocos') is not None:
+        st.info(f'Modo out-of-core: o preview e a configuração das colunas usam as primeiras {st.session_state['dados'].shape[0]} linhas do arquivo.')
     st.info(f'Linhas: {st.session_state['dados'].shape[0]}, Colunas: {st.session_state['dados'].shape[1]}')
 
+    inferencia = st.session_state.get('relatorio_inferencia')
+    if inferencia is not None and inferencia.shape[0] > 0:
+        with st.expander(f'Tipos inferidos: {inferencia['TipoColuna'].notnull().sum()} coluna(s) convertida(s) na importação'):
+            st.dataframe(inferencia, hide_index=True, width='stretch')
+
+    compactacao = st.session_state.get('relatorio_memoria')
+    if compactacao is not None:
+        with st.expander(f'Memória: {compactacao['bytes_antes'] / 1024 / 1024:.1f} MB antes e {compactacao['bytes_depois'] / 1024 / 1024:.1f} MB depois da compactação'):
+            st.dataframe(compactacao['relatorio'], hide_index=True, width='stretch')
+
     st.subheader('Preview')
     st.write(st.session_state['dados'])
-
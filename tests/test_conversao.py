@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from classes.Dataset import AnaliseDataset
+from classes.ConversaoTipos import ConversorDeTipos, _converterSerie
+
+
+def _conversor(max_workers: int) -> ConversorDeTipos:
+    quantidade = 3000
+    dados = pd.DataFrame({
+        'Inteiro': [str(valor) for valor in range(quantidade)],
+        'Decimal': [f'{valor / 4}' for valor in range(quantidade)],
+        'Data': [f'2024-01-{valor % 28 + 1:02d}' for valor in range(quantidade)],
+        'Texto': np.arange(quantidade),
+        'Mantida': np.arange(quantidade, dtype='float64'),
+    })
+    dados.loc[10, 'Inteiro'] = 'dez'
+    dados.loc[20, 'Inteiro'] = '2.5'
+    dados.loc[30, 'Inteiro'] = None
+    dados.loc[40, 'Decimal'] = 'n/d'
+    dados.loc[50:52, 'Data'] = '31/02/2024'
+    configColunas = AnaliseDataset(dados).ConfigColunas
+    configColunas['TipoColuna'] = ['Inteiro', 'Decimal', 'Data', 'Texto', 'Decimal']
+    return ConversorDeTipos(AnaliseDataset(dados, configColunas), max_workers=max_workers)
+
+
+def test_conversao_em_threads_igual_a_sequencial():
+    sequencial = _conversor(max_workers=1).Converter()
+    paralela = _conversor(max_workers=4).Converter()
+
+    pd.testing.assert_frame_equal(sequencial['relatorio'], paralela['relatorio'])
+    pd.testing.assert_frame_equal(sequencial['dados'], paralela['dados'])
+    assert paralela['relatorio']['QtdFalhas'].to_dict() == {'Inteiro': 2, 'Decimal': 1, 'Data': 3, 'Texto': 0}
+    assert paralela['qtd_falhas'] == 6
+    assert 'Mantida' not in paralela['relatorio'].index
+    assert str(paralela['dados']['Inteiro'].dtype) == 'Int64'
+
+
+def test_validacao_da_amostra_conta_as_falhas():
+    validacao = _conversor(max_workers=4).ValidarAmostra()
+    assert validacao.loc['Texto', 'FalhasAmostra'] == 0
+    assert (validacao['FalhasAmostra'] <= validacao['QtdAmostra']).all()
+
+
+@pytest.mark.parametrize('valores, falhas', [
+    (pd.Series([1.0, 2.5, np.inf, 2.0 ** 63, np.nan]), 3),
+    (pd.Series(np.array([1, 2 ** 63 - 1, 2 ** 63], dtype='uint64')), 1),
+    (pd.Series(['1', '-4', '3.0', '1e30']), 1),
+])
+def test_inteiro_conta_valores_nao_representaveis_como_falhas(valores, falhas):
+    convertida, qtdFalhas = _converterSerie(valores, 'Inteiro')
+    assert qtdFalhas == falhas
+    assert convertida.dtype in ('int64', 'Int64')
@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+import pytest
+from classes.Dataset import AnaliseDataset
+
+
+@pytest.mark.parametrize('constante', [1 / 3, 123456.789])
+def test_coluna_constante_nao_correlaciona_com_coluna_com_nulos(constante):
+    aleatorio = np.random.default_rng(0)
+    ruido = aleatorio.normal(size=1000)
+    ruido[::5] = np.nan
+    analise = AnaliseDataset(pd.DataFrame({'a': np.full(1000, constante), 'b': ruido}))
+
+    assert analise.ParesCorrelacionados(0.7).shape[0] == 0
+    assert analise.CorrelacoesRelevantes(0.7).shape[0] == 0
+    assert np.isnan(analise.ValorDeCorrelacao('a', 'b'))
+    assert np.isnan(analise.CorrelacaoComColunas(['a']).loc['a', 'b'])
@@ -0,0 +1,65 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from classes.Dataset import _posicoesDaAmostra
+from classes.Importacao import ImportadorCSV
+from classes.DatasetEmBlocos import FonteEmBlocos
+from classes.InferenciaTipos import InferenciaDeTipos
+
+
+QTD_LINHAS = 5000
+
+
+def _csvComFracaoForaDaAmostra(com_nulo: bool) -> tuple:
+    amostra = set(_posicoesDaAmostra(QTD_LINHAS, 1000))
+    foraDaAmostra = [posicao for posicao in range(QTD_LINHAS) if posicao not in amostra]
+    valores = [f'1.{posicao % 1000:03d}' for posicao in range(QTD_LINHAS)]
+    valores[foraDaAmostra[-1]] = '1.002,75'
+    if com_nulo:
+        valores[foraDaAmostra[0]] = ''
+    conteudo = 'Id;Valor\n' + ''.join(f'{posicao};{valor}\n' for posicao, valor in enumerate(valores))
+    return conteudo.encode(), foraDaAmostra[-1]
+
+
+@pytest.mark.parametrize('motor', ['c', 'pyarrow'])
+@pytest.mark.parametrize('com_nulo', [False, True])
+def test_inteiro_com_fracao_fora_da_amostra_vira_decimal(motor, com_nulo):
+    conteudo, posicao = _csvComFracaoForaDaAmostra(com_nulo)
+    importador = ImportadorCSV(io.BytesIO(conteudo), sep=';', decimal=',', motor=motor)
+    importador.Iniciar()
+    importador.Aguardar()
+
+    assert importador.Status == 'Concluído', importador.Erro
+    assert importador.Dados['Valor'].dtype == 'float64'
+    assert importador.Dados['Valor'].iloc[posicao] == 1002.75
+    assert importador.Dados['Valor'].isnull().sum() == int(com_nulo)
+    assert importador.ConfigColunas.loc['Valor', 'TipoColuna'] == 'Decimal'
+
+
+def test_bloco_seguinte_com_fracao_mantem_o_valor(tmp_path):
+    caminho = tmp_path / 'dados.csv'
+    caminho.write_text('Valor\n' + '1.000\n' * 10 + '1.002,75\n\n1.001\n')
+    fonte = FonteEmBlocos(str(caminho), sep=';', decimal=',', linhas_por_bloco=10, inferir_tipos=True)
+
+    assert fonte.Amostra['Valor'].dtype == 'int64'
+    valores = np.concatenate([bloco['Valor'].to_numpy(dtype='float64', na_value=np.nan) for bloco in fonte.Blocos()])
+    assert valores[10] == 1002.75
+    assert valores[11] == 1001
+
+
+def test_deteccao_dos_tipos_em_texto():
+    quantidade = 200
+    dados = pd.DataFrame({
+        'Emissao': [f'{dia % 28 + 1:02d}/03/2024' for dia in range(quantidade)],
+        'Valor': [f'{valor}.{valor % 1000:03d},50' for valor in range(1, quantidade + 1)],
+        'Ativo': ['Sim', 'Não'] * (quantidade // 2),
+        'Cep': [f'{valor:08d}' for valor in range(quantidade)],
+    })
+    resultado = InferenciaDeTipos(decimal=',').Aplicar(dados)
+
+    assert resultado['relatorio']['Deteccao'].to_dict() == {'Emissao': 'Data', 'Valor': 'Decimal', 'Ativo': 'Booleano'}
+    assert resultado['dados']['Emissao'].iloc[0] == pd.Timestamp('2024-03-01')
+    assert resultado['dados']['Valor'].iloc[0] == 1001.5
+    assert resultado['dados']['Cep'].dtype == 'object'
+    assert resultado['colunas'].loc['Emissao', 'TipoColuna'] == 'Data'
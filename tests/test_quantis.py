@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from classes.Quantis import EsbocoDeQuantis
+
+
+QUANTIS = np.linspace(0.01, 0.99, 99)
+
+
+def _erroDePostoMaximo(valores: np.ndarray, estimados: np.ndarray) -> float:
+    ordenados = np.sort(valores)
+    postoAbaixo = np.searchsorted(ordenados, estimados, side='left') / len(ordenados)
+    postoAcima = np.searchsorted(ordenados, estimados, side='right') / len(ordenados)
+    # o valor estimado é correto se algum posto entre as suas ocorrências coincidir com o quantil pedido
+    return float(np.max(np.maximum(postoAbaixo - QUANTIS, QUANTIS - postoAcima).clip(min=0)))
+
+
+@pytest.mark.parametrize('distribuicao', ['normal', 'lognormal', 'inteiros'])
+def test_quantis_dentro_do_erro_de_posto(distribuicao):
+    aleatorio = np.random.default_rng(1)
+    valores = {
+        'normal': lambda: aleatorio.normal(size=300000),
+        'lognormal': lambda: aleatorio.lognormal(sigma=2.0, size=300000),
+        'inteiros': lambda: aleatorio.integers(0, 50, size=300000).astype('float64'),
+    }[distribuicao]()
+    esboco = EsbocoDeQuantis(k=200)
+    esboco.Atualizar(valores)
+
+    estimados = esboco.Quantil(QUANTIS)
+    assert _erroDePostoMaximo(valores, estimados) <= esboco.ErroDePosto
+    referencias = np.quantile(valores, QUANTIS)
+    postosExatos = np.searchsorted(np.sort(valores), referencias, side='right') / len(valores)
+    assert np.max(np.abs(esboco.Posto(referencias) - postosExatos)) <= esboco.ErroDePosto
+    assert esboco.QuantidadeRetida < len(valores) / 50
+
+
+def test_partes_e_combinacao_dentro_do_erro_de_posto():
+    aleatorio = np.random.default_rng(2)
+    valores = aleatorio.normal(size=200000)
+    valores[::7] = np.nan
+    validos = valores[~np.isnan(valores)]
+
+    combinado = EsbocoDeQuantis(k=200)
+    for parte in np.array_split(valores, 9):
+        esbocoParte = EsbocoDeQuantis(k=200)
+        esbocoParte.Atualizar(parte)
+        combinado.Combinar(esbocoParte)
+
+    assert combinado.Quantidade == len(validos)
+    assert combinado.Menor == validos.min() and combinado.Maior == validos.max()
+    assert combinado.Media == pytest.approx(validos.mean())
+    assert combinado.DesvioPadrao == pytest.approx(validos.std(ddof=1))
+    assert _erroDePostoMaximo(validos, combinado.Quantil(QUANTIS)) <= combinado.ErroDePosto
+
+
+def test_contagem_fora_dos_limites_dentro_do_erro():
+    aleatorio = np.random.default_rng(3)
+    valores = aleatorio.standard_t(df=3, size=250000)
+    esboco = EsbocoDeQuantis(k=200)
+    esboco.Atualizar(valores)
+
+    q1, q3 = np.quantile(valores, [0.25, 0.75])
+    inferior, superior = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    abaixo, acima = esboco.ContarForaDosLimites(inferior, superior)
+    tolerancia = esboco.ErroDePosto * len(valores)
+    assert abs(abaixo - np.count_nonzero(valores < inferior)) <= tolerancia
+    assert abs(acima - np.count_nonzero(valores > superior)) <= tolerancia
+
+
+def test_esboco_vazio():
+    esboco = EsbocoDeQuantis()
+    esboco.Atualizar(np.array([np.nan, np.nan]))
+    assert esboco.Quantidade == 0
+    assert np.isnan(esboco.Quantil(0.5))
+    assert esboco.ContarForaDosLimites(-1.0, 1.0) == (0, 0)
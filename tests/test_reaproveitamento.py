@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from classes.Dataset import AnaliseDataset
+from classes.ConversaoTipos import ConversorDeTipos
+
+
+def _analiseComResultados() -> AnaliseDataset:
+    aleatorio = np.random.default_rng(0)
+    dados = pd.DataFrame({
+        'Codigo': aleatorio.integers(0, 50, size=2000).astype('str'),
+        'Valor': aleatorio.normal(size=2000),
+        'Grupo': aleatorio.choice(['a', 'b', 'c'], size=2000),
+    })
+    analise = AnaliseDataset(dados)
+    for coluna in analise.Colunas:
+        analise.PercentualValoresNulos(coluna)
+    analise.EstatisticaDescritiva('Valor')
+    analise.DistribuicaoDeFrequencia('Grupo')
+    analise.DistribuicaoDeFrequencia('Codigo')
+    return analise
+
+
+def _converterCodigoParaInteiro(analise: AnaliseDataset) -> tuple:
+    configAjustada = analise.ConfigColunas.copy()
+    configAjustada.loc['Codigo', 'TipoColuna'] = 'Inteiro'
+    conversao = ConversorDeTipos(AnaliseDataset(analise.Dados, configAjustada)).Converter()
+    return conversao, configAjustada
+
+
+def test_reaproveita_colunas_nao_convertidas_apos_mudar_o_tipo_de_uma_coluna():
+    analise = _analiseComResultados()
+    conversao, configAjustada = _converterCodigoParaInteiro(analise)
+    convertidas = conversao['relatorio']['NomeColuna'].to_list()
+    assert convertidas == ['Codigo']
+    assert conversao['dados'] is not analise.Dados
+
+    nova = AnaliseDataset(conversao['dados'], configAjustada)
+    assert nova.ReaproveitarResultados(analise, convertidas) > 0
+    assert nova.ColunasAlteradas(analise, convertidas) == ['Codigo']
+
+    assert ('PercentualValoresNulos', (('coluna', 'Valor'),)) in nova._cache
+    assert ('DistribuicaoDeFrequencia', (('coluna', 'Grupo'),)) in nova._cache
+    assert ('PercentualValoresNulos', (('coluna', 'Codigo'),)) not in nova._cache
+    assert ('DistribuicaoDeFrequencia', (('coluna', 'Codigo'),)) not in nova._cache
+
+
+def test_nao_reaproveita_dados_que_nao_sao_copia_rasa():
+    analise = _analiseComResultados()
+    conversao, configAjustada = _converterCodigoParaInteiro(analise)
+
+    nova = AnaliseDataset(conversao['dados'].copy(deep=True), configAjustada)
+    assert nova.ReaproveitarResultados(analise, ['Codigo']) == 0
+    assert AnaliseDataset(conversao['dados'], configAjustada).ReaproveitarResultados(analise) == 0